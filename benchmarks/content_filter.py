@@ -0,0 +1,54 @@
+"""
+Cost of matching lyrics against growing keyword lists
+
+The keyword automaton is compared with checking one regular expression
+per keyword, over the labeled language sample:
+
+    python benchmarks/content_filter.py [sample.jsonl]
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from letras.domain.services.content_filter import KeywordMatcher, normalize
+
+SAMPLE = Path(__file__).parent / "data" / "language_sample.jsonl"
+SIZES = (10, 100, 1000)
+ROUNDS = 20
+
+
+def per_item(func, texts) -> float:
+    """Mean seconds per text over a few rounds"""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - started) / (ROUNDS * len(texts))
+
+
+def main(path: Path):
+    rows = [json.loads(line) for line in path.read_text().splitlines() if line]
+    texts = [row["text"] for row in rows]
+
+    print(f"{'keywords':>8}{'automaton':>12}{'regex each':>12}")
+    for size in SIZES:
+        # Keywords that never match, so every text is scanned to the end
+        keywords = [f"palavra{i}x" for i in range(size)]
+        matcher = KeywordMatcher(keywords)
+        patterns = [re.compile(rf"\b{re.escape(k)}\b") for k in keywords]
+
+        def each(text):
+            text = normalize(text)
+            return next((p for p in patterns if p.search(text)), None)
+
+        print(
+            f"{size:>8}{per_item(matcher.find, texts) * 1e6:>10.0f}us"
+            f"{per_item(each, texts) * 1e6:>10.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE)
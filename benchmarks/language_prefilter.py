@@ -0,0 +1,67 @@
+"""
+Agreement and cost of the Portuguese prefilter against lingua
+
+Reads a labeled JSONL sample ({"lang": "pt", "text": "..."} per line),
+by default the one next to this script:
+
+    python benchmarks/language_prefilter.py [sample.jsonl]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from letras.domain.services.language_prefilter import PortuguesePrefilter
+from letras.domain.services.language_service import LanguageService
+
+SAMPLE = Path(__file__).parent / "data" / "language_sample.jsonl"
+ROUNDS = 20
+
+
+def per_item(func, texts) -> float:
+    """Mean seconds per text over a few rounds"""
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        for text in texts:
+            func(text)
+    return (time.perf_counter() - started) / (ROUNDS * len(texts))
+
+
+def main(path: Path):
+    rows = [json.loads(line) for line in path.read_text().splitlines() if line]
+    service = LanguageService(prefilter=False)
+    texts = [service._clean_text(row["text"]) for row in rows]
+    labels = [row["lang"] == "pt" for row in rows]
+
+    prefilter = PortuguesePrefilter()
+    decisions = [prefilter.classify(text) for text in texts]
+    lingua = [service.is_portuguese(text) for text in texts]
+
+    decided = [i for i, decision in enumerate(decisions) if decision is not None]
+    agree = sum(decisions[i] == lingua[i] for i in decided)
+    combined = [d if d is not None else l for d, l in zip(decisions, lingua)]
+
+    print(f"sample: {len(rows)} texts from {path}")
+    print(f"decided by prefilter: {len(decided)} ({len(decided) / len(rows):.0%})")
+    if decided:
+        print(f"agreement with lingua on those: {agree / len(decided):.1%}")
+    print(f"lingua accuracy: {sum(map(bool.__eq__, lingua, labels)) / len(rows):.1%}")
+    print(
+        f"prefilter + lingua accuracy: "
+        f"{sum(map(bool.__eq__, combined, labels)) / len(rows):.1%}"
+    )
+
+    prefilter_cost = per_item(prefilter.classify, texts)
+    lingua_cost = per_item(service.detector.detect_language_of, texts)
+    share = len(decided) / len(rows)
+    mixed_cost = prefilter_cost + (1 - share) * lingua_cost
+    print(
+        f"per item: prefilter {prefilter_cost * 1e6:.0f}us, "
+        f"lingua {lingua_cost * 1e6:.0f}us, "
+        f"prefilter then lingua {mixed_cost * 1e6:.0f}us"
+    )
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE)
@@ -0,0 +1,53 @@
+"""
+Accuracy and cost of detecting lyrics from a truncated sample
+
+Texts of the labeled sample are repeated to the length of real lyrics,
+choruses included, and detected whole and sampled:
+
+    python benchmarks/language_sampling.py [sample.jsonl]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+from letras.domain.services.language_service import LanguageService
+
+SAMPLE = Path(__file__).parent / "data" / "language_sample.jsonl"
+REPEATS = (1, 5, 20)
+OPTIONS = {
+    "whole text": {"sample_size": 0},
+    "sample 200": {"sample_size": 200},
+    "sample 400": {"sample_size": 400},
+}
+
+
+def main(path: Path):
+    rows = [json.loads(line) for line in path.read_text().splitlines() if line]
+    labels = [row["lang"] == "pt" for row in rows]
+
+    print(
+        f"{'option':<12}{'length':>8}{'accuracy':>10}{'per text':>12}{'extended':>10}"
+    )
+    for repeats in REPEATS:
+        texts = [" ".join([row["text"]] * repeats) for row in rows]
+        length = sum(map(len, texts)) // len(texts)
+        for name, options in OPTIONS.items():
+            service = LanguageService(prefilter=False, **options)
+            service.detect(texts[:1])  # load the models outside the timing
+            service.extended = 0
+
+            started = time.perf_counter()
+            results = service.are_portuguese(texts)
+            elapsed = (time.perf_counter() - started) / len(texts)
+
+            accuracy = sum(map(bool.__eq__, results, labels)) / len(texts)
+            print(
+                f"{name:<12}{length:>8}{accuracy:>10.1%}"
+                f"{elapsed * 1e6:>10.0f}us{service.extended:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]) if len(sys.argv) > 1 else SAMPLE)
@@ -0,0 +1,70 @@
+"""
+Startup cost of the language detector options
+
+Every option runs in a fresh interpreter, so model loading is measured cold:
+
+    python benchmarks/language_startup.py
+"""
+
+import json
+import resource
+import subprocess
+import sys
+import time
+
+OPTIONS = {
+    "default (lazy)": {},
+    "low accuracy": {"low_accuracy": True},
+    "preload": {"preload": True},
+    "low accuracy + preload": {"low_accuracy": True, "preload": True},
+    "min distance 0.25": {"min_distance": 0.25},
+}
+
+SAMPLE = "Eu te louvarei, Senhor, de todo o meu coração, cantarei as tuas maravilhas"
+
+
+def measure(options: dict) -> dict:
+    """Time to build the service and check a first text, in this process"""
+    from letras.domain.services.language_service import LanguageService
+
+    started = time.perf_counter()
+    service = LanguageService(**options)
+    built = time.perf_counter()
+    service.are_portuguese([SAMPLE])
+    first = time.perf_counter()
+    service.are_portuguese([SAMPLE] * 100)
+    batch = time.perf_counter()
+
+    # ru_maxrss is in KiB on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {
+        "init": built - started,
+        "first": first - built,
+        "per_text": (batch - first) / 100,
+        "rss_mb": rss,
+    }
+
+
+def main():
+    print(f"{'option':<24}{'init':>10}{'1st call':>10}{'per text':>12}{'RSS':>10}")
+    for name, options in OPTIONS.items():
+        output = subprocess.run(
+            [sys.executable, __file__, json.dumps(options)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output)
+        print(
+            f"{name:<24}{result['init'] * 1000:>8.0f}ms"
+            f"{result['first'] * 1000:>8.0f}ms"
+            f"{result['per_text'] * 1e6:>10.0f}us"
+            f"{result['rss_mb']:>8.0f}MB"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        print(json.dumps(measure(json.loads(sys.argv[1]))))
+    else:
+        main()
@@ -0,0 +1,95 @@
+"""
+Throughput of per-row and bulk repository writes
+
+Writes artists, songs and lyrics one row at a time, then through the
+COPY-backed bulk methods, against the database of the LETRAS_DB_*
+settings. Every round runs in a transaction that is rolled back, so the
+stored data is left untouched:
+
+    python benchmarks/repository_bulk.py [rows]
+"""
+
+import asyncio
+import sys
+import time
+
+from letras.config.config import Config
+from letras.domain.entities.artist import Artist
+from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.song import Song
+from letras.infrastructure.database.connection import PostgresConnection
+from letras.infrastructure.database.repositories.postgres_repository import (
+    PostgresRepository,
+)
+
+CONTENT = "Aleluia, aleluia\nGlória ao Senhor\n" * 20
+
+
+class Rollback(Exception):
+    pass
+
+
+async def per_row(repository: PostgresRepository, rows: int):
+    for i in range(rows):
+        artist = await repository.add_artist(
+            Artist(name=f"Bench {i}", slug=f"bench-{i}", views=i)
+        )
+        song = await repository.add_song(
+            Song(name=f"Song {i}", slug=f"song-{i}", artist_id=artist.id, views=i)
+        )
+        await repository.add_lyrics(Lyrics(song_id=song.id, content=CONTENT))
+
+
+async def bulk(repository: PostgresRepository, rows: int):
+    artists = await repository.add_artists(
+        [Artist(name=f"Bench {i}", slug=f"bench-{i}", views=i) for i in range(rows)]
+    )
+    songs = await repository.add_songs(
+        [
+            Song(name=f"Song {i}", slug=f"song-{i}", artist_id=artist.id, views=i)
+            for i, artist in enumerate(artists)
+        ]
+    )
+    await repository.add_many_lyrics(
+        [Lyrics(song_id=song.id, content=CONTENT) for song in songs]
+    )
+
+
+async def timed(db: PostgresConnection, write, rows: int) -> float:
+    """Seconds taken by write, rolled back afterwards"""
+    repository = PostgresRepository(db)
+    async with db.acquire() as conn:
+        started = time.perf_counter()
+        try:
+            async with conn.transaction():
+                repository._current_transaction = conn
+                await write(repository, rows)
+                elapsed = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            return elapsed
+
+
+async def main(rows: int):
+    settings = Config.get_settings()
+    db = PostgresConnection(
+        host=settings.db_host,
+        port=settings.db_port,
+        database=settings.db_name,
+        user=settings.db_user,
+        password=settings.db_password,
+    )
+    await db.initialize()
+    try:
+        for name, write in (("per row", per_row), ("bulk", bulk)):
+            elapsed = await timed(db, write, rows)
+            print(
+                f"{name:<8}{rows} artists, songs and lyrics in {elapsed:.2f}s "
+                f"({3 * rows / elapsed:,.0f} rows/s)"
+            )
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -1,14 +1,21 @@
 import asyncio
+import logging
 import os
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import click
 from rich.console import Console
+from rich.logging import RichHandler
 
 from letras.config.config import Config
+from letras.domain.services.content_filter import ContentFilter, load_filter
+from letras.domain.services.language_prior import ArtistLanguagePrior
 from letras.infrastructure.database.connection import PostgresConnection
 from letras.runners.full import FullRunner
 from letras.runners.incremental import IncrementalRunner
+from letras.runners.reparse import ReparseRunner
 
 console = Console()
 
@@ -20,6 +27,68 @@ def setup_output_dir(output_dir: str) -> Path:
     return path
 
 
+def archive_path(settings) -> Optional[str]:
+    """WARC file recording this run's pages, if archiving is enabled"""
+    if not settings.archive_dir:
+        return None
+    name = f"letras-{datetime.now():%Y%m%d-%H%M%S}.warc.gz"
+    return str(settings.archive_dir / name)
+
+
+def scraper_config(settings) -> dict:
+    """Build WebScraper options from settings"""
+    return {
+        "delay": settings.delay,
+        "timeout": settings.timeout,
+        "parser": settings.parser,
+        "styles": list(settings.styles),
+        "streaming": settings.streaming,
+        "parse_workers": settings.parse_workers,
+        "memo_size": settings.memo_size,
+        "max_attempts": settings.max_attempts,
+        "breaker_pause": settings.breaker_pause,
+        "hedge": settings.hedge,
+        "egress": list(settings.egress) or None,
+        "archive_path": archive_path(settings),
+        "cache_dir": str(settings.cache_dir) if settings.cache_dir else None,
+        "cache_ttl": settings.cache_ttl,
+        "cache_max_bytes": settings.cache_max_mb * 1024 * 1024,
+    }
+
+
+def language_config(settings) -> dict:
+    """Build LanguageService options from settings"""
+    return {
+        "low_accuracy": settings.language_low_accuracy,
+        "preload": settings.language_preload,
+        "min_distance": settings.language_min_distance,
+        "prefilter": settings.language_prefilter,
+        "cache_size": settings.language_cache_size,
+        "sample_size": settings.language_sample_chars,
+        "sample_threshold": settings.language_sample_threshold,
+        "prior": ArtistLanguagePrior(
+            min_songs=settings.language_prior_min_songs,
+            threshold=settings.language_prior_threshold,
+            sample_every=settings.language_prior_sample_every,
+        ),
+    }
+
+
+def content_filter(settings) -> Optional[ContentFilter]:
+    """Exclusion rules from the configured filters file"""
+    if not settings.filters_file:
+        return None
+    return load_filter(settings.filters_file)
+
+
+def setup_logging(verbose: bool):
+    """Show the package's log records, run statistics included, on the console"""
+    logger = logging.getLogger("letras")
+    logger.setLevel(logging.INFO if verbose else logging.WARNING)
+    if not any(isinstance(h, RichHandler) for h in logger.handlers):
+        logger.addHandler(RichHandler(console=console, show_path=False))
+
+
 def run_async(coro):
     """Run async function in new event loop"""
     loop = asyncio.new_event_loop()
@@ -47,8 +116,15 @@ def cli():
     default="data",
     help="Output directory for files",
 )
-def full(verbose: bool, output: str):
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    default=False,
+    help="Stream artists, songs and lyrics through concurrent stages",
+)
+def full(verbose: bool, output: str, pipeline: bool):
     """Run full scraping of all artists"""
+    setup_logging(verbose)
     try:
         output_dir = setup_output_dir(output)
         settings = Config.get_settings()
@@ -63,6 +139,11 @@ def full(verbose: bool, output: str):
             },
             base_url=settings.base_url,
             verbose=verbose,
+            max_workers=settings.max_workers,
+            pipeline=pipeline,
+            scraper_config=scraper_config(settings),
+            language_config=language_config(settings),
+            content_filter=content_filter(settings),
         )
 
         async def run():
@@ -90,8 +171,15 @@ def full(verbose: bool, output: str):
     default="data",
     help="Output directory for files",
 )
-def incremental(verbose: bool, output: str):
+@click.option(
+    "--pipeline",
+    is_flag=True,
+    default=False,
+    help="Stream artists, songs and lyrics through concurrent stages",
+)
+def incremental(verbose: bool, output: str, pipeline: bool):
     """Run incremental update using existing database"""
+    setup_logging(verbose)
     try:
         output_dir = setup_output_dir(output)
         settings = Config.get_settings()
@@ -106,6 +194,11 @@ def incremental(verbose: bool, output: str):
             },
             base_url=settings.base_url,
             verbose=verbose,
+            max_workers=settings.max_workers,
+            pipeline=pipeline,
+            scraper_config=scraper_config(settings),
+            language_config=language_config(settings),
+            content_filter=content_filter(settings),
         )
 
         async def run():
@@ -122,6 +215,59 @@ def incremental(verbose: bool, output: str):
         raise click.Abort()
 
 
+@cli.command()
+@click.argument("archives", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option(
+    "--verbose", "-v", is_flag=True, default=True, help="Show detailed output"
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=int,
+    default=None,
+    help="Parse processes, defaults to every core",
+)
+@click.confirmation_option(
+    prompt="This replaces all artists, songs and lyrics in the database. Continue?"
+)
+def reparse(archives: tuple, verbose: bool, workers: Optional[int]):
+    """Rebuild the database from WARC archives of earlier runs"""
+    setup_logging(verbose)
+    try:
+        settings = Config.get_settings()
+
+        runner = ReparseRunner(
+            db_config={
+                "host": settings.db_host,
+                "port": settings.db_port,
+                "database": settings.db_name,
+                "user": settings.db_user,
+                "password": settings.db_password,
+            },
+            base_url=settings.base_url,
+            archives=list(archives),
+            verbose=verbose,
+            max_workers=settings.max_workers,
+            parse_workers=workers,
+            scraper_config=scraper_config(settings),
+            language_config=language_config(settings),
+            content_filter=content_filter(settings),
+        )
+
+        async def run():
+            try:
+                await runner.initialize()
+                await runner.run()
+            finally:
+                await runner.close()
+
+        run_async(run())
+
+    except Exception as e:
+        console.print(f"[red]Error:[/red] {str(e)}")
+        raise click.Abort()
+
+
 @cli.command()
 def init():
     """Initialize database schema"""
@@ -1,9 +1,11 @@
 from pathlib import Path
-from typing import Optional
+from typing import List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+SETTINGS_DIR = Path(__file__).parent / "settings"
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -18,6 +20,40 @@ class Settings(BaseSettings):
     max_workers: int = Field(28, ge=1, le=50)
     timeout: int = Field(30, ge=1)
     delay: float = Field(0.5, ge=0)
+    parser: Literal["soup", "strained", "lxml"] = Field("soup")
+    # Style indexes (/estilos/<style>/todosartistas.html) to crawl
+    styles: List[str] = Field(default_factory=lambda: ["gospelreligioso"])
+    streaming: bool = Field(False)
+    parse_workers: int = Field(0, ge=0)
+    memo_size: int = Field(128, ge=0)
+    max_attempts: int = Field(3, ge=1)
+    breaker_pause: float = Field(30, ge=0)
+    hedge: bool = Field(False)
+    egress: List[str] = Field(default_factory=list)
+
+    # Language detection settings
+    language_low_accuracy: bool = Field(False)
+    language_preload: bool = Field(False)
+    language_min_distance: float = Field(0.0, ge=0, lt=1)
+    language_prefilter: bool = Field(True)
+    language_cache_size: int = Field(10_000, ge=0)
+    language_sample_chars: int = Field(400, ge=0)
+    language_sample_threshold: float = Field(0.2, ge=0, le=1)
+    # Stop fetching artists whose detected lyrics are confidently not Portuguese
+    language_prior_min_songs: int = Field(5, ge=1)
+    language_prior_threshold: float = Field(0.7, gt=0, le=1)
+    language_prior_sample_every: int = Field(10, ge=0)
+
+    # Artist, title and lyric exclusion rules, None disables filtering
+    filters_file: Optional[Path] = Field(SETTINGS_DIR / "filters.yaml")
+
+    # HTTP cache settings
+    cache_dir: Optional[Path] = Field(None)
+    cache_ttl: int = Field(24 * 60 * 60, ge=0)
+    cache_max_mb: int = Field(512, ge=1)
+
+    # Page archive (WARC) settings
+    archive_dir: Optional[Path] = Field(None)
 
     # Database settings
     db_host: str = Field("db")
@@ -1,6 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 @dataclass
@@ -10,6 +10,8 @@ class Artist:
     views: int = 0
     id: Optional[int] = None
     added_date: Optional[datetime] = None
+    # Styles whose index lists the artist, filled in when scraped
+    styles: List[str] = field(default_factory=list)
 
     @property
     def url(self) -> str:
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+# First wait before a rejected song is fetched again and the upper bound of
+# its exponential backoff, by reason; None never retries
+RETRY_POLICY: Dict[str, Optional[Tuple[timedelta, timedelta]]] = {
+    "language": None,
+    "filtered": None,
+    "no_lyrics": (timedelta(days=30), timedelta(days=365)),
+    "not_found": (timedelta(days=7), timedelta(days=180)),
+    "error": (timedelta(days=1), timedelta(days=30)),
+}
+
+
+@dataclass
+class Rejection:
+    """A song page that was fetched but not stored, and when to try again"""
+
+    artist_id: int
+    slug: str
+    reason: str
+    attempts: int = 1
+    rejected_at: Optional[datetime] = None
+    # None when the song is never fetched again
+    retry_after: Optional[datetime] = None
+
+    @classmethod
+    def create(
+        cls,
+        artist_id: int,
+        slug: str,
+        reason: str,
+        previous: Optional["Rejection"] = None,
+        now: Optional[datetime] = None,
+    ) -> "Rejection":
+        """Rejection with its retry time from RETRY_POLICY"""
+        now = now or datetime.now()
+        attempts = previous.attempts + 1 if previous else 1
+        retry_after = None
+        if (policy := RETRY_POLICY.get(reason, RETRY_POLICY["error"])) is not None:
+            first, longest = policy
+            retry_after = now + min(longest, first * 2 ** (attempts - 1))
+        return cls(artist_id, slug, reason, attempts, now, retry_after)
+
+    def blocks(self, now: Optional[datetime] = None) -> bool:
+        """Whether the song should still be left out"""
+        return self.retry_after is None or self.retry_after > (now or datetime.now())
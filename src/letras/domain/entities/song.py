@@ -11,6 +11,8 @@ class Song:
     views: int = 0
     id: Optional[int] = None
     added_date: Optional[datetime] = None
+    # Canonical page path, shared by every artist linking to the song
+    path: Optional[str] = None
 
     @property
     def url(self) -> str:
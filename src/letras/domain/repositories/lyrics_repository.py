@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.rejection import Rejection
 from letras.domain.entities.song import Song
 
 
@@ -27,11 +28,21 @@ class LyricsRepository(ABC):
         """Add new artist"""
         pass
 
+    @abstractmethod
+    async def add_artists(self, artists: List[Artist]) -> List[Artist]:
+        """Add or update many artists, returned in the same order"""
+        pass
+
     @abstractmethod
     async def update_artist_views(self, artist_id: int, views: int) -> None:
         """Update artist views"""
         pass
 
+    @abstractmethod
+    async def add_artist_styles(self, artist_id: int, styles: List[str]) -> None:
+        """Record the styles an artist is listed under"""
+        pass
+
     @abstractmethod
     async def get_songs_by_artist(self, artist_id: int) -> List[Song]:
         """Get all songs from artist"""
@@ -47,12 +58,86 @@ class LyricsRepository(ABC):
         """Add new song"""
         pass
 
+    @abstractmethod
+    async def add_songs(self, songs: List[Song]) -> List[Song]:
+        """Add or update many songs, returned in the same order"""
+        pass
+
+    @abstractmethod
+    async def get_songs_by_paths(self, paths: List[str]) -> List[Song]:
+        """Get songs by canonical page path"""
+        pass
+
+    @abstractmethod
+    async def link_song_artists(self, links: List[Tuple[int, int]]) -> None:
+        """Record (song_id, artist_id) pairs of artists listing a song"""
+        pass
+
+    @abstractmethod
+    async def get_redirects(self) -> Dict[str, str]:
+        """Get known song page redirects, path to target"""
+        pass
+
+    @abstractmethod
+    async def add_redirect(self, path: str, target: str) -> None:
+        """Record that a song page moved"""
+        pass
+
+    @abstractmethod
+    async def get_rejections(self, artist_id: int) -> List[Rejection]:
+        """Get the rejected songs of an artist"""
+        pass
+
+    @abstractmethod
+    async def add_rejection(self, rejection: Rejection) -> None:
+        """Record or update a rejected song"""
+        pass
+
+    @abstractmethod
+    async def remove_rejection(self, artist_id: int, slug: str) -> None:
+        """Forget a rejected song that was stored after all"""
+        pass
+
+    @abstractmethod
+    async def get_artist_languages(self) -> Dict[int, Tuple[int, int]]:
+        """Get (portuguese, other) lyric counts by artist id"""
+        pass
+
+    @abstractmethod
+    async def record_artist_language(self, artist_id: int, portuguese: bool) -> None:
+        """Count one detected lyric of an artist"""
+        pass
+
+    @abstractmethod
+    async def get_language_verdicts(
+        self, hashes: List[str]
+    ) -> Dict[str, Tuple[Optional[str], float]]:
+        """Get stored language and confidence by text hash"""
+        pass
+
+    @abstractmethod
+    async def add_language_verdicts(
+        self, verdicts: List[Tuple[str, Optional[str], float, str]]
+    ) -> None:
+        """Store (text hash, language, confidence, source) rows"""
+        pass
+
     @abstractmethod
     async def add_lyrics(self, lyrics: Lyrics) -> Lyrics:
         """Add lyrics"""
         pass
 
+    @abstractmethod
+    async def add_many_lyrics(self, lyrics: List[Lyrics]) -> List[Lyrics]:
+        """Add or replace the lyrics of many songs, returned in the same order"""
+        pass
+
     @abstractmethod
     async def get_lyrics_by_song(self, song_id: int) -> Optional[Lyrics]:
         """Get lyrics by song ID"""
         pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all artists, songs and lyrics"""
+        pass
@@ -0,0 +1,145 @@
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+
+def normalize(text: str) -> str:
+    """Lowercase text without accents and with single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class KeywordMatcher:
+    """
+    Find any of many keywords in a text in a single pass
+
+    Keywords are compiled into an Aho-Corasick automaton, so matching costs
+    the same however many keywords there are. Matching ignores case and
+    accents and only accepts whole words, so "Frei" does not match
+    "Freitas".
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = sorted({k for k in map(normalize, keywords) if k})
+        # Transitions, failure links and keywords ending at each state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state] += (index,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._out[child] += self._out[self._fail[child]]
+
+    @staticmethod
+    def _is_word(text: str, start: int, end: int) -> bool:
+        return (start == 0 or not text[start - 1].isalnum()) and (
+            end == len(text) or not text[end].isalnum()
+        )
+
+    def find(self, text: str) -> Optional[str]:
+        """First keyword found in text, None if there is none"""
+        text = normalize(text)
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._out[state]:
+                keyword = self.keywords[index]
+                if self._is_word(text, end - len(keyword), end):
+                    return keyword
+        return None
+
+
+class ContentFilter:
+    """
+    Exclusion rules for artists, song titles and lyrics
+
+    Artist and title rules are checked before their pages are fetched,
+    lyric rules before language detection and storage.
+    """
+
+    def __init__(
+        self,
+        artists: Iterable[str] = (),
+        titles: Iterable[str] = (),
+        lyrics: Iterable[str] = (),
+        min_length: int = 0,
+        max_length: Optional[int] = None,
+    ):
+        """
+        Initialize the filter
+
+        Args:
+            artists: Keywords excluding artists by name
+            titles: Keywords excluding songs by title
+            lyrics: Terms excluding lyrics by content
+            min_length: Shortest lyrics kept, in characters
+            max_length: Longest lyrics kept, None for no limit
+        """
+        self._artists = KeywordMatcher(artists)
+        self._titles = KeywordMatcher(titles)
+        self._lyrics = KeywordMatcher(lyrics)
+        self._min_length = min_length
+        self._max_length = max_length
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ContentFilter":
+        """Build the filter from a filters.yaml file"""
+        with open(path, encoding="utf-8") as f:
+            filters = (yaml.safe_load(f) or {}).get("filters") or {}
+
+        artists = filters.get("artists") or {}
+        titles = filters.get("titles") or {}
+        lyrics = filters.get("lyrics") or {}
+        content = lyrics.get("content_filters") or {}
+        return cls(
+            artists=artists.get("exclude_keywords") or (),
+            titles=titles.get("exclude_keywords") or (),
+            lyrics=content.get("exclude_terms") or (),
+            min_length=lyrics.get("min_length") or 0,
+            max_length=lyrics.get("max_length"),
+        )
+
+    def allows_artist(self, name: str) -> bool:
+        return self._artists.find(name) is None
+
+    def allows_title(self, title: str) -> bool:
+        return self._titles.find(title) is None
+
+    def allows_lyrics(self, content: str) -> bool:
+        length = len(content.strip())
+        if length < self._min_length:
+            return False
+        if self._max_length is not None and length > self._max_length:
+            return False
+        return self._lyrics.find(content) is None
+
+
+@lru_cache(maxsize=None)
+def load_filter(path: Path) -> ContentFilter:
+    """Filter built from path, read once per process"""
+    return ContentFilter.from_file(path)
@@ -0,0 +1,116 @@
+import re
+from typing import Dict, Optional, Tuple
+
+WORD = re.compile(r"\w+")
+
+# Frequent words that are rare in the other supported languages
+PORTUGUESE_WORDS = frozenset("""
+    não nao você voce vocês meu minha meus minhas teu tua teus tuas seu sua
+    com uma um pra pro ao aos às do da dos das na nos nas pelo pela eu ele
+    ela eles elas nós nosso nossa estou são sou vou vai também então quando
+    onde mais muito coração senhor deus tudo sempre agora aqui ali isso isto
+    esse essa aquele céu mão
+    """.split())
+ENGLISH_WORDS = frozenset("""
+    the and you your i me my is are was be to of in it that this with for on
+    not all his her he she we our they them will can love lord god oh
+    when what how there here from have has just know
+    """.split())
+SPANISH_WORDS = frozenset("""
+    el los las y yo tu tú mi mis es son estoy soy con una un por del al pero
+    como cuando donde más muy todo siempre ahora aquí eso esto corazón señor
+    dios cielo mano contigo conmigo usted nosotros
+    """.split())
+
+# Letter sequences typical of each language, counted anywhere in the text
+PORTUGUESE_MARKERS = ("ã", "õ", "ç", "nh", "lh", "ê", "ô")
+ENGLISH_MARKERS = ("th", "wh", "ck", "ing ")
+# Only sequences Portuguese never uses: "ue" and "ll" are common in
+# Portuguese words such as "que" and "aquele"
+SPANISH_MARKERS = ("ñ", "ción", "¿", "¡")
+
+
+class PortuguesePrefilter:
+    """
+    Cheap first pass over lyrics before the statistical detector
+
+    Portuguese evidence (distinctive words, diacritics and letter sequences)
+    is weighed against English and Spanish evidence. Texts whose share of
+    Portuguese evidence is clearly high or low are decided here; the rest
+    are left to the detector.
+    """
+
+    def __init__(
+        self,
+        high: float = 0.8,
+        low: float = 0.2,
+        min_words: int = 12,
+        min_evidence: int = 6,
+    ):
+        """
+        Initialize the prefilter
+
+        Args:
+            high: Portuguese share at or above which a text is Portuguese
+            low: Portuguese share at or below which it is not
+            min_words: Shorter texts are always left to the detector
+            min_evidence: Hits needed before the share is trusted
+        """
+        self._high = high
+        self._low = low
+        self._min_words = min_words
+        self._min_evidence = min_evidence
+
+    @staticmethod
+    def _evidence(text: str, words: list, vocabulary, markers) -> int:
+        return sum(word in vocabulary for word in words) + sum(
+            text.count(marker) for marker in markers
+        )
+
+    def _scores(self, text: str) -> Optional[Dict[str, int]]:
+        """Evidence per language (ISO 639-1 code), None for short texts"""
+        text = text.lower()
+        words = WORD.findall(text)
+        if len(words) < self._min_words:
+            return None
+        return {
+            "pt": self._evidence(text, words, PORTUGUESE_WORDS, PORTUGUESE_MARKERS),
+            "en": self._evidence(text, words, ENGLISH_WORDS, ENGLISH_MARKERS),
+            "es": self._evidence(text, words, SPANISH_WORDS, SPANISH_MARKERS),
+        }
+
+    def score(self, text: str) -> Optional[float]:
+        """Share of the evidence pointing to Portuguese, None if too little"""
+        if (scores := self._scores(text)) is None:
+            return None
+        portuguese, other = scores["pt"], max(scores["en"], scores["es"])
+        if portuguese + other < self._min_evidence:
+            return None
+        return portuguese / (portuguese + other)
+
+    def verdict(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Language of a clear-cut text and the share of evidence behind it
+
+        Returns:
+            Optional[Tuple[str, float]]: ISO 639-1 code and confidence, None
+                when the text is left to the detector
+        """
+        if (scores := self._scores(text)) is None:
+            return None
+        other = max(("en", "es"), key=scores.get)
+        total = scores["pt"] + scores[other]
+        if total < self._min_evidence:
+            return None
+        share = scores["pt"] / total
+        if share >= self._high:
+            return "pt", share
+        if share <= self._low:
+            return other, 1 - share
+        return None
+
+    def classify(self, text: str) -> Optional[bool]:
+        """Whether text is Portuguese, None when it is not clear"""
+        if (verdict := self.verdict(text)) is None:
+            return None
+        return verdict[0] == "pt"
@@ -0,0 +1,86 @@
+import math
+from dataclasses import dataclass
+
+from .language_prefilter import PORTUGUESE_WORDS, WORD
+
+# Letters that only occur in Portuguese among the supported languages
+PORTUGUESE_LETTERS = frozenset("ãõç")
+
+
+@dataclass
+class LanguageStats:
+    """Languages of the lyrics detected so far for one artist"""
+
+    portuguese: int = 0
+    other: int = 0
+    # Songs not fetched because of the prior, this run only
+    skipped: int = 0
+
+    @property
+    def songs(self) -> int:
+        return self.portuguese + self.other
+
+    def record(self, portuguese: bool):
+        if portuguese:
+            self.portuguese += 1
+        else:
+            self.other += 1
+
+
+def title_suggests_portuguese(title: str) -> bool:
+    """Whether a song title carries Portuguese letters or words"""
+    title = title.lower()
+    return bool(PORTUGUESE_LETTERS.intersection(title)) or any(
+        word in PORTUGUESE_WORDS for word in WORD.findall(title)
+    )
+
+
+class ArtistLanguagePrior:
+    """
+    Decide from an artist's detected songs whether the rest are worth fetching
+
+    Once the share of non-Portuguese lyrics is confidently high (the lower
+    bound of its 95% Wilson interval is above threshold), the artist's
+    remaining songs are only sampled, one in every sample_every, which
+    keeps the statistics moving if the artist switches language. Songs
+    whose title looks Portuguese are always fetched.
+    """
+
+    def __init__(
+        self, min_songs: int = 5, threshold: float = 0.7, sample_every: int = 10
+    ):
+        """
+        Initialize the prior
+
+        Args:
+            min_songs: Detected songs needed before the prior applies
+            threshold: Lower bound of the non-Portuguese share that stops
+                fetching
+            sample_every: One in this many songs is still fetched, 0 never
+        """
+        self._min_songs = min_songs
+        self._threshold = threshold
+        self._sample_every = sample_every
+
+    @staticmethod
+    def lower_bound(successes: int, total: int, z: float = 1.96) -> float:
+        """Lower bound of the Wilson score interval of a proportion"""
+        if not total:
+            return 0.0
+        share = successes / total
+        center = share + z * z / (2 * total)
+        spread = z * math.sqrt(share * (1 - share) / total + z * z / (4 * total**2))
+        return (center - spread) / (1 + z * z / total)
+
+    def mostly_other(self, stats: LanguageStats) -> bool:
+        """Whether the artist confidently sings in other languages"""
+        if stats.songs < max(1, self._min_songs):
+            return False
+        return self.lower_bound(stats.other, stats.songs) >= self._threshold
+
+    def should_fetch(self, stats: LanguageStats, title: str) -> bool:
+        """Whether the next song of the artist should be fetched"""
+        if not self.mostly_other(stats) or title_suggests_portuguese(title):
+            return True
+        stats.skipped += 1
+        return bool(self._sample_every) and stats.skipped % self._sample_every == 0
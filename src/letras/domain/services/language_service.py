@@ -1,29 +1,226 @@
+import hashlib
 import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
-from lingua import Language, LanguageDetectorBuilder
+from lingua import Language, LanguageDetector, LanguageDetectorBuilder
+
+from .language_prefilter import PortuguesePrefilter
+from .language_prior import ArtistLanguagePrior
+
+LANGUAGES = (Language.PORTUGUESE, Language.ENGLISH, Language.SPANISH)
+
+# ISO 639-1 code of the detected language (None if undetermined) and confidence
+Verdict = Tuple[Optional[str], float]
+
+# What decided a verdict: the prefilter's evidence share and lingua's
+# probabilities are different measures and must not be compared
+PREFILTER = "prefilter"
+LINGUA = "lingua"
+
+# Detectors built in this process, shared by every service with the same options
+_detectors: Dict[Tuple[bool, bool, float], LanguageDetector] = {}
+_detectors_lock = threading.Lock()
+
+
+def get_detector(
+    low_accuracy: bool = False, preload: bool = False, min_distance: float = 0.0
+) -> LanguageDetector:
+    """
+    Detector for the supported languages, built on first use
+
+    Args:
+        low_accuracy: Only load the trigram models, faster and lighter but
+            less reliable on very short texts
+        preload: Load every language model up front instead of on demand
+        min_distance: Minimum relative distance between the two most likely
+            languages, below which no language is returned
+
+    Returns:
+        LanguageDetector: Detector shared within the process
+    """
+    key = (low_accuracy, preload, min_distance)
+    with _detectors_lock:
+        if (detector := _detectors.get(key)) is None:
+            builder = LanguageDetectorBuilder.from_languages(*LANGUAGES)
+            if low_accuracy:
+                builder = builder.with_low_accuracy_mode()
+            if preload:
+                builder = builder.with_preloaded_language_models()
+            if min_distance:
+                builder = builder.with_minimum_relative_distance(min_distance)
+            detector = _detectors[key] = builder.build()
+        return detector
 
 
 class LanguageService:
-    def __init__(self):
-        self.detector = LanguageDetectorBuilder.from_languages(
-            Language.PORTUGUESE, Language.ENGLISH, Language.SPANISH
-        ).build()
+    def __init__(
+        self,
+        low_accuracy: bool = False,
+        preload: bool = False,
+        min_distance: float = 0.0,
+        prefilter: bool = True,
+        cache_size: int = 10_000,
+        sample_size: int = 400,
+        sample_threshold: float = 0.2,
+        prior: Optional[ArtistLanguagePrior] = None,
+    ):
+        """
+        Initialize the service
+
+        The detector is only built when the first text is checked, unless
+        preload is set: then it is built now with every model loaded, so
+        processes forked afterwards share the memory.
+
+        Args:
+            low_accuracy: Use lingua's low accuracy mode
+            preload: Build the detector and load its models immediately
+            min_distance: Minimum relative distance for a detection
+            prefilter: Decide clear cases with PortuguesePrefilter and only
+                run the detector on the rest
+            cache_size: Verdicts kept in memory, by text fingerprint
+            sample_size: Characters of cleaned text the detector starts
+                with, 0 for the whole text
+            sample_threshold: Confidence margin over the runner-up below
+                which the sample is doubled and detection runs again
+            prior: Policy deciding from an artist's detected lyrics whether
+                to fetch the rest
+        """
+        self._options = (low_accuracy, preload, min_distance)
+        self._prefilter = PortuguesePrefilter() if prefilter else None
+        # Texts decided by the prefilter and by the detector
+        self.prefiltered = 0
+        self.detected = 0
+        # Texts whose first sample was not conclusive
+        self.extended = 0
+        self._sample_size = sample_size
+        self._sample_threshold = sample_threshold
+        self.prior = prior or ArtistLanguagePrior()
+        self._cache: OrderedDict[str, Verdict] = OrderedDict()
+        self._cache_size = cache_size
+        if preload:
+            get_detector(*self._options)
+
+    @property
+    def detector(self) -> LanguageDetector:
+        return get_detector(*self._options)
 
     def is_portuguese(self, text: str) -> bool:
         """Check if text is in Portuguese"""
         try:
-            # Clean text
-            text = self._clean_text(text)
-            if not text:
-                return False
-
-            # Detect language
-            lang = self.detector.detect_language_of(text)
-            return lang == Language.PORTUGUESE
-
+            return self.are_portuguese([text])[0]
         except Exception:
             return False
 
+    def are_portuguese(self, texts: List[str]) -> List[bool]:
+        """Check many texts at once, see detect"""
+        return [language == "pt" for language, _ in self.detect(texts)]
+
+    def detect(self, texts: List[str]) -> List[Verdict]:
+        """Language and confidence of many texts, see detect_with_sources"""
+        return [verdict for verdict, _ in self.detect_with_sources(texts)]
+
+    def detect_with_sources(self, texts: List[str]) -> List[Tuple[Verdict, str]]:
+        """
+        Language and confidence of many texts, with what decided them
+
+        Texts the prefilter cannot decide go through lingua's thread pool,
+        spreading the batch over every core. Blocking, so call it off the
+        event loop.
+
+        The detector first sees a bounded sample of each text, so the cost
+        does not grow with long lyrics and their repeated choruses. Texts
+        whose sample is not conclusive are checked again with a sample
+        twice as long, up to the whole text.
+
+        Args:
+            texts: Texts to check
+
+        Returns:
+            List[Tuple[Verdict, str]]: Language code and confidence of each
+                text, in order, and PREFILTER or LINGUA. Empty texts and
+                failed detections give (None, 0.0).
+        """
+        cleaned = [self._clean_text(text) for text in texts]
+        verdicts: List[Optional[Verdict]] = [
+            self._prefiltered(text) if text else (None, 0.0) for text in cleaned
+        ]
+        pending = [i for i, verdict in enumerate(verdicts) if verdict is None]
+        sources = [LINGUA if verdict is None else PREFILTER for verdict in verdicts]
+        self.detected += len(pending)
+        size = self._sample_size
+        while pending:
+            samples = [self._sample(cleaned[i], size) for i in pending]
+            try:
+                confidences = (
+                    self.detector.compute_language_confidence_values_in_parallel(
+                        samples
+                    )
+                )
+            except Exception:
+                confidences = [[] for _ in pending]
+
+            inconclusive = []
+            for i, sample, values in zip(pending, samples, confidences):
+                verdicts[i] = self._verdict(values)
+                if len(sample) < len(cleaned[i]) and values:
+                    if self._margin(values) < self._sample_threshold:
+                        inconclusive.append(i)
+            if inconclusive and size == self._sample_size:
+                self.extended += len(inconclusive)
+            pending, size = inconclusive, size * 2
+        return list(zip(verdicts, sources))
+
+    @staticmethod
+    def _sample(text: str, size: int) -> str:
+        """Beginning of a cleaned text, cut at a word boundary"""
+        if not size or len(text) <= size:
+            return text
+        sample = text[:size]
+        return sample.rsplit(" ", 1)[0] or sample
+
+    @staticmethod
+    def _margin(values) -> float:
+        """Confidence of the most likely language over the runner-up"""
+        return values[0].value - (values[1].value if len(values) > 1 else 0.0)
+
+    def _verdict(self, values) -> Verdict:
+        """Verdict from lingua confidence values, most likely first"""
+        if not values or not values[0].value:
+            return None, 0.0
+        top = values[0]
+        min_distance = self._options[2]
+        if min_distance and len(values) > 1:
+            if top.value - values[1].value < min_distance:
+                return None, top.value
+        return top.language.iso_code_639_1.name.lower(), top.value
+
+    def _prefiltered(self, text: str) -> Optional[Verdict]:
+        """Verdict of the prefilter on a cleaned text, None if undecided"""
+        if self._prefilter is None:
+            return None
+        if (verdict := self._prefilter.verdict(text)) is not None:
+            self.prefiltered += 1
+        return verdict
+
+    def fingerprint(self, text: str) -> str:
+        """Stable key of a text, equal for texts that clean up the same"""
+        return hashlib.sha256(self._clean_text(text).encode("utf-8")).hexdigest()
+
+    def cached(self, key: str) -> Optional[Verdict]:
+        """Verdict remembered for a fingerprint"""
+        if (verdict := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+        return verdict
+
+    def remember(self, key: str, verdict: Verdict):
+        """Keep a verdict, evicting the least recently used beyond the limit"""
+        self._cache[key] = verdict
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
     def _clean_text(self, text: str) -> str:
         """Clean text for language detection"""
         # Remove extra whitespace
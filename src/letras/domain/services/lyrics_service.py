@@ -1,14 +1,20 @@
-from typing import List, Optional
+import asyncio
+from typing import Dict, List, Optional, Tuple
 
 from rich.console import Console
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.rejection import Rejection
 from letras.domain.entities.song import Song
 from letras.domain.repositories.lyrics_repository import LyricsRepository
+from letras.infrastructure.batching import MicroBatcher
+from letras.infrastructure.web.retry import RetryLater
 from letras.infrastructure.web.scraper import WebScraper
 
-from .language_service import LanguageService
+from .content_filter import ContentFilter
+from .language_prior import LanguageStats
+from .language_service import LanguageService, Verdict
 
 
 class LyricsService:
@@ -17,39 +23,164 @@ class LyricsService:
         repository: LyricsRepository,
         language_service: LanguageService,
         scraper: WebScraper,
+        language_batch_size: int = 32,
+        language_batch_delay: float = 0.05,
+        content_filter: Optional[ContentFilter] = None,
     ):
+        """
+        Initialize the service
+
+        Args:
+            repository: Storage for artists, songs and lyrics
+            language_service: Language detector
+            scraper: Web scraper
+            language_batch_size: Lyrics checked per language detection batch
+            language_batch_delay: Seconds a lyric waits for its batch to fill
+            content_filter: Exclusion rules for artists, titles and lyrics
+        """
         self.repository = repository
         self.language_service = language_service
         self.scraper = scraper
+        self.content_filter = content_filter
         self.console = Console()
+        # Songs listed on artist pages already fetched, keyed by artist slug
+        self._page_songs: Dict[str, List[Song]] = {}
+        # Song pages handed out for fetching this run, with the artists
+        # listing them (artist id, song slug), and the ids of pages already
+        # stored
+        self._claimed: Dict[str, List[Tuple[int, str]]] = {}
+        self._stored: Dict[str, int] = {}
+        self._redirects: Optional[Dict[str, str]] = None
+        # Languages of the lyrics detected per artist, loaded on first use
+        self._artist_languages: Optional[Dict[int, LanguageStats]] = None
+        # Songs rejected before, keyed by (artist id, song slug), loaded with
+        # the artist's songs
+        self._rejections: Dict[Tuple[int, str], Rejection] = {}
+        # Lyrics arriving from concurrent workers are detected together
+        self._language = MicroBatcher(
+            self._detect_portuguese,
+            max_size=language_batch_size,
+            max_delay=language_batch_delay,
+        )
+
+    async def _detect_portuguese(self, texts: List[str]) -> List[bool]:
+        """Check one batch of lyrics"""
+        verdicts = await self._verdicts(texts)
+        return [language == "pt" for language, _ in verdicts]
+
+    async def _verdicts(self, texts: List[str]) -> List[Verdict]:
+        """
+        Language verdicts of texts, detecting each distinct text only once
+
+        Verdicts are looked up by text fingerprint in the service's memory,
+        then in the database. Only texts never seen before are detected,
+        in a worker thread, and their verdicts are stored for later runs
+        with what decided them.
+        """
+        service = self.language_service
+        keys = [service.fingerprint(text) for text in texts]
+        verdicts: Dict[str, Verdict] = {}
+        for key in keys:
+            if (verdict := service.cached(key)) is not None:
+                verdicts[key] = verdict
+
+        if missing := [key for key in dict.fromkeys(keys) if key not in verdicts]:
+            for key, verdict in (
+                await self.repository.get_language_verdicts(missing)
+            ).items():
+                service.remember(key, verdict)
+                verdicts[key] = verdict
+
+        pending = {key: text for key, text in zip(keys, texts) if key not in verdicts}
+        if pending:
+            sourced = dict(
+                zip(
+                    pending,
+                    await asyncio.to_thread(
+                        service.detect_with_sources, list(pending.values())
+                    ),
+                )
+            )
+            # Empty texts and failed detections are not worth keeping
+            await self.repository.add_language_verdicts(
+                [
+                    (key, language, confidence, source)
+                    for key, ((language, confidence), source) in sourced.items()
+                    if confidence
+                ]
+            )
+            detected = {key: verdict for key, (verdict, _) in sourced.items()}
+            for key, verdict in detected.items():
+                service.remember(key, verdict)
+            verdicts.update(detected)
+
+        return [verdicts[key] for key in keys]
+
+    async def close(self):
+        """Finish pending language detection batches"""
+        await self._language.close()
 
     async def process_artist(self, artist: Artist) -> Artist:
         """Process an artist"""
+        if not self._allows_artist(artist):
+            return None
         try:
-            scrape_result = await self.scraper.get_artist_details(artist)
-            if not scrape_result:
+            page = await self.scraper.get_artist_page(artist)
+            if not page or page.views is None:
                 return None
 
-            artist.views = scrape_result.views
+            artist.views = page.views
+            styles = artist.styles
             existing = await self.repository.get_artist_by_slug(artist.slug)
 
             if existing:
                 if existing.views != artist.views:
                     await self.repository.update_artist_views(existing.id, artist.views)
-                return existing
+                artist = existing
+            else:
+                artist = await self.repository.add_artist(artist)
 
-            return await self.repository.add_artist(artist)
+            if styles:
+                await self.repository.add_artist_styles(artist.id, styles)
+                artist.styles = styles
+            self._page_songs[artist.slug] = page.songs
+            return artist
 
+        except RetryLater:
+            raise
         except Exception as e:
             self.console.print(
                 f"[red]Error[/red] processing artist {artist.name}: {str(e)}"
             )
             raise
 
+    async def update_artist(self, artist: Artist) -> bool:
+        """Refresh views of a stored artist, returning whether they changed"""
+        if not self._allows_artist(artist):
+            return False
+        page = await self.scraper.get_artist_page(artist)
+        if not page:
+            return False
+
+        self._page_songs[artist.slug] = page.songs
+        if artist.styles:
+            await self.repository.add_artist_styles(artist.id, artist.styles)
+        if page.views is not None and page.views != artist.views:
+            await self.repository.update_artist_views(artist.id, page.views)
+            artist.views = page.views
+            return True
+        return False
+
     async def process_songs(self, artist: Artist) -> List[Song]:
         """Process artist songs"""
+        if not self._allows_artist(artist):
+            return []
         try:
-            web_songs = await self.scraper.get_artist_songs(artist)
+            # Reuse the song list read with the artist views when available
+            web_songs = self._page_songs.pop(artist.slug, None)
+            if web_songs is None:
+                page = await self.scraper.get_artist_page(artist)
+                web_songs = page.songs if page else []
             if not web_songs:
                 return []
 
@@ -57,14 +188,152 @@ class LyricsService:
                 s.slug: s for s in await self.repository.get_songs_by_artist(artist.id)
             }
 
-            return [s for s in web_songs if s.slug not in existing]
+            rejections = await self.repository.get_rejections(artist.id)
+            for rejection in rejections:
+                self._rejections[(artist.id, rejection.slug)] = rejection
+            blocked = {r.slug for r in rejections if r.blocks()}
 
+            new_songs = [
+                s
+                for s in web_songs
+                if s.slug not in existing
+                and s.slug not in blocked
+                and (
+                    self.content_filter is None
+                    or self.content_filter.allows_title(s.name)
+                )
+            ]
+            for song in new_songs:
+                song.artist_id = artist.id
+            return await self._claim(artist, new_songs)
+
+        except RetryLater:
+            raise
         except Exception as e:
             self.console.print(
                 f"[red]Error[/red] processing songs for {artist.name}: {str(e)}"
             )
             raise
 
+    async def _claim(self, artist: Artist, songs: List[Song]) -> List[Song]:
+        """
+        Keep the songs whose page still has to be fetched
+
+        Collaborations are listed by every artist involved but share one page.
+        Pages already stored or claimed by another artist are only linked to
+        this artist, so each page is fetched once per run.
+
+        Args:
+            artist: Artist listing the songs
+            songs: Songs not yet stored for the artist
+
+        Returns:
+            List[Song]: Songs to fetch
+        """
+        if self._redirects is None:
+            self._redirects = await self.repository.get_redirects()
+        for song in songs:
+            if song.path:
+                song.path = self._redirects.get(song.path, song.path)
+
+        lookup = [
+            s.path
+            for s in songs
+            if s.path and s.path not in self._claimed and s.path not in self._stored
+        ]
+        if lookup:
+            for stored in await self.repository.get_songs_by_paths(lookup):
+                self._stored[stored.path] = stored.id
+
+        claimed, links = [], []
+        for song in songs:
+            if not song.path:
+                claimed.append(song)
+            elif song.path in self._stored:
+                links.append((self._stored[song.path], artist.id))
+            elif song.path in self._claimed:
+                self._claimed[song.path].append((artist.id, song.slug))
+            else:
+                self._claimed[song.path] = [(artist.id, song.slug)]
+                claimed.append(song)
+
+        if links:
+            await self.repository.link_song_artists(links)
+        return claimed
+
+    async def _follow_redirect(self, song: Song, target: str) -> bool:
+        """
+        Record that a song page moved to target
+
+        Returns:
+            bool: Whether the song should still be stored under target, False
+                when target is already stored or claimed by another song
+        """
+        self._redirects[song.path] = target
+        await self.repository.add_redirect(song.path, target)
+        claimants = self._claimed.pop(song.path, [(song.artist_id, song.slug)])
+
+        if target not in self._stored and target not in self._claimed:
+            for stored in await self.repository.get_songs_by_paths([target]):
+                self._stored[target] = stored.id
+
+        if target in self._stored:
+            await self.repository.link_song_artists(
+                [(self._stored[target], artist_id) for artist_id, _ in claimants]
+            )
+            return False
+        if target in self._claimed:
+            self._claimed[target].extend(claimants)
+            return False
+
+        self._claimed[target] = claimants
+        song.path = target
+        return True
+
+    async def _language_stats(self, artist: Artist) -> LanguageStats:
+        """Detected lyric languages of an artist, across runs"""
+        if self._artist_languages is None:
+            counts = await self.repository.get_artist_languages()
+            if self._artist_languages is None:
+                self._artist_languages = {
+                    artist_id: LanguageStats(*pair)
+                    for artist_id, pair in counts.items()
+                }
+        return self._artist_languages.setdefault(artist.id, LanguageStats())
+
+    async def _worth_fetching(self, artist: Artist, song: Song) -> bool:
+        """Whether the artist's language history justifies fetching the song"""
+        if len(self._claimed.get(song.path, ())) > 1:
+            # Other artists listing the page rely on this fetch
+            return True
+        stats = await self._language_stats(artist)
+        return self.language_service.prior.should_fetch(stats, song.name)
+
+    def _allows_artist(self, artist: Artist) -> bool:
+        return self.content_filter is None or self.content_filter.allows_artist(
+            artist.name
+        )
+
+    def _release_claim(self, artist: Artist, song: Song) -> List[Tuple[int, str]]:
+        """Give up the claim on a song page, returning every artist listing it"""
+        claimants = self._claimed.pop(song.path, None) if song.path else None
+        return claimants or [(artist.id, song.slug)]
+
+    async def _reject_claim(self, artist: Artist, song: Song, reason: str):
+        """
+        Leave a song out of later runs until its retry time, for every artist
+        listing its page
+        """
+        for artist_id, slug in self._release_claim(artist, song):
+            if not artist_id:
+                continue
+            key = (artist_id, slug)
+            rejection = Rejection.create(
+                artist_id, slug, reason, previous=self._rejections.get(key)
+            )
+            self._rejections[key] = rejection
+            await self.repository.add_rejection(rejection)
+
     async def process_lyrics(self, artist: Artist, song: Song) -> Optional[Lyrics]:
         """Process song lyrics"""
         try:
@@ -73,21 +342,55 @@ class LyricsService:
                 if existing:
                     return existing
 
+            if artist.id and not await self._worth_fetching(artist, song):
+                self._release_claim(artist, song)
+                return None
+
             scrape_result = await self.scraper.get_song_details(artist, song)
             if not scrape_result:
+                reason = self.scraper.failure_reason(artist, song) or "error"
+                await self._reject_claim(artist, song, reason)
+                return None
+
+            if self.content_filter is not None and not (
+                self.content_filter.allows_lyrics(scrape_result.content)
+            ):
+                await self._reject_claim(artist, song, "filtered")
                 return None
 
             song.views = scrape_result.views
+            if song.path and scrape_result.path and scrape_result.path != song.path:
+                if not await self._follow_redirect(song, scrape_result.path):
+                    return None
 
-            if not self.language_service.is_portuguese(scrape_result.content):
+            portuguese = await self._language.submit(scrape_result.content)
+            if artist.id:
+                (await self._language_stats(artist)).record(portuguese)
+                await self.repository.record_artist_language(artist.id, portuguese)
+            if not portuguese:
+                await self._reject_claim(artist, song, "language")
                 return None
 
             if not song.id:
                 song = await self.repository.add_song(song)
+                if song.path:
+                    # Artists that listed the page while it was being fetched
+                    self._stored[song.path] = song.id
+                    claimants = self._claimed.pop(
+                        song.path, [(song.artist_id, song.slug)]
+                    )
+                    await self.repository.link_song_artists(
+                        [(song.id, artist_id) for artist_id, _ in claimants]
+                    )
+
+            if self._rejections.pop((artist.id, song.slug), None):
+                await self.repository.remove_rejection(artist.id, song.slug)
 
             lyrics = Lyrics(song_id=song.id, content=scrape_result.content)
             return await self.repository.add_lyrics(lyrics)
 
+        except RetryLater:
+            raise
         except Exception as e:
             self.console.print(
                 f"[red]Error[/red] processing lyrics for {song.name}: {str(e)}"
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Group concurrent single-item calls into batched calls
+
+    Callers await one result each; items are collected until the batch is
+    full or the oldest one has waited max_delay seconds, then handed to func
+    in a single call. func must return one result per item, in order.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[T]], Awaitable[List[R]]],
+        max_size: int = 32,
+        max_delay: float = 0.005,
+    ):
+        self._func = func
+        self._max_size = max(1, max_size)
+        self._max_delay = max_delay
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Queue one item and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        """Hand the pending items to func"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]):
+        try:
+            results = await self._func([item for item, _ in batch])
+            for (_, future), result in zip(batch, results, strict=True):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            # Also covers func returning the wrong number of results
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def close(self):
+        """Flush what is pending and wait for running batches"""
+        self._flush()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
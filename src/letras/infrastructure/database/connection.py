@@ -63,6 +63,60 @@ class PostgresConnection:
                 
                 CREATE INDEX IF NOT EXISTS idx_artists_slug ON artists(slug);
                 CREATE INDEX IF NOT EXISTS idx_songs_artist_id ON songs(artist_id);
+
+                -- Canonical page of a song, one row per page across artists
+                ALTER TABLE songs ADD COLUMN IF NOT EXISTS path VARCHAR(512);
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_songs_path ON songs(path);
+
+                CREATE TABLE IF NOT EXISTS song_artists (
+                    song_id INTEGER NOT NULL REFERENCES songs(id) ON DELETE CASCADE,
+                    artist_id INTEGER NOT NULL REFERENCES artists(id) ON DELETE CASCADE,
+                    PRIMARY KEY (song_id, artist_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS artist_styles (
+                    artist_id INTEGER NOT NULL REFERENCES artists(id) ON DELETE CASCADE,
+                    style VARCHAR(100) NOT NULL,
+                    PRIMARY KEY (artist_id, style)
+                );
+
+                -- Songs fetched but not stored, left out until retry_after
+                CREATE TABLE IF NOT EXISTS rejected_songs (
+                    artist_id INTEGER NOT NULL REFERENCES artists(id) ON DELETE CASCADE,
+                    slug VARCHAR(255) NOT NULL,
+                    reason VARCHAR(32) NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 1,
+                    rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    retry_after TIMESTAMP,
+                    PRIMARY KEY (artist_id, slug)
+                );
+
+                -- Languages of the lyrics detected for each artist
+                CREATE TABLE IF NOT EXISTS artist_languages (
+                    artist_id INTEGER PRIMARY KEY REFERENCES artists(id) ON DELETE CASCADE,
+                    portuguese INTEGER NOT NULL DEFAULT 0,
+                    other INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+
+                -- Language detected for a cleaned text, keyed by its SHA-256;
+                -- confidence is lingua's probability or, when source is
+                -- 'prefilter', the prefilter's share of evidence
+                CREATE TABLE IF NOT EXISTS language_verdicts (
+                    text_hash CHAR(64) PRIMARY KEY,
+                    language VARCHAR(8),
+                    confidence REAL NOT NULL,
+                    source VARCHAR(16) NOT NULL,
+                    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                -- Verdicts stored before sources were recorded have none
+                ALTER TABLE language_verdicts
+                    ADD COLUMN IF NOT EXISTS source VARCHAR(16);
+
+                CREATE TABLE IF NOT EXISTS song_redirects (
+                    path VARCHAR(512) PRIMARY KEY,
+                    target VARCHAR(512) NOT NULL
+                );
             """
             )
 
@@ -1,10 +1,11 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from asyncpg import Connection
+from asyncpg import Connection, Record
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.rejection import Rejection
 from letras.domain.entities.song import Song
 from letras.domain.repositories.lyrics_repository import LyricsRepository
 from letras.infrastructure.database.connection import PostgresConnection
@@ -80,6 +81,16 @@ class PostgresRepository(LyricsRepository):
             )
             return Artist(**row)
 
+    async def add_artists(self, artists: List[Artist]) -> List[Artist]:
+        rows = await self._copy_merge(
+            "artists",
+            {"name": "VARCHAR(255)", "slug": "VARCHAR(255)", "views": "INTEGER"},
+            key=("slug",),
+            update="views = EXCLUDED.views",
+            records=[(a.name, a.slug, a.views) for a in artists],
+        )
+        return [Artist(**row) for row in rows]
+
     async def update_artist_views(self, artist_id: int, views: int) -> None:
         if self._current_transaction:
             await self._current_transaction.execute(
@@ -102,6 +113,22 @@ class PostgresRepository(LyricsRepository):
                 views,
             )
 
+    async def add_artist_styles(self, artist_id: int, styles: List[str]) -> None:
+        if not styles:
+            return
+        query = """
+            INSERT INTO artist_styles (artist_id, style)
+            VALUES ($1, $2)
+            ON CONFLICT DO NOTHING
+        """
+        rows = [(artist_id, style) for style in styles]
+        if self._current_transaction:
+            await self._current_transaction.executemany(query, rows)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.executemany(query, rows)
+
     async def get_songs_by_artist(self, artist_id: int) -> List[Song]:
         if self._current_transaction:
             rows = await self._current_transaction.fetch(
@@ -130,8 +157,8 @@ class PostgresRepository(LyricsRepository):
         if self._current_transaction:
             row = await self._current_transaction.fetchrow(
                 """
-                INSERT INTO songs (name, slug, artist_id, views)
-                VALUES ($1, $2, $3, $4)
+                INSERT INTO songs (name, slug, artist_id, views, path)
+                VALUES ($1, $2, $3, $4, $5)
                 ON CONFLICT (artist_id, slug) DO UPDATE 
                     SET views = EXCLUDED.views
                 RETURNING *
@@ -140,14 +167,15 @@ class PostgresRepository(LyricsRepository):
                 song.slug,
                 song.artist_id,
                 song.views,
+                song.path,
             )
             return Song(**row)
 
         async with self._conn.acquire() as conn:
             row = await conn.fetchrow(
                 """
-                INSERT INTO songs (name, slug, artist_id, views)
-                VALUES ($1, $2, $3, $4)
+                INSERT INTO songs (name, slug, artist_id, views, path)
+                VALUES ($1, $2, $3, $4, $5)
                 ON CONFLICT (artist_id, slug) DO UPDATE 
                     SET views = EXCLUDED.views
                 RETURNING *
@@ -156,9 +184,187 @@ class PostgresRepository(LyricsRepository):
                 song.slug,
                 song.artist_id,
                 song.views,
+                song.path,
             )
             return Song(**row)
 
+    async def add_songs(self, songs: List[Song]) -> List[Song]:
+        rows = await self._copy_merge(
+            "songs",
+            {
+                "name": "VARCHAR(255)",
+                "slug": "VARCHAR(255)",
+                "artist_id": "INTEGER",
+                "views": "INTEGER",
+                "path": "VARCHAR(512)",
+            },
+            key=("artist_id", "slug"),
+            update="views = EXCLUDED.views",
+            records=[(s.name, s.slug, s.artist_id, s.views, s.path) for s in songs],
+        )
+        return [Song(**row) for row in rows]
+
+    async def get_songs_by_paths(self, paths: List[str]) -> List[Song]:
+        if not paths:
+            return []
+        if self._current_transaction:
+            rows = await self._current_transaction.fetch(
+                "SELECT * FROM songs WHERE path = ANY($1::varchar[])", paths
+            )
+            return [Song(**row) for row in rows]
+
+        async with self._conn.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM songs WHERE path = ANY($1::varchar[])", paths
+            )
+            return [Song(**row) for row in rows]
+
+    async def link_song_artists(self, links: List[Tuple[int, int]]) -> None:
+        if not links:
+            return
+        query = """
+            INSERT INTO song_artists (song_id, artist_id)
+            VALUES ($1, $2)
+            ON CONFLICT DO NOTHING
+        """
+        if self._current_transaction:
+            await self._current_transaction.executemany(query, links)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.executemany(query, links)
+
+    async def get_redirects(self) -> Dict[str, str]:
+        if self._current_transaction:
+            rows = await self._current_transaction.fetch(
+                "SELECT path, target FROM song_redirects"
+            )
+            return {row["path"]: row["target"] for row in rows}
+
+        async with self._conn.acquire() as conn:
+            rows = await conn.fetch("SELECT path, target FROM song_redirects")
+            return {row["path"]: row["target"] for row in rows}
+
+    async def add_redirect(self, path: str, target: str) -> None:
+        query = """
+            INSERT INTO song_redirects (path, target)
+            VALUES ($1, $2)
+            ON CONFLICT (path) DO UPDATE SET target = EXCLUDED.target
+        """
+        if self._current_transaction:
+            await self._current_transaction.execute(query, path, target)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.execute(query, path, target)
+
+    async def get_rejections(self, artist_id: int) -> List[Rejection]:
+        query = "SELECT * FROM rejected_songs WHERE artist_id = $1"
+        if self._current_transaction:
+            rows = await self._current_transaction.fetch(query, artist_id)
+        else:
+            async with self._conn.acquire() as conn:
+                rows = await conn.fetch(query, artist_id)
+        return [Rejection(**row) for row in rows]
+
+    async def add_rejection(self, rejection: Rejection) -> None:
+        query = """
+            INSERT INTO rejected_songs
+                (artist_id, slug, reason, attempts, rejected_at, retry_after)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (artist_id, slug) DO UPDATE
+                SET reason = EXCLUDED.reason,
+                    attempts = EXCLUDED.attempts,
+                    rejected_at = EXCLUDED.rejected_at,
+                    retry_after = EXCLUDED.retry_after
+        """
+        args = (
+            rejection.artist_id,
+            rejection.slug,
+            rejection.reason,
+            rejection.attempts,
+            rejection.rejected_at,
+            rejection.retry_after,
+        )
+        if self._current_transaction:
+            await self._current_transaction.execute(query, *args)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.execute(query, *args)
+
+    async def remove_rejection(self, artist_id: int, slug: str) -> None:
+        query = "DELETE FROM rejected_songs WHERE artist_id = $1 AND slug = $2"
+        if self._current_transaction:
+            await self._current_transaction.execute(query, artist_id, slug)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.execute(query, artist_id, slug)
+
+    async def get_artist_languages(self) -> Dict[int, Tuple[int, int]]:
+        query = "SELECT artist_id, portuguese, other FROM artist_languages"
+        if self._current_transaction:
+            rows = await self._current_transaction.fetch(query)
+        else:
+            async with self._conn.acquire() as conn:
+                rows = await conn.fetch(query)
+        return {row["artist_id"]: (row["portuguese"], row["other"]) for row in rows}
+
+    async def record_artist_language(self, artist_id: int, portuguese: bool) -> None:
+        query = """
+            INSERT INTO artist_languages (artist_id, portuguese, other)
+            VALUES ($1, $2, $3)
+            ON CONFLICT (artist_id) DO UPDATE
+                SET portuguese = artist_languages.portuguese + EXCLUDED.portuguese,
+                    other = artist_languages.other + EXCLUDED.other,
+                    updated_at = CURRENT_TIMESTAMP
+        """
+        args = (artist_id, int(portuguese), int(not portuguese))
+        if self._current_transaction:
+            await self._current_transaction.execute(query, *args)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.execute(query, *args)
+
+    async def get_language_verdicts(
+        self, hashes: List[str]
+    ) -> Dict[str, Tuple[Optional[str], float]]:
+        if not hashes:
+            return {}
+        query = """
+            SELECT text_hash, language, confidence FROM language_verdicts
+            WHERE text_hash = ANY($1::char(64)[])
+        """
+        if self._current_transaction:
+            rows = await self._current_transaction.fetch(query, hashes)
+        else:
+            async with self._conn.acquire() as conn:
+                rows = await conn.fetch(query, hashes)
+        return {row["text_hash"]: (row["language"], row["confidence"]) for row in rows}
+
+    async def add_language_verdicts(
+        self, verdicts: List[Tuple[str, Optional[str], float, str]]
+    ) -> None:
+        if not verdicts:
+            return
+        query = """
+            INSERT INTO language_verdicts (text_hash, language, confidence, source)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (text_hash) DO UPDATE
+                SET language = EXCLUDED.language,
+                    confidence = EXCLUDED.confidence,
+                    source = EXCLUDED.source,
+                    detected_at = CURRENT_TIMESTAMP
+        """
+        if self._current_transaction:
+            await self._current_transaction.executemany(query, verdicts)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.executemany(query, verdicts)
+
     async def add_lyrics(self, lyrics: Lyrics) -> Lyrics:
         if self._current_transaction:
             row = await self._current_transaction.fetchrow(
@@ -190,6 +396,84 @@ class PostgresRepository(LyricsRepository):
             )
             return Lyrics(**row)
 
+    async def add_many_lyrics(self, lyrics: List[Lyrics]) -> List[Lyrics]:
+        rows = await self._copy_merge(
+            "lyrics",
+            {"song_id": "INTEGER", "content": "TEXT"},
+            key=("song_id",),
+            update="content = EXCLUDED.content, last_updated = CURRENT_TIMESTAMP",
+            records=[(item.song_id, item.content) for item in lyrics],
+        )
+        return [Lyrics(**row) for row in rows]
+
+    async def _copy_merge(
+        self,
+        table: str,
+        columns: Dict[str, str],
+        key: Tuple[str, ...],
+        update: str,
+        records: List[tuple],
+    ) -> List[Record]:
+        """
+        Upsert many rows with one COPY and one merge statement
+
+        Records are copied into a temporary staging table, then inserted
+        into table in a single INSERT ... SELECT ... ON CONFLICT. Records
+        sharing a key are merged once, the last one winning.
+
+        Args:
+            table: Table to upsert into
+            columns: Column names and types of the records
+            key: Columns of the table's unique constraint
+            update: SET clause applied to rows already stored
+            records: Values in the order of columns
+
+        Returns:
+            List[Record]: Stored rows, in the order of records
+        """
+        if not records:
+            return []
+        staging = f"staging_{table}"
+        names = ", ".join(columns)
+        keys = ", ".join(key)
+        definition = ", ".join(f"{name} {kind}" for name, kind in columns.items())
+        merge = f"""
+            INSERT INTO {table} ({names})
+            SELECT {names} FROM (
+                SELECT DISTINCT ON ({keys}) * FROM {staging}
+                ORDER BY {keys}, position DESC
+            ) latest
+            ORDER BY position
+            ON CONFLICT ({keys}) DO UPDATE SET {update}
+            RETURNING *
+        """
+
+        async def run(conn: Connection) -> List[Record]:
+            async with conn.transaction():
+                await conn.execute(
+                    f"CREATE TEMP TABLE {staging} (position INTEGER, {definition}) "
+                    "ON COMMIT DROP"
+                )
+                await conn.copy_records_to_table(
+                    staging,
+                    records=[(i, *record) for i, record in enumerate(records)],
+                    columns=["position", *columns],
+                )
+                rows = await conn.fetch(merge)
+                # Dropped now in case an outer transaction makes more calls
+                await conn.execute(f"DROP TABLE {staging}")
+            return rows
+
+        if self._current_transaction:
+            rows = await run(self._current_transaction)
+        else:
+            async with self._conn.acquire() as conn:
+                rows = await run(conn)
+
+        positions = [list(columns).index(column) for column in key]
+        stored = {tuple(row[column] for column in key): row for row in rows}
+        return [stored[tuple(record[i] for i in positions)] for record in records]
+
     async def get_lyrics_by_song(self, song_id: int) -> Optional[Lyrics]:
         if self._current_transaction:
             row = await self._current_transaction.fetchrow(
@@ -202,3 +486,12 @@ class PostgresRepository(LyricsRepository):
                 "SELECT * FROM lyrics WHERE song_id = $1", song_id
             )
             return Lyrics(**row) if row else None
+
+    async def clear(self) -> None:
+        query = "TRUNCATE lyrics, songs, artists RESTART IDENTITY CASCADE"
+        if self._current_transaction:
+            await self._current_transaction.execute(query)
+            return
+
+        async with self._conn.acquire() as conn:
+            await conn.execute(query)
@@ -0,0 +1,162 @@
+import gzip
+import logging
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ArchiveMiss(LookupError):
+    """The archive has no record for a URL"""
+
+    pass
+
+
+class WarcWriter:
+    """
+    Append fetched pages to a WARC file
+
+    Every page becomes a 'response' record holding a minimal HTTP response,
+    compressed as its own gzip member like regular .warc.gz files, so records
+    can be read back individually.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self.records = 0
+
+    def write(
+        self,
+        url: str,
+        body: str,
+        truncated: bool = False,
+        requested: Optional[str] = None,
+    ):
+        """
+        Append one page
+
+        Args:
+            url: Absolute URL the page was served from
+            body: Decoded page body
+            truncated: Whether only the beginning of the page was read
+            requested: URL asked for, when it redirected to url
+        """
+        payload = body.encode("utf-8")
+        block = (
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/html; charset=utf-8\r\n"
+            b"Content-Length: %d\r\n\r\n" % len(payload)
+        ) + payload
+
+        headers = {
+            "WARC-Type": "response",
+            "WARC-Record-ID": f"<urn:uuid:{uuid4()}>",
+            "WARC-Date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "WARC-Target-URI": url,
+            "Content-Type": "application/http; msgtype=response",
+            "Content-Length": str(len(block)),
+        }
+        if truncated:
+            headers["WARC-Truncated"] = "length"
+        if requested and requested != url:
+            headers["Requested-URI"] = requested
+
+        head = "WARC/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        record = head.encode("utf-8") + b"\r\n" + block + b"\r\n\r\n"
+        self._file.write(gzip.compress(record, compresslevel=6))
+        self.records += 1
+
+    def close(self):
+        self._file.close()
+
+
+def _members(path: Path) -> Iterator[Tuple[int, bytes]]:
+    """Offset and decompressed content of every gzip member of a file"""
+    with open(path, "rb") as f:
+        offset = 0
+        while True:
+            f.seek(offset)
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            parts = []
+            read = 0
+            while not decompressor.eof:
+                if not (chunk := f.read(CHUNK_SIZE)):
+                    break
+                read += len(chunk)
+                parts.append(decompressor.decompress(chunk))
+
+            if not decompressor.eof:
+                # End of file, or a record cut short by an interrupted run
+                return
+            yield offset, b"".join(parts)
+            offset += read - len(decompressor.unused_data)
+
+
+def _parse_headers(record: bytes) -> Tuple[Dict[str, str], bytes]:
+    """WARC headers of a record and the block following them"""
+    head, _, rest = record.partition(b"\r\n\r\n")
+    lines = head.decode("utf-8").split("\r\n")[1:]
+    return dict(line.split(": ", 1) for line in lines if ": " in line), rest
+
+
+def _parse_record(record: bytes) -> Tuple[Dict[str, str], str]:
+    """WARC headers and decoded HTTP body of a response record"""
+    headers, rest = _parse_headers(record)
+    block = rest[: int(headers.get("Content-Length", len(rest)))]
+    _, _, payload = block.partition(b"\r\n\r\n")
+    return headers, payload.decode("utf-8", errors="ignore")
+
+
+class WarcArchive:
+    """Random access to the pages stored in one or more WARC files"""
+
+    def __init__(self, paths: Iterable[str]):
+        self._logger = logging.getLogger(__name__)
+        self._paths = [Path(path) for path in paths]
+        # URL -> (file, offset of its record); later records win
+        self._index: Dict[str, Tuple[Path, int]] = {}
+        # Requested URL -> URL it redirected to when recorded
+        self.redirects: Dict[str, str] = {}
+        for path in self._paths:
+            for offset, record in _members(path):
+                headers, _ = _parse_headers(record)
+                if headers.get("WARC-Type") != "response":
+                    continue
+                url = headers["WARC-Target-URI"]
+                self._index[url] = (path, offset)
+                self.redirects.pop(url, None)
+                # Redirected pages are also found under the URL asked for
+                if requested := headers.get("Requested-URI"):
+                    self._index[requested] = (path, offset)
+                    self.redirects[requested] = url
+        self._logger.info(f"Archive: {len(self._index)} pages indexed")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def urls(self) -> List[str]:
+        return list(self._index)
+
+    def get(self, url: str) -> str:
+        """Body stored for a URL"""
+        try:
+            path, offset = self._index[url]
+        except KeyError:
+            raise ArchiveMiss(f"{url} is not in the archive") from None
+
+        with open(path, "rb") as f:
+            f.seek(offset)
+            decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            parts = []
+            while not decompressor.eof and (chunk := f.read(CHUNK_SIZE)):
+                parts.append(decompressor.decompress(chunk))
+        _, body = _parse_record(b"".join(parts))
+        return body
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import logging
+import os
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    key: str
+    size: int
+    body_size: int
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    evicted: int = 0
+    bytes_saved: int = 0
+
+
+class HttpCache:
+    """On-disk cache of compressed response bodies keyed by URL"""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = 24 * 60 * 60,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            directory: Where bodies (.z) and their metadata (.json) are stored
+            ttl: Seconds an entry is served without asking the server
+            max_bytes: Size cap for stored bodies, least recently used
+                entries are evicted first
+        """
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        self._logger = logging.getLogger(__name__)
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total = 0
+        self.stats = CacheStats()
+        self._load()
+
+    def _load(self):
+        """Rebuild the index from disk, oldest access first"""
+        found = []
+        for meta_path in self._dir.glob("*.json"):
+            body_path = meta_path.with_suffix(".z")
+            try:
+                entry = CacheEntry(**json.loads(meta_path.read_text()))
+                found.append((body_path.stat().st_mtime, entry))
+            except (OSError, ValueError, TypeError):
+                meta_path.unlink(missing_ok=True)
+                body_path.unlink(missing_ok=True)
+
+        for _, entry in sorted(found, key=lambda x: x[0]):
+            self._entries[entry.url] = entry
+            self._total += entry.size
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _paths(self, key: str):
+        return self._dir / f"{key}.z", self._dir / f"{key}.json"
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Get the entry for a URL, if any"""
+        return self._entries.get(url)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether the entry can be served without revalidation"""
+        return time.time() - entry.stored_at < self._ttl
+
+    def conditional_headers(self, entry: CacheEntry) -> Dict[str, str]:
+        """Headers to revalidate the entry with the server"""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def hit(self, entry: CacheEntry, revalidated: bool = False) -> Optional[str]:
+        """
+        Serve an entry from disk
+
+        Args:
+            entry: Entry to read
+            revalidated: Whether the server just confirmed it with a 304, which
+                restarts its TTL
+
+        Returns:
+            Optional[str]: The body, or None when it could not be read
+        """
+        body_path, meta_path = self._paths(entry.key)
+        try:
+            body = zlib.decompress(body_path.read_bytes()).decode("utf-8")
+        except (OSError, zlib.error):
+            self._remove(entry)
+            return None
+
+        if revalidated:
+            entry.stored_at = time.time()
+            meta_path.write_text(json.dumps(asdict(entry)))
+            self.stats.revalidated += 1
+
+        # Mark as most recently used, on disk too so it survives restarts
+        self._entries.move_to_end(entry.url)
+        os.utime(body_path)
+        self.stats.hits += 1
+        self.stats.bytes_saved += entry.body_size
+        return body
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Store a freshly downloaded body"""
+        self.stats.misses += 1
+        data = body.encode("utf-8")
+        compressed = zlib.compress(data, 6)
+
+        if old := self._entries.get(url):
+            self._remove(old)
+
+        entry = CacheEntry(
+            url=url,
+            key=self._key(url),
+            size=len(compressed),
+            body_size=len(data),
+            stored_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        body_path, meta_path = self._paths(entry.key)
+        try:
+            body_path.write_bytes(compressed)
+            meta_path.write_text(json.dumps(asdict(entry)))
+        except OSError as e:
+            self._logger.warning(f"Could not cache {url}: {e}")
+            return
+
+        self._entries[url] = entry
+        self._total += entry.size
+        self._evict()
+
+    def _remove(self, entry: CacheEntry):
+        body_path, meta_path = self._paths(entry.key)
+        body_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+        if self._entries.pop(entry.url, None):
+            self._total -= entry.size
+
+    def _evict(self):
+        """Drop least recently used entries until under the size cap"""
+        while self._total > self._max_bytes and len(self._entries) > 1:
+            _, entry = next(iter(self._entries.items()))
+            self._remove(entry)
+            self.stats.evicted += 1
+
+    @property
+    def size(self) -> int:
+        """Bytes currently stored on disk"""
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
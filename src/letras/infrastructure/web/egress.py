@@ -0,0 +1,137 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, List, Optional
+
+import aiohttp
+
+from .rate import RateController
+
+
+class EgressRoute:
+    """One way out to the site: an HTTP proxy or a local source address"""
+
+    def __init__(self, spec: str, max_window: int, rate: Optional[float] = None):
+        """
+        Initialize the route
+
+        Args:
+            spec: Proxy URL (http://host:port) or local IP address to bind to
+            max_window: Upper bound for requests in flight through the route
+            rate: Requests per second through the route, None for no limit
+        """
+        self.spec = spec
+        self.proxy = spec if spec.startswith(("http://", "https://")) else None
+        self.local_address = None if self.proxy else spec
+        self.limiter = RateController(max_window=max_window, rate=rate)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.benched_until = 0.0
+        self.strikes = 0
+        self.requests = 0
+
+    @property
+    def options(self) -> Dict[str, str]:
+        """Extra request options for this route"""
+        return {"proxy": self.proxy} if self.proxy else {}
+
+    @property
+    def load(self) -> float:
+        """Share of the route's window in use"""
+        return self.limiter.in_flight / max(1.0, self.limiter.window)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.benched_until
+
+
+class EgressPool:
+    """
+    Spread requests over several egress routes
+
+    Each route has its own session and an equal share of the request budget,
+    so adding routes spreads connections without raising the total load on
+    the site. Requests go to the least loaded route, and a route the site
+    starts throttling is benched for a while, longer after every strike.
+    """
+
+    def __init__(
+        self,
+        routes: List[str],
+        max_workers: int = 10,
+        rate: Optional[float] = None,
+        bench: float = 30,
+        max_bench: float = 600,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            routes: Proxy URLs or local IP addresses
+            max_workers: Requests in flight over all routes
+            rate: Requests per second over all routes, None for no limit
+            bench: Seconds a throttled route sits out after its first strike
+            max_bench: Upper bound for the time out of rotation
+        """
+        if not routes:
+            raise ValueError("An egress pool needs at least one route")
+        share = len(routes)
+        self.routes = [
+            EgressRoute(
+                spec,
+                max_window=max(1, max_workers // share),
+                rate=rate / share if rate else None,
+            )
+            for spec in routes
+        ]
+        self._bench = bench
+        self._max_bench = max_bench
+
+    async def initialize(self, **session_options):
+        """Open one session per route"""
+        for route in self.routes:
+            if route.session is None:
+                connector = aiohttp.TCPConnector(
+                    limit=route.limiter.max_window,
+                    local_addr=(
+                        (route.local_address, 0) if route.local_address else None
+                    ),
+                    enable_cleanup_closed=True,
+                )
+                route.session = aiohttp.ClientSession(
+                    connector=connector, **session_options
+                )
+
+    async def choose(self) -> EgressRoute:
+        """Least loaded route in rotation, waiting if all are benched"""
+        while True:
+            if available := [route for route in self.routes if route.available]:
+                return min(available, key=lambda route: route.load)
+            wake = min(route.benched_until for route in self.routes)
+            await asyncio.sleep(max(0.0, wake - time.monotonic()))
+
+    def penalize(self, route: EgressRoute):
+        """Take a throttled route out of rotation"""
+        route.strikes += 1
+        pause = min(self._max_bench, self._bench * 2 ** (route.strikes - 1))
+        route.benched_until = time.monotonic() + pause
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[EgressRoute, None]:
+        """Hold a request slot on the least loaded route"""
+        route = await self.choose()
+        try:
+            async with route.limiter.slot():
+                route.requests += 1
+                yield route
+        except Exception as e:
+            if RateController.is_overload(e):
+                self.penalize(route)
+            raise
+        else:
+            route.strikes = 0
+
+    async def close(self):
+        for route in self.routes:
+            if route.session is not None:
+                await route.session.close()
+                route.session = None
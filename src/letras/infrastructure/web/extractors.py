@@ -0,0 +1,222 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:  # lxml is an optional dependency
+    lxml_html = None
+
+# Plain tuples keep results cheap to build and to send between processes
+ArtistLink = Tuple[str, str]  # name, slug
+SongLink = Tuple[str, str, str]  # name, slug, canonical path
+ArtistPageData = Tuple[Optional[int], List[SongLink]]  # views, songs
+SongPageData = Tuple[int, str]  # views, content
+
+
+def artist_slug(href: str) -> Optional[str]:
+    """Slug of an artist link, or None for links that are not artist pages"""
+    slug = href.strip("/")
+    return slug if slug and "/" not in slug else None
+
+
+def song_slug(href: str) -> str:
+    """Slug of a song link"""
+    return href.strip("/").split("/")[-1]
+
+
+def song_path(href: str) -> str:
+    """
+    Canonical path of a song link
+
+    Songs are linked from every artist featuring them, but the link points
+    to the page under the artist owning it, so the path identifies the page.
+    """
+    return f"/{urlsplit(href).path.strip('/')}/"
+
+
+def parse_views(text: str) -> int:
+    """Parse a view counter such as '1.234'"""
+    return int(text.replace(".", ""))
+
+
+class Extractor(ABC):
+    """Pull the few fields the scraper needs out of a page's HTML"""
+
+    name: str
+
+    @abstractmethod
+    def artists(self, html: str) -> List[ArtistLink]:
+        """Artist links of a style index page"""
+        pass
+
+    @abstractmethod
+    def artist_page(self, html: str) -> ArtistPageData:
+        """Views and song links of an artist page"""
+        pass
+
+    @abstractmethod
+    def song_page(self, html: str) -> Optional[SongPageData]:
+        """Views and lyrics of a song page, None if it has no lyrics"""
+        pass
+
+
+def _has_class(*names: str) -> Callable[[Optional[str]], bool]:
+    """Strainer predicate matching any of the given CSS classes"""
+    wanted = set(names)
+    return lambda value: value is not None and not wanted.isdisjoint(value.split())
+
+
+class SoupExtractor(Extractor):
+    """BeautifulSoup over the whole document"""
+
+    name = "soup"
+
+    ARTISTS = SoupStrainer("a", href=True)
+    ARTIST_PAGE = SoupStrainer(
+        ["div", "li"], class_=_has_class("head-info-exib", "songList-table-row")
+    )
+    SONG_PAGE = SoupStrainer(
+        "div", class_=_has_class("head-info-exib", "lyric-original")
+    )
+
+    def _soup(self, html: str, strainer: SoupStrainer) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def _views(self, soup: BeautifulSoup) -> Optional[int]:
+        views_div = soup.find("div", class_="head-info-exib")
+        if views_div and (views_text := views_div.find("b")):
+            return parse_views(views_text.text)
+        return None
+
+    def artists(self, html: str) -> List[ArtistLink]:
+        soup = self._soup(html, self.ARTISTS)
+        return [
+            (link.text.strip(), slug)
+            for link in soup.find_all("a", href=True)
+            if (slug := artist_slug(link["href"]))
+        ]
+
+    def artist_page(self, html: str) -> ArtistPageData:
+        soup = self._soup(html, self.ARTIST_PAGE)
+        songs = []
+        for song_div in soup.find_all("li", class_="songList-table-row"):
+            if link := song_div.find("a", class_="songList-table-songName"):
+                songs.append(
+                    (
+                        link.get("title", "").strip() or link.text.strip(),
+                        song_slug(link["href"]),
+                        song_path(link["href"]),
+                    )
+                )
+        return self._views(soup), songs
+
+    def song_page(self, html: str) -> Optional[SongPageData]:
+        soup = self._soup(html, self.SONG_PAGE)
+        if content_div := soup.find("div", class_="lyric-original"):
+            paragraphs = []
+            for p in content_div.find_all("p"):
+                lines = [element for element in p.stripped_strings]
+                paragraphs.append("\n".join(lines))
+            return self._views(soup) or 0, "\n\n".join(paragraphs)
+        return None
+
+
+class StrainedSoupExtractor(SoupExtractor):
+    """BeautifulSoup building only the elements each page kind needs"""
+
+    name = "strained"
+
+    def _soup(self, html: str, strainer: SoupStrainer) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+
+def _class_xpath(tag: str, name: str) -> str:
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+
+
+class LxmlExtractor(Extractor):
+    """libxml2's C parser through lxml, working on the encoded bytes"""
+
+    name = "lxml"
+
+    # Only the first counter block counts, like soup.find
+    VIEWS = f"(//{_class_xpath('div', 'head-info-exib')})[1]//b"
+    SONG_LINKS = (
+        f"//{_class_xpath('li', 'songList-table-row')}"
+        f"/descendant::{_class_xpath('a', 'songList-table-songName')}[1]"
+    )
+    LYRICS = f"//{_class_xpath('div', 'lyric-original')}"
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError(
+                "The 'lxml' parser needs lxml, install it with `pip install lxml`"
+            )
+        self._parser = lxml_html.HTMLParser(encoding="utf-8")
+
+    def _document(self, html: str):
+        if not html.strip():
+            return None
+        return lxml_html.document_fromstring(html.encode("utf-8"), parser=self._parser)
+
+    def _views(self, document) -> Optional[int]:
+        if views := document.xpath(self.VIEWS):
+            return parse_views(views[0].text_content())
+        return None
+
+    def artists(self, html: str) -> List[ArtistLink]:
+        document = self._document(html)
+        if document is None:
+            return []
+        return [
+            (link.text_content().strip(), slug)
+            for link in document.xpath("//a[@href]")
+            if (slug := artist_slug(link.get("href")))
+        ]
+
+    def artist_page(self, html: str) -> ArtistPageData:
+        document = self._document(html)
+        if document is None:
+            return None, []
+        songs = [
+            (
+                link.get("title", "").strip() or link.text_content().strip(),
+                song_slug(link.get("href")),
+                song_path(link.get("href")),
+            )
+            for link in document.xpath(self.SONG_LINKS)
+        ]
+        return self._views(document), songs
+
+    def song_page(self, html: str) -> Optional[SongPageData]:
+        document = self._document(html)
+        if document is None:
+            return None
+        content_divs = document.xpath(self.LYRICS)
+        if not content_divs:
+            return None
+
+        paragraphs = []
+        for p in content_divs[0].iter("p"):
+            lines = [text.strip() for text in p.itertext() if text.strip()]
+            paragraphs.append("\n".join(lines))
+        return self._views(document) or 0, "\n\n".join(paragraphs)
+
+
+EXTRACTORS: Dict[str, Type[Extractor]] = {
+    extractor.name: extractor
+    for extractor in (SoupExtractor, StrainedSoupExtractor, LxmlExtractor)
+}
+
+
+def get_extractor(name: str) -> Extractor:
+    """Build the extraction backend registered under name"""
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown parser '{name}', expected one of {', '.join(EXTRACTORS)}"
+        ) from None
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class FlightStats:
+    calls: int = 0
+    coalesced: int = 0
+    memo_hits: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    Share one call among concurrent callers asking for the same key
+
+    While a call is running, later callers for the same key wait for it
+    instead of starting their own. Successful results are also memoized for
+    a short while, bounded by entry count, so a page requested twice in
+    quick succession is only fetched once. Failures are never memoized.
+    """
+
+    def __init__(self, memo_size: int = 128, memo_ttl: float = 300):
+        """
+        Initialize the table
+
+        Args:
+            memo_size: Results kept after their call finished, 0 disables
+            memo_ttl: Seconds a finished result is reused
+        """
+        self._memo_size = memo_size
+        self._memo_ttl = memo_ttl
+        self._memo: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.stats = FlightStats()
+
+    def _remembered(self, key: Hashable):
+        if (memo := self._memo.get(key)) is None:
+            return None
+        stored_at, value = memo
+        if time.monotonic() - stored_at >= self._memo_ttl:
+            del self._memo[key]
+            return None
+        self._memo.move_to_end(key)
+        return memo
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Reading the exception also marks it retrieved when nobody waits
+        if task.cancelled() or task.exception() is not None:
+            return
+        if self._memo_size > 0:
+            self._memo[key] = (time.monotonic(), task.result())
+            self._memo.move_to_end(key)
+            while len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Return func's result for key, sharing running and recent calls"""
+        if (memo := self._remembered(key)) is not None:
+            self.stats.memo_hits += 1
+            return memo[1]
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.stats.coalesced += 1
+        else:
+            self.stats.calls += 1
+            task = asyncio.ensure_future(func())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t))
+
+        # A cancelled caller must not cancel the call for everyone else
+        return await asyncio.shield(task)
+
+    def clear(self):
+        """Forget memoized results"""
+        self._memo.clear()
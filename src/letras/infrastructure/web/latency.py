@@ -0,0 +1,114 @@
+import asyncio
+import math
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Recent latencies of one kind of request
+
+    Timeouts and hedging delays are derived from percentiles of a sliding
+    window, so they follow the site's actual behaviour instead of a single
+    fixed value for every page.
+    """
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        timeout_factor: float = 3,
+        min_timeout: float = 2,
+        max_timeout: float = 30,
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Number of recent samples kept
+            min_samples: Samples needed before percentiles are trusted
+            timeout_factor: Timeout as a multiple of the p99 latency
+            min_timeout: Lower bound for derived timeouts in seconds
+            max_timeout: Upper bound for derived timeouts, also used until
+                there are enough samples
+        """
+        self._samples: deque = deque(maxlen=window)
+        self._min_samples = min_samples
+        self._timeout_factor = timeout_factor
+        self._min_timeout = min_timeout
+        self._max_timeout = max_timeout
+        self.hedged = 0
+        self.hedges_won = 0
+
+    def record(self, seconds: float):
+        """Add the latency of a successful request"""
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th percentile (0-100), None until there are enough samples"""
+        if len(self._samples) < self._min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+    def timeout(self) -> float:
+        """Seconds a request of this kind may take before it is abandoned"""
+        if (p99 := self.percentile(99)) is None:
+            return self._max_timeout
+        return min(
+            self._max_timeout, max(self._min_timeout, p99 * self._timeout_factor)
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which a duplicate request is worth firing"""
+        return self.percentile(95)
+
+
+async def hedged(
+    func: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    tracker: Optional[LatencyTracker] = None,
+) -> T:
+    """
+    Await func, firing a second call if the first is still running after
+    delay seconds; the first call to succeed wins and the other is cancelled
+
+    Args:
+        func: Coroutine function making the request
+        delay: Seconds before hedging, None never hedges
+        tracker: Optional tracker counting fired and winning hedges
+
+    Returns:
+        T: Result of the first successful call. If every call failed, the
+            error of the first one is raised.
+    """
+    first = asyncio.ensure_future(func())
+    tasks = {first}
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.add(asyncio.ensure_future(func()))
+                if tracker is not None:
+                    tracker.hedged += 1
+
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is not first and tracker is not None:
+                        tracker.hedges_won += 1
+                    return task.result()
+        raise first.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
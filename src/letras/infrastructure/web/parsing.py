@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from letras.infrastructure.batching import MicroBatcher
+
+from .extractors import Extractor, get_extractor
+
+# Extractor method name and the page's HTML
+ParseJob = Tuple[str, str]
+
+# Per-process extractor, built once by the pool initializer
+_extractor: Optional[Extractor] = None
+
+
+def _init_worker(parser: str):
+    global _extractor
+    _extractor = get_extractor(parser)
+
+
+def _ping() -> bool:
+    return _extractor is not None
+
+
+def _parse_batch(jobs: List[ParseJob]) -> List[Tuple[bool, Any]]:
+    """Run a batch of extractions, returning (ok, result or error message)"""
+    results = []
+    for method, html in jobs:
+        try:
+            results.append((True, getattr(_extractor, method)(html)))
+        except Exception as e:
+            # Error messages always pickle, arbitrary exceptions may not
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+
+class ParseError(Exception):
+    """Extraction failed inside a parse worker"""
+
+    pass
+
+
+class ParsePool:
+    """
+    Run extractors in worker processes so parsing does not block the loop
+
+    Pages are batched before crossing the process boundary and workers only
+    send back the extractors' plain tuples, so the event loop does nothing
+    but I/O and a little pickling.
+    """
+
+    def __init__(
+        self,
+        parser: str = "soup",
+        workers: int = 2,
+        batch_size: int = 8,
+        max_delay: float = 0.005,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            parser: Extraction backend each worker builds
+            workers: Number of worker processes
+            batch_size: Pages sent to a worker in one call
+            max_delay: Seconds to wait for a batch to fill up
+        """
+        self._parser = parser
+        self._workers = max(1, workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._batcher = MicroBatcher(
+            self._run, max_size=batch_size, max_delay=max_delay
+        )
+
+    async def start(self):
+        """Start the workers and wait until all of them are ready"""
+        if self._executor is not None:
+            return
+        # Spawned workers do not inherit the event loop or open sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._parser,),
+        )
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._executor, _ping) for _ in range(self._workers))
+        )
+
+    async def _run(self, jobs: List[ParseJob]) -> List[Tuple[bool, Any]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _parse_batch, jobs)
+
+    async def parse(self, method: str, html: str) -> Any:
+        """Run one extractor method on a page in a worker"""
+        if self._executor is None:
+            await self.start()
+        ok, result = await self._batcher.submit((method, html))
+        if not ok:
+            raise ParseError(result)
+        return result
+
+    async def close(self):
+        """Finish pending work and stop the workers"""
+        await self._batcher.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
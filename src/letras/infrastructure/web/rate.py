@@ -0,0 +1,135 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+import aiohttp
+
+
+class RateController:
+    """
+    Token bucket combined with an AIMD concurrency window
+
+    The bucket caps requests per second and the window caps requests in
+    flight. Healthy responses grow both additively; throttling (429, 5xx,
+    timeouts) halves them, at most once per cool-down period so a burst of
+    failures from the same overload only counts once.
+    """
+
+    def __init__(
+        self,
+        max_window: int = 10,
+        rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        min_window: int = 1,
+        cooldown: float = 1.0,
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            max_window: Upper bound for concurrent requests
+            rate: Initial requests per second, None disables the token bucket
+            max_rate: Upper bound the rate may grow to, defaults to rate
+                times max_window
+            min_window: Lower bound for concurrent requests
+            cooldown: Minimum seconds between two multiplicative decreases
+        """
+        self.max_window = max(1, max_window)
+        self.min_window = max(1, min(min_window, self.max_window))
+        self.window = float(max(self.min_window, self.max_window // 2))
+
+        self.rate = rate
+        self.min_rate = rate / 8 if rate else None
+        self.max_rate = max_rate or (rate * self.max_window if rate else None)
+        self._tokens = float(self.max_window)
+        self._refilled_at = time.monotonic()
+
+        self._cooldown = cooldown
+        self._decreased_at = 0.0
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._latency: Optional[float] = None
+        self._baseline: Optional[float] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def latency(self) -> Optional[float]:
+        """Smoothed request latency in seconds"""
+        return self._latency
+
+    @staticmethod
+    def is_overload(error: BaseException) -> bool:
+        """Whether an error means the server wants us to slow down"""
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status == 429 or error.status >= 500
+        return False
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncGenerator[None, None]:
+        """Hold one request slot, feeding the outcome back into the controller"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.window))
+            self._in_flight += 1
+
+        try:
+            await self._take_token()
+            started = time.monotonic()
+            yield
+        except Exception as e:
+            if self.is_overload(e):
+                self.decrease()
+            raise
+        else:
+            self.increase(time.monotonic() - started)
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def _take_token(self):
+        """Wait for the token bucket, if enabled"""
+        while self.rate:
+            now = time.monotonic()
+            capacity = max(1.0, self.window)
+            self._tokens = min(
+                capacity, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def increase(self, latency: float):
+        """Additive increase after a healthy response"""
+        self._latency = (
+            latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        )
+        self._baseline = min(self._baseline or self._latency, self._latency)
+
+        # Latency climbing well above the best seen means queues are building
+        # up on the server side; hold steady instead of pushing harder.
+        if self._latency > 2 * self._baseline:
+            return
+
+        self.window = min(self.max_window, self.window + 1 / self.window)
+        if self.rate:
+            self.rate = min(self.max_rate, self.rate + 1 / self.window)
+
+    def decrease(self):
+        """Multiplicative decrease after the server pushed back"""
+        now = time.monotonic()
+        if now - self._decreased_at < self._cooldown:
+            return
+        self._decreased_at = now
+
+        self.window = max(self.min_window, self.window / 2)
+        if self.rate:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
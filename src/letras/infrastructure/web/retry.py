@@ -0,0 +1,183 @@
+import asyncio
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+import aiohttp
+
+T = TypeVar("T")
+
+# Set by work queues able to requeue an item; fetches made from such a queue
+# hand their retries back to it instead of sleeping in place.
+deferred_retries: ContextVar[bool] = ContextVar("deferred_retries", default=False)
+
+
+class RetryLater(Exception):
+    """A fetch failed but may succeed if tried again after delay seconds"""
+
+    def __init__(self, key: Hashable, delay: float, attempt: int):
+        super().__init__(f"Retry {key} in {delay:.1f}s (attempt {attempt})")
+        self.key = key
+        self.delay = delay
+        self.attempt = attempt
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether a failed request is worth repeating"""
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return isinstance(error, aiohttp.ClientError)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the server asked us to wait through Retry-After, if any"""
+    if not isinstance(error, aiohttp.ClientResponseError):
+        return None
+    if error.status not in (429, 503) or not error.headers:
+        return None
+    if (value := error.headers.get("Retry-After")) is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Pause all requests while the site is failing
+
+    Outcomes of recent requests are kept in a sliding window; once the share
+    of failures reaches the threshold, the breaker opens and every caller
+    waits for the pause to end. The window starts empty afterwards, so the
+    site gets a fresh chance.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        pause: float = 30,
+    ):
+        self._threshold = threshold
+        self._min_calls = min(min_calls, window)
+        self._pause = pause
+        self._outcomes: deque = deque(maxlen=window)
+        self._open_until = 0.0
+        self.trips = 0
+
+    @property
+    def is_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    async def wait(self):
+        """Wait while the breaker is open"""
+        while (remaining := self._open_until - time.monotonic()) > 0:
+            await asyncio.sleep(remaining)
+
+    def record(self, ok: bool):
+        """Record a request outcome, opening the breaker if too many failed"""
+        self._outcomes.append(ok)
+        if len(self._outcomes) < self._min_calls:
+            return
+        if self._outcomes.count(False) / len(self._outcomes) >= self._threshold:
+            self.trip()
+
+    def trip(self, pause: Optional[float] = None):
+        """Open the breaker for pause seconds, or the default pause"""
+        until = time.monotonic() + (self._pause if pause is None else pause)
+        if until > self._open_until:
+            self._open_until = until
+            self.trips += 1
+        self._outcomes.clear()
+
+
+class RetryScheduler:
+    """
+    Decide when failed fetches run again
+
+    A single attempt either succeeds, fails for good, or raises RetryLater
+    with a delay taken from Retry-After or a jittered exponential backoff.
+    Attempts are counted per key, across requeues.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1,
+        max_delay: float = 300,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_attempts: Attempts per key before the error is raised
+            base_delay: Backoff of the first retry in seconds, doubled after
+                each failure
+            max_delay: Upper bound for any wait, Retry-After included
+            breaker: Circuit breaker shared by all attempts
+        """
+        self._max_attempts = max(1, max_attempts)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self._attempts: Dict[Hashable, int] = {}
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff after the given failed attempt"""
+        ceiling = min(self._max_delay, self._base_delay * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def attempt(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Make one attempt, raising RetryLater if another one is due"""
+        await self.breaker.wait()
+        try:
+            result = await func()
+        except Exception as e:
+            retryable = is_retryable(e)
+            # Client errors such as 404 say nothing about the site's health
+            self.breaker.record(not retryable)
+
+            attempt = self._attempts.pop(key, 0) + 1
+            if not retryable or attempt >= self._max_attempts:
+                raise
+
+            self._attempts[key] = attempt
+            if (delay := retry_after(e)) is not None:
+                # Throttling applies to the whole site, not just this page
+                delay = min(delay, self._max_delay)
+                self.breaker.trip(delay)
+            else:
+                delay = self.backoff(attempt)
+            raise RetryLater(key, delay, attempt) from e
+
+        self.breaker.record(True)
+        self._attempts.pop(key, None)
+        return result
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Call func until it succeeds or fails for good
+
+        Inside a work queue that can requeue items the RetryLater is passed
+        on, everywhere else the wait happens here.
+        """
+        while True:
+            try:
+                return await func()
+            except RetryLater as e:
+                if deferred_retries.get():
+                    raise
+                await asyncio.sleep(e.delay)
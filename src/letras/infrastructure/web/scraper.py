@@ -1,125 +1,537 @@
 import asyncio
+import codecs
 import logging
+import time
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import AsyncGenerator, Dict, Iterable, List, Optional, Tuple
 
 import aiohttp
 from aiohttp import ClientTimeout
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.song import Song
 
+from .archive import WarcArchive, WarcWriter
+from .cache import CacheStats, HttpCache
+from .egress import EgressPool
+from .extractors import get_extractor
+from .flight import FlightStats, SingleFlight
+from .latency import LatencyTracker, hedged
+from .parsing import ParsePool
+from .rate import RateController
+from .retry import CircuitBreaker, RetryLater, RetryScheduler
+from .streaming import ArtistLinkParser, ElementWatcher
+from .tracing import HttpTracer, RequestTiming
+
+DEFAULT_STYLE = "gospelreligioso"
+
+
+def style_index(style: str) -> str:
+    """Path of the page listing every artist of a style"""
+    return f"/estilos/{style}/todosartistas.html"
+
+
+ARTISTS_INDEX = style_index(DEFAULT_STYLE)
+# Song pages are only read until the views counter and the lyrics are complete
+SONG_PAGE_CLASSES = ("head-info-exib", "lyric-original")
+CHUNK_SIZE = 16 * 1024
+
 
 @dataclass
 class ScrapeResult:
     content: str
     views: int
+    # Path the page was finally served from, after redirects
+    path: Optional[str] = None
+
+
+@dataclass
+class ArtistPage:
+    views: Optional[int]
+    songs: List[Song]
 
 
 class WebScraper:
-    def __init__(self, base_url: str, max_workers: int = 10):
+    def __init__(
+        self,
+        base_url: str,
+        max_workers: int = 10,
+        delay: float = 0,
+        timeout: float = 30,
+        parser: str = "soup",
+        styles: Optional[List[str]] = None,
+        streaming: bool = False,
+        parse_workers: int = 0,
+        memo_size: int = 128,
+        max_attempts: int = 3,
+        breaker_pause: float = 30,
+        hedge: bool = False,
+        archive_path: Optional[str] = None,
+        replay: Optional[List[str]] = None,
+        egress: Optional[List[str]] = None,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 24 * 60 * 60,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+    ):
         self._base_url = base_url
         self._logger = logging.getLogger(__name__)
-        self._rate_limiter = asyncio.Semaphore(max_workers)
+        self._rate_limiter = RateController(
+            max_window=max_workers, rate=1 / delay if delay else None
+        )
+        self._timeout = timeout
+        self._hedge = hedge
+        self._tracer = HttpTracer()
+        # The routes share the site-wide budget above, they do not add to it
+        self._egress = (
+            EgressPool(
+                egress, max_workers=max_workers, rate=1 / delay if delay else None
+            )
+            if egress
+            else None
+        )
+        self._latency = {
+            kind: LatencyTracker(max_timeout=timeout)
+            for kind in ("index", "artist", "song")
+        }
+        self._extractor = get_extractor(parser)
+        self._styles = list(dict.fromkeys(styles or [DEFAULT_STYLE]))
+        self._streaming = streaming
+        self._parse_pool = (
+            ParsePool(parser, workers=parse_workers) if parse_workers > 0 else None
+        )
         self._session = None
+        self._flight: SingleFlight[str] = SingleFlight(memo_size=memo_size)
+        # Requested path -> path it redirected to, for pages fetched this run
+        self.redirects: Dict[str, str] = {}
+        # Song path -> why its lyrics could not be read
+        self._failures: Dict[str, str] = {}
+        # Record fetched pages, or serve every page from earlier recordings
+        self._archive = WarcWriter(archive_path) if archive_path else None
+        self._replay = WarcArchive(replay) if replay else None
+        self._retries = RetryScheduler(
+            max_attempts=max_attempts, breaker=CircuitBreaker(pause=breaker_pause)
+        )
+        self._cache = (
+            HttpCache(cache_dir, ttl=cache_ttl, max_bytes=cache_max_bytes)
+            if cache_dir
+            else None
+        )
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Hit/miss counters of the HTTP cache, if enabled"""
+        return self._cache.stats if self._cache is not None else None
+
+    @property
+    def flight_stats(self) -> FlightStats:
+        """How many fetches were shared between callers"""
+        return self._flight.stats
 
     async def initialize(self):
         """Initialize HTTP session"""
+        session_options = {
+            "timeout": ClientTimeout(total=self._timeout),
+            "headers": {"User-Agent": "Mozilla/5.0 (compatible; Letras/1.0)"},
+            "trace_configs": [self._tracer.trace_config],
+        }
         if not self._session:
             self._session = aiohttp.ClientSession(
-                timeout=ClientTimeout(total=30),
-                connector=aiohttp.TCPConnector(limit=100, enable_cleanup_closed=True),
-                headers={"User-Agent": "Mozilla/5.0 (compatible; Letras/1.0)"},
+                connector=aiohttp.TCPConnector(
+                    limit=self._rate_limiter.max_window,
+                    limit_per_host=self._rate_limiter.max_window,
+                    enable_cleanup_closed=True,
+                ),
+                **session_options,
             )
+        if self._egress is not None:
+            await self._egress.initialize(**session_options)
+        if self._parse_pool is not None:
+            await self._parse_pool.start()
+
+    async def _parse(self, method: str, html: str):
+        """Run an extractor method, in the parse pool when enabled"""
+        if self._parse_pool is not None:
+            return await self._parse_pool.parse(method, html)
+        return getattr(self._extractor, method)(html)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=4, max=10))
     async def _get(self, url: str) -> str:
-        """Make GET request with retry"""
+        """
+        Make GET request with retry, sharing it with concurrent callers for
+        the URL
+        """
+        return await self._retries.call(
+            lambda: self._flight.do(
+                url, lambda: self._retries.attempt(url, lambda: self._fetch(url))
+            )
+        )
+
+    def _record(self, url: str, body: str, truncated: bool = False):
+        """Add a fetched page to the archive under the path it was served from"""
+        if self._archive is not None:
+            self._archive.write(
+                f"{self._base_url}{self.redirects.get(url, url)}",
+                body,
+                truncated=truncated,
+                requested=f"{self._base_url}{url}",
+            )
+
+    def _replayed(self, url: str) -> str:
+        """Page recorded for a path, noting where it redirected to"""
+        body = self._replay.get(f"{self._base_url}{url}")
+        if target := self._replay.redirects.get(f"{self._base_url}{url}"):
+            self.redirects[url] = target.removeprefix(self._base_url)
+        return body
+
+    async def _fetch(self, url: str) -> str:
+        """Make GET request, or replay it from the archive"""
+        if self._replay is not None:
+            return self._replayed(url)
+
+        body = await self._download(url)
+        self._record(url, body)
+        return body
+
+    async def _download(self, url: str) -> str:
+        """Get a page from the cache or the site"""
         if not self._session:
             await self.initialize()
 
-        async with self._rate_limiter:
-            async with self._session.get(f"{self._base_url}{url}") as response:
+        entry = self._cache.lookup(url) if self._cache is not None else None
+        if entry and self._cache.is_fresh(entry):
+            if (body := self._cache.hit(entry)) is not None:
+                return body
+            entry = None
+
+        headers = self._cache.conditional_headers(entry) if entry else {}
+        tracker = self._latency[self._kind(url)]
+
+        def send(headers: Dict[str, str]):
+            return hedged(
+                lambda: self._request(url, headers, tracker),
+                tracker.hedge_delay() if self._hedge else None,
+                tracker,
+            )
+
+        status, text, validators = await send(headers)
+        if entry and status == 304:
+            if (body := self._cache.hit(entry, revalidated=True)) is not None:
+                return body
+            # Cached body is gone, fetch it again unconditionally
+            status, text, validators = await send({})
+
+        if self._cache is not None:
+            self._cache.store(url, text, **validators)
+        return text
+
+    async def _request(
+        self, url: str, headers: Dict[str, str], tracker: LatencyTracker
+    ) -> Tuple[int, str, Dict[str, Optional[str]]]:
+        """
+        Make one GET request, timed out from the latency of similar pages
+
+        Returns:
+            Tuple[int, str, Dict]: Status, body and the validators to cache
+                it with
+        """
+        timing = RequestTiming(self._kind(url))
+        async with self._rate_limiter.slot(), self._route() as (session, options):
+            started = time.monotonic()
+            async with session.get(
+                f"{self._base_url}{url}",
+                headers=headers,
+                timeout=ClientTimeout(total=tracker.timeout()),
+                trace_request_ctx=timing,
+                **options,
+            ) as response:
+                # Only conditional requests can be answered with 304
+                if headers and response.status == 304:
+                    return 304, "", {}
+
                 response.raise_for_status()
-                return await response.text(encoding="utf-8", errors="ignore")
+                if response.history:
+                    self.redirects[url] = response.url.path
+                text = await response.text(encoding="utf-8", errors="ignore")
+                tracker.record(time.monotonic() - started)
+                self._tracer.record(timing)
 
-    async def get_all_artists(self) -> List[Artist]:
-        """Get all gospel artists"""
-        html = await self._get("/estilos/gospelreligioso/todosartistas.html")
-        soup = BeautifulSoup(html, "html.parser")
+                validators = {}
+                if self._cache is not None:
+                    validators = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                    }
+                return 200, text, validators
 
+    @asynccontextmanager
+    async def _route(
+        self,
+    ) -> AsyncGenerator[Tuple[aiohttp.ClientSession, Dict[str, str]], None]:
+        """Session to send a request through and its extra request options"""
+        if self._egress is None:
+            yield self._session, {}
+            return
+        async with self._egress.slot() as route:
+            yield route.session, route.options
+
+    @staticmethod
+    def _kind(url: str) -> str:
+        """Latency class of a page: a style index, an artist or a song"""
+        if url.endswith("/todosartistas.html"):
+            return "index"
+        return "song" if url.strip("/").count("/") else "artist"
+
+    async def _stream(self, url: str) -> AsyncGenerator[str, None]:
+        """Make GET request yielding the decoded body chunk by chunk"""
+        if self._replay is not None:
+            yield self._replayed(url)
+            return
+
+        if not self._session:
+            await self.initialize()
+
+        timing = RequestTiming(self._kind(url))
+        async with self._rate_limiter.slot(), self._route() as (session, options):
+            async with session.get(
+                f"{self._base_url}{url}", trace_request_ctx=timing, **options
+            ) as response:
+                response.raise_for_status()
+                if response.history:
+                    self.redirects[url] = response.url.path
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    yield decoder.decode(chunk)
+                yield decoder.decode(b"", final=True)
+                # Pages left early are not timed, their body phase is partial
+                self._tracer.record(timing)
+
+    async def _get_until(self, url: str, classes: Iterable[str]) -> str:
+        """
+        Make GET request reading only until every element with one of the
+        given classes has been closed, shared like _get
+        """
+        key = (url, tuple(classes))
+        return await self._retries.call(
+            lambda: self._flight.do(
+                key,
+                lambda: self._retries.attempt(
+                    key, lambda: self._fetch_until(url, classes)
+                ),
+            )
+        )
+
+    async def _fetch_until(self, url: str, classes: Iterable[str]) -> str:
+        """Make partial GET request"""
+        if self._replay is not None:
+            return self._replayed(url)
+
+        if self._cache is not None:
+            entry = self._cache.lookup(url)
+            if entry and self._cache.is_fresh(entry):
+                if (body := self._cache.hit(entry)) is not None:
+                    self._record(url, body)
+                    return body
+
+        watcher = ElementWatcher(classes)
+        parts = []
+        stream = self._stream(url)
+        try:
+            async for text in stream:
+                parts.append(text)
+                watcher.feed(text)
+                if watcher.done:
+                    break
+        finally:
+            # Leaving early drops the rest of the body with the connection
+            await stream.aclose()
+
+        body = "".join(parts)
+        self._record(url, body, truncated=watcher.done)
+        return body
+
+    async def iter_all_artists(
+        self, style: str = DEFAULT_STYLE
+    ) -> AsyncGenerator[Artist, None]:
+        """Yield the artists of a style while its index is still downloading"""
+        index = style_index(style)
+        parser = ArtistLinkParser()
+        # The body is only kept whole when it has to be archived
+        recording = self._archive is not None and self._replay is None
+        parts = []
+        async for text in self._stream(index):
+            if recording:
+                parts.append(text)
+            parser.feed(text)
+            for name, slug in parser.pop():
+                yield Artist(name=name, slug=slug, styles=[style])
+        parser.close()
+        for name, slug in parser.pop():
+            yield Artist(name=name, slug=slug, styles=[style])
+        if recording:
+            self._record(index, "".join(parts))
+
+    async def _collect_artists(self, style: str) -> List[Artist]:
+        """Stream the whole index of a style with retry"""
+
+        async def collect():
+            return [artist async for artist in self.iter_all_artists(style)]
+
+        return await self._retries.call(
+            lambda: self._retries.attempt(style_index(style), collect)
+        )
+
+    async def _style_artists(self, style: str) -> List[Artist]:
+        """Get the artists listed on a style index"""
+        if self._streaming:
+            return await self._collect_artists(style)
+
+        html = await self._get(style_index(style))
         return [
-            Artist(name=link.text.strip(), slug=link["href"].strip("/"))
-            for link in soup.find_all("a", href=True)
-            if link["href"].strip("/") and "/" not in link["href"].strip("/")
+            Artist(name=name, slug=slug, styles=[style])
+            for name, slug in await self._parse("artists", html)
         ]
 
-    async def get_artist_details(self, artist: Artist) -> Optional[ScrapeResult]:
-        """Get artist views"""
+    async def get_all_artists(self) -> List[Artist]:
+        """
+        Get the artists of every configured style
+
+        Style indexes are fetched concurrently and merged by slug before any
+        artist page is requested, so an artist listed under several styles
+        is returned once, carrying all of them. A style whose index cannot
+        be read is logged and left out; only when every style fails is the
+        error raised.
+        """
+        listings = await asyncio.gather(
+            *(self._style_artists(style) for style in self._styles),
+            return_exceptions=True,
+        )
+        for listing in listings:
+            if isinstance(listing, RetryLater):
+                raise listing
+
+        failed = [
+            (style, listing)
+            for style, listing in zip(self._styles, listings)
+            if isinstance(listing, BaseException)
+        ]
+        for style, error in failed:
+            self._logger.error(f"Error getting artists of style {style}: {error}")
+        if failed and len(failed) == len(listings):
+            raise failed[0][1]
+
+        artists: Dict[str, Artist] = {}
+        for style, listing in zip(self._styles, listings):
+            if isinstance(listing, BaseException):
+                continue
+            for artist in listing:
+                if (known := artists.get(artist.slug)) is None:
+                    artists[artist.slug] = artist
+                elif style not in known.styles:
+                    known.styles.append(style)
+        return list(artists.values())
+
+    async def get_artist_page(self, artist: Artist) -> Optional[ArtistPage]:
+        """Get artist views and songs from a single request"""
         try:
             html = await self._get(artist.url)
-            soup = BeautifulSoup(html, "html.parser")
-            views_div = soup.find("div", class_="head-info-exib")
-            if views_div and (views_text := views_div.find("b")):
-                return ScrapeResult(
-                    content="", views=int(views_text.text.replace(".", ""))
-                )
-            return None
+            views, links = await self._parse("artist_page", html)
+            songs = [
+                Song(name=name, slug=slug, artist_id=artist.id, path=path)
+                for name, slug, path in links
+            ]
+            return ArtistPage(views=views, songs=songs)
+        except RetryLater:
+            raise
         except Exception as e:
-            self._logger.error(f"Error getting artist details: {e}")
+            self._logger.error(f"Error getting artist page: {e}")
             return None
 
+    async def get_artist_details(self, artist: Artist) -> Optional[ScrapeResult]:
+        """Get artist views"""
+        page = await self.get_artist_page(artist)
+        if page and page.views is not None:
+            return ScrapeResult(content="", views=page.views)
+        return None
+
     async def get_artist_songs(self, artist: Artist) -> List[Song]:
         """Get artist songs"""
-        try:
-            html = await self._get(artist.url)
-            soup = BeautifulSoup(html, "html.parser")
-            songs = []
-
-            for song_div in soup.find_all("li", class_="songList-table-row"):
-                if link := song_div.find("a", class_="songList-table-songName"):
-                    songs.append(
-                        Song(
-                            name=link.get("title", "").strip() or link.text.strip(),
-                            slug=link["href"].strip("/").split("/")[-1],
-                            artist_id=artist.id,
-                        )
-                    )
-            return songs
-        except Exception as e:
-            self._logger.error(f"Error getting songs: {e}")
-            return []
+        page = await self.get_artist_page(artist)
+        return page.songs if page else []
 
     async def get_song_details(
         self, artist: Artist, song: Song
     ) -> Optional[ScrapeResult]:
-        """Get song details"""
+        """Get song details, see failure_reason when there are none"""
+        url = self._song_url(artist, song)
         try:
-            html = await self._get(f"{artist.url}{song.url}")
-            soup = BeautifulSoup(html, "html.parser")
-
-            views = 0
-            if views_div := soup.find("div", class_="head-info-exib"):
-                if views_text := views_div.find("b"):
-                    views = int(views_text.text.replace(".", ""))
-
-            if content_div := soup.find("div", class_="lyric-original"):
-                paragraphs = []
-                for p in content_div.find_all("p"):
-                    lines = [element for element in p.stripped_strings]
-                    paragraphs.append("\n".join(lines))
-                content = "\n\n".join(paragraphs)
-                return ScrapeResult(content=content, views=views)
-
+            if self._streaming:
+                html = await self._get_until(url, SONG_PAGE_CLASSES)
+            else:
+                html = await self._get(url)
+            if details := await self._parse("song_page", html):
+                views, content = details
+                return ScrapeResult(
+                    content=content, views=views, path=self.redirects.get(url, url)
+                )
+            self._failures[url] = "no_lyrics"
             return None
+        except RetryLater:
+            raise
         except Exception as e:
             self._logger.error(f"Error getting song details: {e}")
+            gone = isinstance(e, aiohttp.ClientResponseError) and e.status in (404, 410)
+            self._failures[url] = "not_found" if gone else "error"
             return None
 
+    @staticmethod
+    def _song_url(artist: Artist, song: Song) -> str:
+        return song.path or f"{artist.url}{song.url}"
+
+    def failure_reason(self, artist: Artist, song: Song) -> Optional[str]:
+        """
+        Why get_song_details last returned None for a song: 'no_lyrics',
+        'not_found' or 'error'. The reason is forgotten once read.
+        """
+        return self._failures.pop(self._song_url(artist, song), None)
+
     async def close(self):
         """Close HTTP session"""
+        if self._cache is not None:
+            stats = self._cache.stats
+            self._logger.info(
+                f"HTTP cache: {stats.hits} hits ({stats.revalidated} revalidated), "
+                f"{stats.misses} misses, {stats.bytes_saved} bytes saved"
+            )
+        flight = self._flight.stats
+        self._logger.info(
+            f"Fetches: {flight.calls} made, {flight.coalesced} shared in flight, "
+            f"{flight.memo_hits} reused"
+        )
+        self._flight.clear()
+        for kind, tracker in self._latency.items():
+            if (p95 := tracker.percentile(95)) is not None:
+                self._logger.info(
+                    f"{kind.capitalize()} pages: p95 {p95:.2f}s over {len(tracker)} "
+                    f"requests, {tracker.hedged} hedged ({tracker.hedges_won} won)"
+                )
+        if self._archive is not None:
+            self._archive.close()
+            self._logger.info(
+                f"Archived {self._archive.records} pages to {self._archive.path}"
+            )
+        if trips := self._retries.breaker.trips:
+            self._logger.warning(f"Fetching was paused {trips} times by errors")
+        if self._parse_pool is not None:
+            await self._parse_pool.close()
+        for line in self._tracer.summary():
+            self._logger.info(line)
+        if self._egress is not None:
+            for route in self._egress.routes:
+                self._logger.info(
+                    f"Egress {route.spec}: {route.requests} requests, "
+                    f"{route.strikes} recent throttling strikes"
+                )
+            await self._egress.close()
         if self._session:
             await self._session.close()
             self._session = None
@@ -0,0 +1,70 @@
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Set
+
+from .extractors import ArtistLink, artist_slug
+
+
+class ArtistLinkParser(HTMLParser):
+    """Incremental parser emitting artist links as soon as each one closes"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._href: Optional[str] = None
+        self._text: List[str] = []
+        self._links: List[ArtistLink] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            if slug := artist_slug(self._href):
+                self._links.append(("".join(self._text).strip(), slug))
+            self._href = None
+
+    def pop(self) -> List[ArtistLink]:
+        """Links completed since the last call"""
+        links, self._links = self._links, []
+        return links
+
+
+class ElementWatcher(HTMLParser):
+    """
+    Incremental parser telling when elements with given classes have closed
+
+    Used to stop downloading a page once everything the extractor needs has
+    been received; the rest of the document is never read.
+    """
+
+    def __init__(self, classes: Iterable[str]):
+        super().__init__(convert_charrefs=False)
+        self._pending: Set[str] = set(classes)
+        self._open: List[list] = []  # [tag, depth, classes]
+
+    @property
+    def done(self) -> bool:
+        return not self._pending
+
+    def handle_starttag(self, tag, attrs):
+        for element in self._open:
+            if element[0] == tag:
+                element[1] += 1
+
+        classes = set((dict(attrs).get("class") or "").split())
+        if matched := classes & self._pending:
+            self._open.append([tag, 1, matched])
+
+    def handle_endtag(self, tag):
+        for element in list(self._open):
+            if element[0] != tag:
+                continue
+            element[1] -= 1
+            if element[1] == 0:
+                self._open.remove(element)
+                self._pending -= element[2]
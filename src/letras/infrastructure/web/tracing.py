@@ -0,0 +1,168 @@
+import bisect
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import aiohttp
+
+PHASES = ("wait", "dns", "connect", "ttfb", "body", "total")
+
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+@dataclass
+class RequestTiming:
+    """Timestamps of one request, filled in by the trace callbacks"""
+
+    kind: str
+    started: Optional[float] = None
+    dns_started: Optional[float] = None
+    dns: float = 0.0
+    connect_started: Optional[float] = None
+    connect: float = 0.0
+    sent: Optional[float] = None
+    headers: Optional[float] = None
+    finished: Optional[float] = None
+    reused: bool = False
+    bytes: int = 0
+
+    def phases(self) -> Dict[str, float]:
+        """
+        Seconds spent in each phase
+
+        wait is time in the connection pool, connect covers TCP and TLS,
+        ttfb runs from the request being sent to the response headers and
+        body from there to the last byte read.
+        """
+        if self.started is None or self.sent is None or self.headers is None:
+            return {}
+        finished = self.finished or self.headers
+        return {
+            "wait": max(0.0, self.sent - self.started - self.dns - self.connect),
+            "dns": self.dns,
+            "connect": self.connect,
+            "ttfb": self.headers - self.sent,
+            "body": finished - self.headers,
+            "total": finished - self.started,
+        }
+
+
+class Histogram:
+    """Fixed log-scale buckets of durations"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound in seconds of the bucket holding the q-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS_MS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound / 1000
+        return float("inf")
+
+
+class HttpTracer:
+    """Collect per-phase request timings by page kind"""
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[str, Histogram]] = defaultdict(
+            lambda: {phase: Histogram() for phase in PHASES}
+        )
+        self.requests = 0
+        self.reused = 0
+        self.bytes = 0
+        self.trace_config = self._build_config()
+
+    @staticmethod
+    def _timing(context) -> Optional[RequestTiming]:
+        timing = context.trace_request_ctx
+        return timing if isinstance(timing, RequestTiming) else None
+
+    def _build_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig()
+
+        def on(signal, callback):
+            async def handler(session, context, params):
+                if (timing := self._timing(context)) is not None:
+                    callback(timing, params)
+
+            signal.append(handler)
+
+        def stamp(field):
+            return lambda timing, params: setattr(timing, field, time.monotonic())
+
+        def reused(timing, params):
+            timing.reused = True
+
+        def dns_end(timing, params):
+            if timing.dns_started is not None:
+                timing.dns += time.monotonic() - timing.dns_started
+
+        def connect_end(timing, params):
+            if timing.connect_started is not None:
+                # DNS resolution happens while the connection is created
+                timing.connect += time.monotonic() - timing.connect_started - timing.dns
+
+        def chunk(timing, params):
+            timing.bytes += len(params.chunk)
+
+        on(config.on_request_start, stamp("started"))
+        on(config.on_dns_resolvehost_start, stamp("dns_started"))
+        on(config.on_dns_resolvehost_end, dns_end)
+        on(config.on_connection_create_start, stamp("connect_started"))
+        on(config.on_connection_create_end, connect_end)
+        on(config.on_connection_reuseconn, reused)
+        on(config.on_request_headers_sent, stamp("sent"))
+        on(config.on_request_end, stamp("headers"))
+        on(config.on_response_chunk_received, chunk)
+        return config
+
+    def record(self, timing: RequestTiming):
+        """Add a request whose body has been read completely"""
+        if timing.finished is None:
+            timing.finished = time.monotonic()
+        if not (phases := timing.phases()):
+            return
+
+        self.requests += 1
+        self.reused += timing.reused
+        self.bytes += timing.bytes
+        for phase, seconds in phases.items():
+            self.histograms[timing.kind][phase].add(seconds)
+
+    def summary(self) -> List[str]:
+        """Human readable report, one line per page kind"""
+        if not self.requests:
+            return []
+
+        lines = [
+            f"HTTP: {self.requests} requests, "
+            f"{self.reused / self.requests:.0%} on reused connections, "
+            f"{self.bytes / 1024 / 1024:.1f} MiB received"
+        ]
+        for kind, histograms in sorted(self.histograms.items()):
+            phases = ", ".join(
+                f"{phase} {histograms[phase].mean * 1000:.0f}ms"
+                f" (p95 <{histograms[phase].percentile(95) * 1000:.0f}ms)"
+                for phase in PHASES
+            )
+            lines.append(f"{kind} ({histograms['total'].count}): {phases}")
+        return lines
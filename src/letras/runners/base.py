@@ -4,7 +4,8 @@ import string
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from datetime import datetime
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskID, TextColumn
@@ -12,6 +13,7 @@ from rich.progress import BarColumn, Progress, SpinnerColumn, TaskID, TextColumn
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
 from letras.domain.entities.song import Song
+from letras.domain.services.content_filter import ContentFilter
 from letras.domain.services.lyrics_service import LyricsService
 from letras.infrastructure.database.connection import PostgresConnection
 from letras.infrastructure.database.repositories.postgres_repository import (
@@ -20,13 +22,32 @@ from letras.infrastructure.database.repositories.postgres_repository import (
 from letras.infrastructure.database.utils import PostgresUtils
 from letras.infrastructure.web.scraper import WebScraper
 
+from .executor import StageExecutor, StageResult
+from .pipeline import Pipeline, Stage
+
 
 class BaseRunner(ABC):
-    def __init__(self, db_config: dict, base_url: str, verbose: bool = True):
+    def __init__(
+        self,
+        db_config: dict,
+        base_url: str,
+        verbose: bool = True,
+        max_workers: int = 10,
+        pipeline: bool = False,
+        scraper_config: Optional[dict] = None,
+        language_config: Optional[dict] = None,
+        content_filter: Optional[ContentFilter] = None,
+    ):
         self.verbose = verbose
         self.console = Console()
         self.db_config = db_config
         self.base_url = base_url
+        self.max_workers = max_workers
+        self.pipeline = pipeline
+        self.scraper_config = scraper_config or {}
+        self.language_config = language_config or {}
+        self.content_filter = content_filter
+        self.executor = StageExecutor(max_workers)
 
         # Services will be initialized later
         self.db = None
@@ -40,6 +61,16 @@ class BaseRunner(ABC):
         """Process artists based on runner strategy"""
         pass
 
+    @abstractmethod
+    async def discover_artists(self) -> List[Artist]:
+        """Artists the pipeline should visit"""
+        pass
+
+    @abstractmethod
+    async def refresh_artist(self, artist: Artist) -> Optional[Artist]:
+        """Store or update one artist for the pipeline"""
+        pass
+
     @abstractmethod
     async def initialize(self):
         """Initialize resources for the runner"""
@@ -52,6 +83,8 @@ class BaseRunner(ABC):
 
     async def close(self):
         """Close resources"""
+        if isinstance(self.service, LyricsService):
+            await self.service.close()
         if self.db:
             await self.db.close()
         if self.scraper:
@@ -62,20 +95,22 @@ class BaseRunner(ABC):
         groups = defaultdict(list)
 
         for artist in artists:
-            # Get first character of artist name
-            first_char = artist.name[0].upper()
+            groups[self.group_key(artist.name)].append(artist)
 
-            # Group into: numbers, letters, or 'other'
-            if first_char.isdigit():
-                group_key = "#"
-            elif first_char in string.ascii_uppercase:
-                group_key = first_char
-            else:
-                group_key = "Other"
+        return dict(sorted(groups.items()))
 
-            groups[group_key].append(artist)
+    @staticmethod
+    def group_key(name: str) -> str:
+        """Group key for a name: '#' for numbers, the letter, or 'Other'"""
+        # Get first character of the name
+        first_char = name[0].upper()
 
-        return dict(sorted(groups.items()))
+        # Group into: numbers, letters, or 'other'
+        if first_char.isdigit():
+            return "#"
+        elif first_char in string.ascii_uppercase:
+            return first_char
+        return "Other"
 
     @abstractmethod
     async def process_artists(self) -> List[Artist]:
@@ -84,8 +119,6 @@ class BaseRunner(ABC):
 
     async def process_songs(self, artists: List[Artist]) -> List[Song]:
         """Process songs with clean progress display"""
-        new_songs = []
-
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -99,31 +132,24 @@ class BaseRunner(ABC):
                 "[yellow]Processing songs...", total=len(grouped_artists)
             )
 
-            for group_key, group_artists in grouped_artists.items():
-                group_task = progress.add_task(
-                    f"[cyan]Songs from group {group_key}", total=len(group_artists)
-                )
-
-                songs_in_group = 0
-                for artist in group_artists:
-                    try:
-                        songs = await self.service.process_songs(artist)
-                        songs_in_group += len(songs)
-                        new_songs.extend(songs)
-                    except Exception as e:
-                        if self.verbose:
-                            progress.print(f"[red]Error in group {group_key}[/red]")
-                    finally:
-                        progress.advance(group_task)
-
+            def group_done(group_key: str, results: List[StageResult]):
+                songs_in_group = sum(len(r.value) for r in results if r.ok)
                 progress.print(f"Group {group_key}: {songs_in_group} new songs found")
                 progress.advance(main_task)
 
-        return new_songs
+            results = await self.run_groups(
+                progress,
+                grouped_artists,
+                self.service.process_songs,
+                describe=lambda key: f"[cyan]Songs from group {key}",
+                error_message="[red]Error in group {}[/red]",
+                on_group_done=group_done,
+            )
+
+        return [song for r in results if r.ok for song in r.value]
 
     async def process_lyrics(self, artists: List[Artist], songs: List[Song]) -> List[Lyrics]:
         """Process lyrics with clean progress display"""
-        lyrics_list = []
         artist_map = {artist.id: artist for artist in artists}
 
         with Progress(
@@ -143,40 +169,151 @@ class BaseRunner(ABC):
             grouped_songs = defaultdict(list)
             for song in songs:
                 artist = artist_map[song.artist_id]
-                first_char = artist.name[0].upper()
-                if first_char.isdigit():
-                    group_key = '#'
-                elif first_char in string.ascii_uppercase:
-                    group_key = first_char
-                else:
-                    group_key = 'Other'
-                grouped_songs[group_key].append(song)
-
-            # Process each group
-            for group_key, group_songs in grouped_songs.items():
-                group_task = progress.add_task(
-                    f"[cyan]Group {group_key}",
-                    total=len(group_songs)
-                )
-                
-                lyrics_in_group = 0
-                for song in group_songs:
-                    try:
-                        artist = artist_map[song.artist_id]
-                        lyrics = await self.service.process_lyrics(artist, song)
-                        if lyrics:
-                            lyrics_list.append(lyrics)
-                            lyrics_in_group += 1
-                    except Exception as e:
-                        if self.verbose:
-                            progress.print(f"[red]Error processing lyrics in group {group_key}[/red]")
-                    finally:
-                        progress.advance(group_task)
-                        progress.advance(main_task)
-                        
+                grouped_songs[self.group_key(artist.name)].append(song)
+
+            def group_done(group_key: str, results: List[StageResult]):
+                lyrics_in_group = sum(1 for r in results if r.ok and r.value)
                 progress.print(f"Group {group_key}: {lyrics_in_group} lyrics processed")
 
-        return lyrics_list
+            results = await self.run_groups(
+                progress,
+                grouped_songs,
+                lambda song: self.service.process_lyrics(
+                    artist_map[song.artist_id], song
+                ),
+                describe=lambda key: f"[cyan]Group {key}",
+                error_message="[red]Error processing lyrics in group {}[/red]",
+                on_group_done=group_done,
+                on_item_done=lambda result: progress.advance(main_task),
+            )
+
+        return [r.value for r in results if r.ok and r.value]
+
+    async def run_groups(
+        self,
+        progress: Progress,
+        groups: Dict[str, list],
+        func: Callable[[Any], Awaitable[Any]],
+        describe: Callable[[str], str],
+        error_message: str,
+        on_group_done: Callable[[str, List[StageResult]], None],
+        on_item_done: Optional[Callable[[StageResult], None]] = None,
+    ) -> List[StageResult]:
+        """
+        Run func over every item of every group through the stage executor
+
+        Items from all groups share the same worker pool, so a slow group does
+        not hold back the next one. Each group keeps its own progress bar and
+        on_group_done is called once its last item has finished.
+
+        Returns:
+            List[StageResult]: Results in group order
+        """
+        group_of = {}
+        group_tasks = {}
+        remaining = {}
+        finished = defaultdict(list)
+        items = []
+
+        for group_key, group_items in groups.items():
+            group_tasks[group_key] = progress.add_task(
+                describe(group_key), total=len(group_items)
+            )
+            remaining[group_key] = len(group_items)
+            for item in group_items:
+                group_of[id(item)] = group_key
+                items.append(item)
+
+        def item_done(result: StageResult):
+            group_key = group_of[id(result.item)]
+            if not result.ok and self.verbose:
+                progress.print(error_message.format(group_key))
+            progress.advance(group_tasks[group_key])
+            if on_item_done:
+                on_item_done(result)
+
+            finished[group_key].append(result)
+            remaining[group_key] -= 1
+            if remaining[group_key] == 0:
+                on_group_done(group_key, finished.pop(group_key))
+
+        return await self.executor.map(items, func, on_done=item_done)
+
+    async def run_pipeline(self, output_dir: str):
+        """
+        Stream artists, songs and lyrics through concurrent stages
+
+        Song lists are fetched as soon as the first artist is stored, lyrics
+        overlap song discovery and each lyric is written to the release
+        directory as it arrives, so only the stats are kept in memory.
+        """
+        temp_dir = f"{output_dir}/temp"
+        Path(temp_dir).mkdir(parents=True, exist_ok=True)
+        artists = await self.discover_artists()
+        stats = {}
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TextColumn("[progress.completed]{task.completed}/{task.total}"),
+            console=self.console,
+        ) as progress:
+            artist_task = progress.add_task("[yellow]Artists", total=len(artists))
+            song_task = progress.add_task("[yellow]Song lists", total=0)
+            lyrics_task = progress.add_task("[yellow]Lyrics", total=0)
+
+            def grow(task: TaskID, amount: int):
+                progress.update(task, total=progress.tasks[task].total + amount)
+
+            def report(task: TaskID, label: str) -> Callable[[StageResult], None]:
+                def on_done(result: StageResult):
+                    if not result.ok and self.verbose:
+                        progress.print(f"[red]Error[/red] {label}: {result.error}")
+                    progress.advance(task)
+
+                return on_done
+
+            async def artist_stage(artist: Artist):
+                processed = await self.refresh_artist(artist)
+                if processed:
+                    grow(song_task, 1)
+                    return [processed]
+                return []
+
+            async def song_stage(artist: Artist):
+                songs = await self.service.process_songs(artist)
+                grow(lyrics_task, len(songs))
+                return [(artist, song) for song in songs]
+
+            async def lyrics_stage(item):
+                artist, song = item
+                lyrics = await self.service.process_lyrics(artist, song)
+                return [(artist, song, lyrics)] if lyrics else []
+
+            def write(item):
+                self._write_lyrics(temp_dir, *item, stats)
+
+            workers = self.max_workers
+            pipeline = Pipeline(
+                [
+                    Stage(artist_stage, workers, report(artist_task, "artist")),
+                    Stage(song_stage, workers, report(song_task, "songs")),
+                    Stage(lyrics_stage, workers, report(lyrics_task, "lyrics")),
+                ],
+                queue_size=self.max_workers * 4,
+            )
+            await pipeline.run(artists, write)
+
+        if not stats:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return
+
+        try:
+            await self._package_release(stats, output_dir, temp_dir)
+        except Exception as e:
+            self.console.print(f"[red]Error[/red] creating release: {str(e)}")
+            raise
 
     async def create_release(
         self, lyrics_list: List[Lyrics], output_dir: str, temp_dir: str
@@ -187,49 +324,56 @@ class BaseRunner(ABC):
 
         try:
             # Create lyrics files
+            Path(temp_dir).mkdir(parents=True, exist_ok=True)
+            stats = {}
             for lyrics in lyrics_list:
                 song = await self.repository.get_song_by_id(lyrics.song_id)
                 artist = await self.repository.get_artist_by_id(song.artist_id)
+                self._write_lyrics(temp_dir, artist, song, lyrics, stats)
 
-                filename = f"{artist.name} - {song.name}.txt".replace("/", "_")
-                with open(f"{temp_dir}/{filename}", "w") as f:
-                    f.write(f"{song.name}\n{artist.name}\n\n{lyrics.content}")
-
-            # Create database backup
-            postgres_utils = PostgresUtils(self.db_config)
-            backup_file = await postgres_utils.create_backup(temp_dir)
-
-            # Create zip including both lyrics and database backup
-            timestamp = datetime.now().strftime("%Y%m%d")
-            shutil.make_archive(f"{output_dir}/letras-{timestamp}", "zip", temp_dir)
-
-            # Create release notes
-            await self._create_notes(lyrics_list, output_dir)
-
-            # Cleanup
-            shutil.rmtree(temp_dir)
+            await self._package_release(stats, output_dir, temp_dir)
 
         except Exception as e:
             self.console.print(f"[red]Error[/red] creating release: {str(e)}")
             raise
 
-    async def _create_notes(self, lyrics_list: List[Lyrics], output_dir: str):
+    def _write_lyrics(
+        self, temp_dir: str, artist: Artist, song: Song, lyrics: Lyrics, stats: dict
+    ):
+        """Write one lyrics file and count it in the release stats"""
+        filename = f"{artist.name} - {song.name}.txt".replace("/", "_")
+        with open(f"{temp_dir}/{filename}", "w") as f:
+            f.write(f"{song.name}\n{artist.name}\n\n{lyrics.content}")
+
+        if artist.id not in stats:
+            stats[artist.id] = {
+                "name": artist.name,
+                "songs": 0,
+                "views": artist.views,
+            }
+        stats[artist.id]["songs"] += 1
+
+    async def _package_release(self, stats: dict, output_dir: str, temp_dir: str):
+        """Back up the database, zip the release and write its notes"""
+        # Create database backup
+        postgres_utils = PostgresUtils(self.db_config)
+        backup_file = await postgres_utils.create_backup(temp_dir)
+
+        # Create zip including both lyrics and database backup
+        timestamp = datetime.now().strftime("%Y%m%d")
+        shutil.make_archive(f"{output_dir}/letras-{timestamp}", "zip", temp_dir)
+
+        # Create release notes
+        self._create_notes(stats, output_dir)
+
+        # Cleanup
+        shutil.rmtree(temp_dir)
+
+    def _create_notes(self, stats: dict, output_dir: str):
         """Create markdown release notes"""
-        stats = {}
-        for lyrics in lyrics_list:
-            song = await self.repository.get_song_by_id(lyrics.song_id)
-            artist = await self.repository.get_artist_by_id(song.artist_id)
-
-            if artist.id not in stats:
-                stats[artist.id] = {
-                    "name": artist.name,
-                    "songs": 0,
-                    "views": artist.views,
-                }
-            stats[artist.id]["songs"] += 1
-
+        total = sum(artist["songs"] for artist in stats.values())
         content = f"""# Letras Gospel Update\n
-Added {len(lyrics_list)} new songs from {len(stats)} artists.\n
+Added {total} new songs from {len(stats)} artists.\n
 ## Top Artists\n"""
 
         for artist in sorted(stats.values(), key=lambda x: x["views"], reverse=True)[
@@ -0,0 +1,101 @@
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from letras.infrastructure.web.retry import RetryLater, deferred_retries
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class StageResult(Generic[T, R]):
+    item: T
+    value: Optional[R] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class StageExecutor:
+    """Run a stage over many items with a bounded pool of concurrent workers"""
+
+    def __init__(self, max_workers: int = 10):
+        self.max_workers = max(1, max_workers)
+
+    async def map(
+        self,
+        items: Iterable[T],
+        func: Callable[[T], Awaitable[R]],
+        on_done: Optional[Callable[[StageResult[T, R]], Any]] = None,
+    ) -> List[StageResult[T, R]]:
+        """
+        Apply func to every item, keeping at most max_workers calls in flight
+
+        Args:
+            items: Items to process
+            func: Coroutine function called once per item
+            on_done: Optional callback invoked as soon as each item finishes
+
+        Returns:
+            List[StageResult]: One result per item, in input order. Exceptions
+                raised by func are captured in the result instead of aborting
+                the whole stage. Items raising RetryLater go to the back of
+                the queue and run again once their delay is over, while the
+                worker moves on to other items.
+        """
+        items = list(items)
+        results: List[Optional[StageResult[T, R]]] = [None] * len(items)
+        pending = iter(enumerate(items))
+        # (ready at, tie breaker, index, item), earliest first
+        delayed: List[Tuple[float, int, int, T]] = []
+        sequence = itertools.count()
+
+        async def next_item() -> Optional[Tuple[int, T]]:
+            for entry in pending:
+                return entry
+            if not delayed:
+                return None
+            ready_at, _, index, item = heapq.heappop(delayed)
+            if (wait := ready_at - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            return index, item
+
+        async def worker():
+            # Fetches made from here hand their retries back to the queue
+            deferred_retries.set(True)
+            while (entry := await next_item()) is not None:
+                index, item = entry
+                try:
+                    result = StageResult(item=item, value=await func(item))
+                except RetryLater as e:
+                    ready_at = time.monotonic() + e.delay
+                    heapq.heappush(delayed, (ready_at, next(sequence), index, item))
+                    continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    result = StageResult(item=item, error=e)
+
+                results[index] = result
+                if on_done:
+                    on_done(result)
+
+        workers = min(self.max_workers, len(items))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
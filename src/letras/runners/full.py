@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
@@ -12,6 +12,7 @@ from letras.infrastructure.database.repositories.postgres_repository import (
 from letras.infrastructure.web.scraper import WebScraper
 
 from .base import BaseRunner
+from .executor import StageResult
 
 
 class FullRunner(BaseRunner):
@@ -22,22 +23,38 @@ class FullRunner(BaseRunner):
         self.db = PostgresConnection(**self.db_config)
         await self.db.initialize()
         self.repository = PostgresRepository(self.db)
-        self.scraper = WebScraper(self.base_url)
+        self.scraper = WebScraper(
+            self.base_url, max_workers=self.max_workers, **self.scraper_config
+        )
         await self.scraper.initialize()
-        self.language_service = LanguageService()
+        self.language_service = LanguageService(**self.language_config)
         self.service = LyricsService(
             repository=self.repository,
             language_service=self.language_service,
             scraper=self.scraper,
+            content_filter=self.content_filter,
         )
 
     async def run(self, output_dir: str):
         """Execute the full scraping process."""
+        if self.pipeline:
+            await self.run_pipeline(output_dir)
+            return
+
         artists = await self.process_artists()
         songs = await self.process_songs(artists)
         lyrics = await self.process_lyrics(artists, songs)
         await self.create_release(lyrics, output_dir, temp_dir=f"{output_dir}/temp")
 
+    async def discover_artists(self) -> List[Artist]:
+        """Every artist listed on the site"""
+        self.console.print("[blue]Starting full scrape...[/blue]")
+        return await self.scraper.get_all_artists()
+
+    async def refresh_artist(self, artist: Artist) -> Optional[Artist]:
+        """Store the artist with its current views"""
+        return await self.service.process_artist(artist)
+
     async def process_artists(self) -> List[Artist]:
         """Process all artists with grouped progress display"""
         self.console.print("[blue]Starting full scrape...[/blue]")
@@ -49,7 +66,6 @@ class FullRunner(BaseRunner):
 
             # Group artists
             grouped_artists = self.group_artists(web_artists)
-            processed_artists = []
 
             with Progress(
                 SpinnerColumn(),
@@ -62,28 +78,22 @@ class FullRunner(BaseRunner):
                     "[yellow]Processing all artists...", total=len(grouped_artists)
                 )
 
-                for group_key, artists in grouped_artists.items():
-                    group_task = progress.add_task(
-                        f"[cyan]Group {group_key}", total=len(artists)
-                    )
-
-                    for artist in artists:
-                        try:
-                            processed = await self.service.process_artist(artist)
-                            if processed:
-                                processed_artists.append(processed)
-                        except Exception as e:
-                            if self.verbose:
-                                progress.print(f"[red]Error in group {group_key}[/red]")
-                        finally:
-                            progress.advance(group_task)
-
+                def group_done(group_key: str, results: List[StageResult]):
                     progress.print(
-                        f"Group {group_key}: {len(artists)} artists processed"
+                        f"Group {group_key}: {len(results)} artists processed"
                     )
                     progress.advance(main_task)
 
-            return processed_artists
+                results = await self.run_groups(
+                    progress,
+                    grouped_artists,
+                    self.service.process_artist,
+                    describe=lambda key: f"[cyan]Group {key}",
+                    error_message="[red]Error in group {}[/red]",
+                    on_group_done=group_done,
+                )
+
+            return [r.value for r in results if r.ok and r.value]
 
         except Exception as e:
             self.console.print("[red]Error[/red] getting artists:", str(e))
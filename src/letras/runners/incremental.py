@@ -1,7 +1,9 @@
-from typing import Dict, List
+from pathlib import Path
+from typing import Dict, List, Optional
 
 from rich.progress import BarColumn, Progress, SpinnerColumn, TextColumn
 
+from letras.config.config import Config
 from letras.domain.entities.artist import Artist
 from letras.domain.services.language_service import LanguageService
 from letras.domain.services.lyrics_service import LyricsService
@@ -9,9 +11,12 @@ from letras.infrastructure.database.connection import PostgresConnection
 from letras.infrastructure.database.repositories.postgres_repository import (
     PostgresRepository,
 )
+from letras.infrastructure.database.utils import PostgresUtils
+from letras.infrastructure.web.retry import RetryLater
 from letras.infrastructure.web.scraper import WebScraper
 
 from .base import BaseRunner
+from .executor import StageResult
 
 
 class IncrementalRunner(BaseRunner):
@@ -23,7 +28,7 @@ class IncrementalRunner(BaseRunner):
         await self.db.initialize()
 
         # Look for latest backup in the release directory
-        release_dir = Path(self.config.release_dir)
+        release_dir = Path(Config.get_settings().release_dir)
         backup_files = list(release_dir.glob("*.sql"))
 
         if backup_files:
@@ -41,22 +46,64 @@ class IncrementalRunner(BaseRunner):
 
         # Initialize remaining services
         self.repository = PostgresRepository(self.db)
-        self.scraper = WebScraper(self.base_url)
+        self.scraper = WebScraper(
+            self.base_url, max_workers=self.max_workers, **self.scraper_config
+        )
         await self.scraper.initialize()
-        self.language_service = LanguageService()
+        self.language_service = LanguageService(**self.language_config)
         self.service = LyricsService(
             repository=self.repository,
             language_service=self.language_service,
             scraper=self.scraper,
+            content_filter=self.content_filter,
         )
 
     async def run(self, output_dir: str):
         """Execute the incremental scraping process."""
+        if self.pipeline:
+            await self.run_pipeline(output_dir)
+            return
+
         artists = await self.process_artists()
         songs = await self.process_songs(artists)
         lyrics = await self.process_lyrics(artists, songs)
         await self.create_release(lyrics, output_dir, temp_dir=f"{output_dir}/temp")
 
+    async def discover_artists(self) -> List[Artist]:
+        """Existing artists followed by the ones new on the site"""
+        self.console.print("[blue]Starting incremental update...[/blue]")
+        existing = await self.repository.get_all_artists()
+        existing_slugs = {a.slug for a in existing}
+
+        web_artists = await self.scraper.get_all_artists()
+        if not web_artists:
+            return []
+
+        self.copy_styles(existing, web_artists)
+        return existing + [a for a in web_artists if a.slug not in existing_slugs]
+
+    @staticmethod
+    def copy_styles(existing: List[Artist], web_artists: List[Artist]):
+        """Give stored artists the styles they are currently listed under"""
+        styles = {artist.slug: artist.styles for artist in web_artists}
+        for artist in existing:
+            artist.styles = list(styles.get(artist.slug, []))
+
+    async def refresh_artist(self, artist: Artist) -> Optional[Artist]:
+        """Add a new artist or refresh the views of an existing one"""
+        if not artist.id:
+            return await self.service.process_artist(artist)
+
+        try:
+            await self.service.update_artist(artist)
+        except RetryLater:
+            raise
+        except Exception as e:
+            if self.verbose:
+                self.console.print(f"[red]Error[/red] updating {artist.name}: {e}")
+        # Existing artists are kept even when their update failed
+        return artist
+
     async def process_artists(self) -> List[Artist]:
         """Process new and update existing artists with grouped progress"""
         self.console.print("[blue]Starting incremental update...[/blue]")
@@ -69,6 +116,7 @@ class IncrementalRunner(BaseRunner):
             web_artists = await self.scraper.get_all_artists()
             if not web_artists:
                 return []
+            self.copy_styles(existing, web_artists)
 
             # Find new artists
             new_artists = [a for a in web_artists if a.slug not in existing_slugs]
@@ -90,69 +138,47 @@ class IncrementalRunner(BaseRunner):
                         "[yellow]Processing new artists...", total=len(grouped_new)
                     )
 
-                    for group_key, artists in grouped_new.items():
-                        group_task = progress.add_task(
-                            f"[cyan]New artists in group {group_key}",
-                            total=len(artists),
-                        )
-
-                        processed_in_group = 0
-                        for artist in artists:
-                            try:
-                                if processed_artist := await self.service.process_artist(
-                                    artist
-                                ):
-                                    processed.append(processed_artist)
-                                    processed_in_group += 1
-                            except Exception as e:
-                                if self.verbose:
-                                    progress.print(
-                                        f"[red]Error in group {group_key}[/red]"
-                                    )
-                            finally:
-                                progress.advance(group_task)
-
+                    def new_group_done(group_key: str, results: List[StageResult]):
+                        processed_in_group = sum(1 for r in results if r.ok and r.value)
                         progress.print(
                             f"Group {group_key}: {processed_in_group} new artists added"
                         )
                         progress.advance(new_task)
 
+                    results = await self.run_groups(
+                        progress,
+                        grouped_new,
+                        self.service.process_artist,
+                        describe=lambda key: f"[cyan]New artists in group {key}",
+                        error_message="[red]Error in group {}[/red]",
+                        on_group_done=new_group_done,
+                    )
+                    processed.extend(r.value for r in results if r.ok and r.value)
+
                 # Update existing artists
                 grouped_existing = self.group_artists(existing)
                 update_task = progress.add_task(
                     "[yellow]Updating existing artists...", total=len(grouped_existing)
                 )
 
-                for group_key, artists in grouped_existing.items():
-                    group_task = progress.add_task(
-                        f"[cyan]Updating group {group_key}", total=len(artists)
-                    )
-
-                    updates_in_group = 0
-                    for artist in artists:
-                        try:
-                            result = await self.scraper.get_artist_details(artist)
-                            if result and result.views != artist.views:
-                                await self.repository.update_artist_views(
-                                    artist.id, result.views
-                                )
-                                artist.views = result.views
-                                updates_in_group += 1
-                            processed.append(artist)
-                        except Exception as e:
-                            if self.verbose:
-                                progress.print(
-                                    f"[red]Error updating in group {group_key}[/red]"
-                                )
-                            processed.append(artist)
-                        finally:
-                            progress.advance(group_task)
-
+                def update_group_done(group_key: str, results: List[StageResult]):
+                    updates_in_group = sum(1 for r in results if r.ok and r.value)
                     progress.print(
                         f"Group {group_key}: {updates_in_group} artists updated"
                     )
                     progress.advance(update_task)
 
+                results = await self.run_groups(
+                    progress,
+                    grouped_existing,
+                    self.service.update_artist,
+                    describe=lambda key: f"[cyan]Updating group {key}",
+                    error_message="[red]Error updating in group {}[/red]",
+                    on_group_done=update_group_done,
+                )
+                # Existing artists are kept even when their update failed
+                processed.extend(r.item for r in results)
+
             return processed
 
         except Exception as e:
@@ -0,0 +1,152 @@
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from letras.infrastructure.web.retry import RetryLater, deferred_retries
+
+from .executor import StageResult
+
+_DONE = object()
+# Put on a stage queue when one of its delayed items is ready again
+_WAKE = object()
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline
+
+    func receives one item and returns the items to hand to the next stage
+    (an empty iterable drops the item).
+    """
+
+    func: Callable[[Any], Awaitable[Iterable[Any]]]
+    workers: int = 1
+    on_done: Optional[Callable[[StageResult], Any]] = None
+
+
+class Pipeline:
+    """Stages connected by bounded queues so every stage runs concurrently"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 100):
+        self.stages = stages
+        self.queue_size = queue_size
+
+    async def run(self, source: Iterable[Any], sink: Callable[[Any], Any]) -> None:
+        """
+        Stream items from source through every stage into sink
+
+        A full queue blocks the stage feeding it, so a slow stage throttles
+        the ones before it instead of letting work pile up in memory. Items
+        that fail in a stage are reported through the stage's on_done callback
+        and dropped; the rest of the run continues. Items raising RetryLater
+        wait in their stage's delayed heap while the worker moves on, and
+        are picked up again once their delay is over.
+
+        Args:
+            source: Items for the first stage
+            sink: Called once for every item leaving the last stage
+        """
+        queues = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        consumers = [stage.workers for stage in self.stages] + [1]
+        # Per stage: (ready at, tie breaker, item), earliest first
+        delayed: List[List[Tuple[float, int, Any]]] = [[] for _ in self.stages]
+        sequence = itertools.count()
+        loop = asyncio.get_running_loop()
+        timers: List[asyncio.TimerHandle] = []
+
+        def wake(index: int):
+            try:
+                queues[index].put_nowait(_WAKE)
+            except asyncio.QueueFull:
+                # Busy workers check the delayed heap before every item
+                pass
+
+        async def next_item(index: int, done: bool) -> Tuple[Any, bool]:
+            """
+            Next item for a stage worker and whether the stage's input is
+            exhausted for it; the item is _DONE once nothing is left
+            """
+            heap = delayed[index]
+            while True:
+                if heap and (done or heap[0][0] <= time.monotonic()):
+                    ready_at, _, item = heapq.heappop(heap)
+                    if (wait := ready_at - time.monotonic()) > 0:
+                        await asyncio.sleep(wait)
+                    return item, done
+                if done:
+                    return _DONE, done
+                item = await queues[index].get()
+                if item is _DONE:
+                    # Delayed items are still served before leaving
+                    done = True
+                elif item is not _WAKE:
+                    return item, done
+
+        async def feed():
+            for item in source:
+                await queues[0].put(item)
+            for _ in range(consumers[0]):
+                await queues[0].put(_DONE)
+
+        async def worker(index: int, stage: Stage):
+            # Fetches made from here hand their retries back to the stage
+            deferred_retries.set(True)
+            done = False
+            while True:
+                item, done = await next_item(index, done)
+                if item is _DONE:
+                    return
+                try:
+                    outputs = await stage.func(item)
+                    result = StageResult(item=item, value=outputs)
+                except RetryLater as e:
+                    ready_at = time.monotonic() + e.delay
+                    heapq.heappush(delayed[index], (ready_at, next(sequence), item))
+                    timers.append(loop.call_later(e.delay, wake, index))
+                    continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    outputs = ()
+                    result = StageResult(item=item, error=e)
+
+                if stage.on_done:
+                    stage.on_done(result)
+                for output in outputs or ():
+                    await queues[index + 1].put(output)
+
+        async def run_stage(index: int, stage: Stage):
+            await asyncio.gather(*(worker(index, stage) for _ in range(stage.workers)))
+            # Every worker of this stage is done, release the next one
+            for _ in range(consumers[index + 1]):
+                await queues[index + 1].put(_DONE)
+
+        async def drain():
+            while (item := await queues[-1].get()) is not _DONE:
+                result = sink(item)
+                if asyncio.iscoroutine(result):
+                    await result
+
+        tasks = [asyncio.create_task(feed())]
+        tasks += [
+            asyncio.create_task(run_stage(index, stage))
+            for index, stage in enumerate(self.stages)
+        ]
+        tasks.append(asyncio.create_task(drain()))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            for timer in timers:
+                timer.cancel()
@@ -0,0 +1,64 @@
+import os
+from typing import List, Optional
+
+from letras.domain.services.content_filter import ContentFilter
+
+from .full import FullRunner
+
+
+class ReparseRunner(FullRunner):
+    """Rebuild the database from recorded pages, without touching the site"""
+
+    def __init__(
+        self,
+        db_config: dict,
+        base_url: str,
+        archives: List[str],
+        verbose: bool = True,
+        max_workers: int = 10,
+        parse_workers: Optional[int] = None,
+        scraper_config: Optional[dict] = None,
+        language_config: Optional[dict] = None,
+        content_filter: Optional[ContentFilter] = None,
+    ):
+        """
+        Initialize the runner
+
+        Args:
+            db_config: Database connection settings
+            base_url: Site the archives were recorded from
+            archives: WARC files written by earlier runs
+            max_workers: Pages handled concurrently
+            parse_workers: Parse processes, every core by default
+            scraper_config: Other WebScraper options
+            language_config: LanguageService options
+            content_filter: Exclusion rules for artists, titles and lyrics
+        """
+        config = {
+            **(scraper_config or {}),
+            "replay": list(archives),
+            "parse_workers": parse_workers or os.cpu_count() or 1,
+            "archive_path": None,
+            "cache_dir": None,
+        }
+        super().__init__(
+            db_config,
+            base_url,
+            verbose=verbose,
+            max_workers=max_workers,
+            scraper_config=config,
+            language_config=language_config,
+            content_filter=content_filter,
+        )
+
+    async def run(self, output_dir: Optional[str] = None):
+        """Replace the stored artists, songs and lyrics with the archive's"""
+        await self.repository.clear()
+
+        artists = await self.process_artists()
+        songs = await self.process_songs(artists)
+        lyrics = await self.process_lyrics(artists, songs)
+        self.console.print(
+            f"[green]Rebuilt {len(artists)} artists, {len(songs)} songs and "
+            f"{len(lyrics)} lyrics from the archive[/green]"
+        )
@@ -6,6 +6,8 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 
+from letras.domain.services.language_prior import ArtistLanguagePrior
+
 pytestmark = pytest.mark.asyncio(scope="function")
 
 
@@ -38,8 +40,20 @@ async def mock_repository(mock_connection):
     repo = Mock()
     repo.get_artist_by_slug = AsyncMock(return_value=None)
     repo.add_artist = AsyncMock()
+    repo.add_artist_styles = AsyncMock()
     repo.get_all_artists = AsyncMock(return_value=[])
     repo.get_songs_by_artist = AsyncMock(return_value=[])
+    repo.get_songs_by_paths = AsyncMock(return_value=[])
+    repo.link_song_artists = AsyncMock()
+    repo.get_redirects = AsyncMock(return_value={})
+    repo.add_redirect = AsyncMock()
+    repo.get_language_verdicts = AsyncMock(return_value={})
+    repo.add_language_verdicts = AsyncMock()
+    repo.get_artist_languages = AsyncMock(return_value={})
+    repo.record_artist_language = AsyncMock()
+    repo.get_rejections = AsyncMock(return_value=[])
+    repo.add_rejection = AsyncMock()
+    repo.remove_rejection = AsyncMock()
     repo._conn = mock_connection
     return repo
 
@@ -49,9 +63,11 @@ def mock_scraper():
     """Mock scraper for unit tests"""
     scraper = Mock()
     scraper.get_all_artists = AsyncMock(return_value=[])
+    scraper.get_artist_page = AsyncMock(return_value=None)
     scraper.get_artist_details = AsyncMock(return_value=None)
     scraper.get_artist_songs = AsyncMock(return_value=[])
     scraper.get_song_details = AsyncMock(return_value=None)
+    scraper.failure_reason = Mock(return_value=None)
     return scraper
 
 
@@ -60,6 +76,18 @@ def mock_language_service():
     """Mock language service for unit tests"""
     service = Mock()
     service.is_portuguese = Mock(return_value=True)
+    service.fingerprint = Mock(side_effect=lambda text: text)
+    service.cached = Mock(return_value=None)
+    service.remember = Mock()
+    service.prior = ArtistLanguagePrior()
+    service.detect = Mock(
+        side_effect=lambda texts: [
+            ("pt" if service.is_portuguese(t) else "en", 1.0) for t in texts
+        ]
+    )
+    service.detect_with_sources = Mock(
+        side_effect=lambda texts: [(v, "lingua") for v in service.detect(texts)]
+    )
     return service
 
 
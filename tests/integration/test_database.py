@@ -132,6 +132,29 @@ async def test_bulk_operations(repository):
     assert len(all_artists) == 10  # Should be exactly 10
 
 
+@pytest.mark.asyncio
+async def test_bulk_upserts(repository):
+    artists = await repository.add_artists(
+        [Artist(name=f"Artist {i}", slug=f"artist-{i}", views=i) for i in range(3)]
+        + [Artist(name="Artist 0", slug="artist-0", views=99)]
+    )
+    assert [a.slug for a in artists] == ["artist-0", "artist-1", "artist-2", "artist-0"]
+    assert artists[0].id == artists[3].id
+    assert artists[0].views == 99
+
+    songs = await repository.add_songs(
+        [
+            Song(name=f"Song {i}", slug=f"song-{i}", artist_id=artists[i].id, views=i)
+            for i in range(3)
+        ]
+    )
+    lyrics = await repository.add_many_lyrics(
+        [Lyrics(song_id=song.id, content=f"Letra {song.slug}") for song in songs]
+    )
+    assert [item.song_id for item in lyrics] == [song.id for song in songs]
+    assert (await repository.get_lyrics_by_song(songs[1].id)).content == "Letra song-1"
+
+
 @pytest.mark.asyncio
 async def test_lyrics_line_breaks(repository):
     # Create artist and song
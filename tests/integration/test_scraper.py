@@ -11,6 +11,8 @@ from letras.infrastructure.web.scraper import ScrapeResult, WebScraper
 
 
 class MockResponse:
+    history = ()
+
     def __init__(self, text_data):
         self._text = text_data
 
@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -48,6 +49,27 @@ def test_full_command(runner, mock_settings, tmp_path):
         mock_runner.run.assert_awaited_with(output_dir=str(tmp_path))
 
 
+def test_run_statistics_shown(runner, mock_settings, tmp_path):
+    """Statistics logged while closing the runner reach the console"""
+    with patch("letras.cli.FullRunner") as mock_runner_cls:
+        mock_runner = MagicMock()
+        mock_runner.initialize = AsyncMock()
+        mock_runner.run = AsyncMock()
+
+        async def close():
+            logging.getLogger("letras.infrastructure.web.scraper").info(
+                "Fetches: 3 made, 1 shared in flight, 0 reused"
+            )
+
+        mock_runner.close = close
+        mock_runner_cls.return_value = mock_runner
+
+        result = runner.invoke(cli, ["full", "--output", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert "Fetches: 3 made" in result.output
+
+
 def test_incremental_command(runner, mock_settings, tmp_path):
     """Test incremental command execution"""
     with patch("letras.cli.IncrementalRunner") as mock_runner_cls:
@@ -89,6 +111,33 @@ def test_init_command(runner, mock_settings):
         assert mock_db.close.await_count == 1
 
 
+def test_reparse_command(runner, mock_settings, tmp_path):
+    """Test reparse command execution"""
+    archive = tmp_path / "run.warc.gz"
+    archive.touch()
+
+    with patch("letras.cli.ReparseRunner") as mock_runner_cls:
+        mock_runner = MagicMock()
+        mock_runner.initialize = AsyncMock()
+        mock_runner.run = AsyncMock()
+        mock_runner.close = AsyncMock()
+        mock_runner_cls.return_value = mock_runner
+
+        # Without confirmation nothing runs
+        result = runner.invoke(cli, ["reparse", str(archive)], input="n\n")
+        assert result.exit_code != 0
+        mock_runner_cls.assert_not_called()
+
+        result = runner.invoke(cli, ["reparse", str(archive), "--yes", "-w", "2"])
+
+        assert result.exit_code == 0
+        _, kwargs = mock_runner_cls.call_args
+        assert kwargs["archives"] == [str(archive)]
+        assert kwargs["parse_workers"] == 2
+        assert mock_runner.run.await_count == 1
+        assert mock_runner.close.await_count == 1
+
+
 def test_full_command_error(runner, mock_settings):
     """Test error handling in full command"""
     with patch("letras.cli.FullRunner") as mock_runner_cls:
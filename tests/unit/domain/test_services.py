@@ -1,12 +1,26 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from letras.config.config import SETTINGS_DIR
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.rejection import Rejection
 from letras.domain.entities.song import Song
+from letras.domain.services import language_service as language_module
+from letras.domain.services.content_filter import ContentFilter, KeywordMatcher
+from letras.domain.services.language_prefilter import PortuguesePrefilter
+from letras.domain.services.language_prior import (
+    ArtistLanguagePrior,
+    LanguageStats,
+    title_suggests_portuguese,
+)
+from letras.domain.services.language_service import LanguageService
 from letras.domain.services.lyrics_service import LyricsService
-from letras.infrastructure.web.scraper import ScrapeResult
+from letras.infrastructure.web.scraper import ArtistPage, ScrapeResult
 
 
 class TestLyricsService:
@@ -20,20 +34,44 @@ class TestLyricsService:
         repo.get_lyrics_by_song = AsyncMock()
         repo.add_song = AsyncMock()
         repo.add_lyrics = AsyncMock()
+        repo.get_songs_by_paths = AsyncMock(return_value=[])
+        repo.link_song_artists = AsyncMock()
+        repo.get_redirects = AsyncMock(return_value={})
+        repo.add_redirect = AsyncMock()
+        repo.add_artist_styles = AsyncMock()
+        repo.get_language_verdicts = AsyncMock(return_value={})
+        repo.add_language_verdicts = AsyncMock()
+        repo.get_artist_languages = AsyncMock(return_value={})
+        repo.record_artist_language = AsyncMock()
+        repo.get_rejections = AsyncMock(return_value=[])
+        repo.add_rejection = AsyncMock()
+        repo.remove_rejection = AsyncMock()
         return repo
 
     @pytest.fixture
     def mock_language_service(self):
         service = Mock()
         service.is_portuguese = Mock(return_value=True)
+        service.fingerprint = Mock(side_effect=lambda text: text)
+        service.cached = Mock(return_value=None)
+        service.remember = Mock()
+        service.prior = ArtistLanguagePrior()
+        service.detect = Mock(
+            side_effect=lambda texts: [
+                ("pt" if service.is_portuguese(t) else "en", 1.0) for t in texts
+            ]
+        )
+        service.detect_with_sources = Mock(
+            side_effect=lambda texts: [(v, "lingua") for v in service.detect(texts)]
+        )
         return service
 
     @pytest.fixture
     def mock_scraper(self):
         scraper = Mock()
-        scraper.get_artist_details = AsyncMock()
-        scraper.get_artist_songs = AsyncMock()
+        scraper.get_artist_page = AsyncMock()
         scraper.get_song_details = AsyncMock()
+        scraper.failure_reason = Mock(return_value=None)
         return scraper
 
     @pytest.fixture
@@ -48,10 +86,9 @@ class TestLyricsService:
     async def test_process_new_artist(self, service, mock_repository, mock_scraper):
         # Setup
         artist = Artist(name="Test", slug="test")
-        scrape_result = ScrapeResult(content="", views=1000)
         processed_artist = Artist(name="Test", slug="test", views=1000, id=1)
 
-        mock_scraper.get_artist_details.return_value = scrape_result
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=1000, songs=[])
         mock_repository.get_artist_by_slug.return_value = None
         mock_repository.add_artist.return_value = processed_artist
 
@@ -70,9 +107,8 @@ class TestLyricsService:
     ):
         # Setup
         existing = Artist(name="Test", slug="test", views=500, id=1)
-        scrape_result = ScrapeResult(content="", views=1000)
 
-        mock_scraper.get_artist_details.return_value = scrape_result
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=1000, songs=[])
         mock_repository.get_artist_by_slug.return_value = existing
 
         # Execute
@@ -82,23 +118,84 @@ class TestLyricsService:
         assert result == existing
         mock_repository.update_artist_views.assert_awaited_once_with(1, 1000)
 
+    @pytest.mark.asyncio
+    async def test_artist_styles_recorded(self, service, mock_repository, mock_scraper):
+        # Setup
+        artist = Artist(name="Test", slug="test", styles=["gospel", "mpb"])
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=1000, songs=[])
+        mock_repository.get_artist_by_slug.return_value = None
+        mock_repository.add_artist.return_value = Artist(
+            name="Test", slug="test", views=1000, id=3
+        )
+
+        # Execute
+        result = await service.process_artist(artist)
+
+        # Verify
+        assert result.styles == ["gospel", "mpb"]
+        mock_repository.add_artist_styles.assert_awaited_once_with(3, ["gospel", "mpb"])
+
     @pytest.mark.asyncio
     async def test_process_songs_new(self, service, mock_repository, mock_scraper):
         # Setup
         artist = Artist(name="Test", slug="test", id=1)
-        mock_scraper.get_artist_songs.return_value = [
-            Song(name="Song 1", slug="song-1", artist_id=1),
-            Song(name="Song 2", slug="song-2", artist_id=1),
-        ]
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=100,
+            songs=[
+                Song(name="Song 1", slug="song-1", artist_id=1),
+                Song(name="Song 2", slug="song-2", artist_id=1),
+            ],
+        )
 
         # Execute
         result = await service.process_songs(artist)
 
         # Verify
         assert len(result) == 2
-        mock_scraper.get_artist_songs.assert_awaited_once_with(artist)
+        mock_scraper.get_artist_page.assert_awaited_once_with(artist)
         mock_repository.get_songs_by_artist.assert_awaited_once_with(1)
 
+    @pytest.mark.asyncio
+    async def test_artist_page_fetched_once(
+        self, service, mock_repository, mock_scraper
+    ):
+        # Setup
+        artist = Artist(name="Test", slug="test")
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=100, songs=[Song(name="Song 1", slug="song-1", artist_id=None)]
+        )
+        mock_repository.get_artist_by_slug.return_value = None
+        mock_repository.add_artist.return_value = Artist(
+            name="Test", slug="test", views=100, id=7
+        )
+
+        # Execute
+        processed = await service.process_artist(artist)
+        songs = await service.process_songs(processed)
+
+        # Verify
+        assert mock_scraper.get_artist_page.await_count == 1
+        assert [s.artist_id for s in songs] == [7]
+
+    @pytest.mark.asyncio
+    async def test_update_artist(self, service, mock_repository, mock_scraper):
+        # Setup
+        artist = Artist(name="Test", slug="test", views=500, id=1)
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=1000, songs=[Song(name="Song 1", slug="song-1", artist_id=1)]
+        )
+
+        # Execute
+        updated = await service.update_artist(artist)
+        songs = await service.process_songs(artist)
+
+        # Verify
+        assert updated
+        assert artist.views == 1000
+        mock_repository.update_artist_views.assert_awaited_once_with(1, 1000)
+        assert len(songs) == 1
+        assert mock_scraper.get_artist_page.await_count == 1
+
     @pytest.mark.asyncio
     async def test_process_lyrics(
         self, service, mock_repository, mock_scraper, mock_language_service
@@ -123,12 +220,543 @@ class TestLyricsService:
         mock_scraper.get_song_details.assert_awaited_once_with(artist, song)
         mock_repository.add_lyrics.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_language_detected_in_batches(
+        self, service, mock_repository, mock_scraper, mock_language_service
+    ):
+        # Setup
+        artist = Artist(name="Test", slug="test", id=1)
+        songs = [Song(name=f"S{i}", slug=f"s{i}", artist_id=1) for i in range(3)]
+        mock_scraper.get_song_details.side_effect = lambda artist, song: ScrapeResult(
+            content=f"Letra {song.slug}", views=1
+        )
+        mock_repository.add_song.side_effect = lambda song: song
+
+        # Execute
+        await asyncio.gather(*(service.process_lyrics(artist, s) for s in songs))
+        await service.close()
+
+        # Verify
+        mock_language_service.detect.assert_called_once_with(
+            ["Letra s0", "Letra s1", "Letra s2"]
+        )
+        assert mock_repository.add_lyrics.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_language_verdicts_cached(
+        self, service, mock_repository, mock_language_service
+    ):
+        # Setup
+        mock_repository.get_language_verdicts.return_value = {"stored": ("en", 0.9)}
+
+        # Execute
+        result = await service._detect_portuguese(["stored", "new", "new"])
+
+        # Verify
+        assert result == [False, True, True]
+        mock_repository.get_language_verdicts.assert_awaited_once_with(
+            ["stored", "new"]
+        )
+        mock_language_service.detect.assert_called_once_with(["new"])
+        mock_repository.add_language_verdicts.assert_awaited_once_with(
+            [("new", "pt", 1.0, "lingua")]
+        )
+        mock_language_service.remember.assert_any_call("new", ("pt", 1.0))
+
+    @pytest.mark.asyncio
+    async def test_artist_prior_skips_fetch(
+        self, service, mock_repository, mock_scraper
+    ):
+        # Setup
+        artist = Artist(name="Band", slug="band", id=4)
+        mock_repository.get_artist_languages.return_value = {4: (0, 30)}
+
+        # Execute
+        skipped = await service.process_lyrics(
+            artist, Song(name="Highway", slug="highway", artist_id=4)
+        )
+        fetched = await service.process_lyrics(
+            artist, Song(name="Coração", slug="coracao", artist_id=4)
+        )
+
+        # Verify
+        assert skipped is None
+        assert fetched is not None
+        mock_scraper.get_song_details.assert_awaited_once()
+        mock_repository.record_artist_language.assert_awaited_once_with(4, True)
+
+    @pytest.mark.asyncio
+    async def test_rejected_songs_left_out(
+        self, service, mock_repository, mock_scraper
+    ):
+        # Setup
+        artist = Artist(name="Band", slug="band", id=4)
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=1,
+            songs=[
+                Song(name="Gone", slug="gone", artist_id=None),
+                Song(name="Due", slug="due", artist_id=None),
+                Song(name="New", slug="new", artist_id=None),
+            ],
+        )
+        past = datetime.now() - timedelta(days=1)
+        mock_repository.get_rejections.return_value = [
+            Rejection(artist_id=4, slug="gone", reason="language"),
+            Rejection(artist_id=4, slug="due", reason="not_found", retry_after=past),
+        ]
+
+        # Execute
+        songs = await service.process_songs(artist)
+
+        # Verify
+        assert [s.slug for s in songs] == ["due", "new"]
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_rejected(self, service, mock_repository, mock_scraper):
+        # Setup
+        artist = Artist(name="Band", slug="band", id=4)
+        song = Song(name="Gone", slug="gone", artist_id=4)
+        mock_scraper.get_song_details.return_value = None
+        mock_scraper.failure_reason.return_value = "not_found"
+        service._rejections[(4, "gone")] = Rejection(
+            artist_id=4, slug="gone", reason="not_found", attempts=2
+        )
+
+        # Execute
+        result = await service.process_lyrics(artist, song)
+
+        # Verify
+        assert result is None
+        rejection = mock_repository.add_rejection.await_args.args[0]
+        assert (rejection.slug, rejection.reason) == ("gone", "not_found")
+        assert rejection.attempts == 3
+        assert rejection.retry_after - rejection.rejected_at == timedelta(days=28)
+
+    @pytest.mark.asyncio
+    async def test_other_language_rejected(
+        self, service, mock_repository, mock_scraper, mock_language_service
+    ):
+        # Setup
+        artist = Artist(name="Band", slug="band", id=4)
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Lyrics", views=1
+        )
+        mock_language_service.is_portuguese.return_value = False
+
+        # Execute
+        await service.process_lyrics(
+            artist, Song(name="Song", slug="song", artist_id=4)
+        )
+
+        # Verify
+        rejection = mock_repository.add_rejection.await_args.args[0]
+        assert rejection.reason == "language"
+        assert rejection.retry_after is None
+
+    @pytest.mark.asyncio
+    async def test_stored_song_forgets_rejection(
+        self, service, mock_repository, mock_scraper
+    ):
+        # Setup
+        artist = Artist(name="Band", slug="band", id=4)
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Letra", views=1
+        )
+        mock_repository.add_song.side_effect = lambda song: song
+        service._rejections[(4, "back")] = Rejection(
+            artist_id=4, slug="back", reason="error"
+        )
+
+        # Execute
+        await service.process_lyrics(
+            artist, Song(name="Back", slug="back", artist_id=4)
+        )
+
+        # Verify
+        mock_repository.remove_rejection.assert_awaited_once_with(4, "back")
+
+    @pytest.mark.asyncio
+    async def test_filtered_artist_not_fetched(self, service, mock_scraper):
+        # Setup
+        service.content_filter = ContentFilter(artists=["Padre"])
+
+        # Execute
+        result = await service.process_artist(Artist(name="Padre Zezinho", slug="pz"))
+        songs = await service.process_songs(Artist(name="Padre Zezinho", slug="pz"))
+
+        # Verify
+        assert result is None
+        assert songs == []
+        mock_scraper.get_artist_page.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_filtered_titles_left_out(self, service, mock_scraper):
+        # Setup
+        service.content_filter = ContentFilter(titles=["Ave Maria"])
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=1,
+            songs=[
+                Song(name="AVE MARÍA", slug="ave-maria", artist_id=None),
+                Song(name="Aleluia", slug="aleluia", artist_id=None),
+            ],
+        )
+
+        # Execute
+        songs = await service.process_songs(Artist(name="Band", slug="band", id=4))
+
+        # Verify
+        assert [s.slug for s in songs] == ["aleluia"]
+
+    @pytest.mark.asyncio
+    async def test_filtered_lyrics_not_detected(
+        self, service, mock_repository, mock_scraper, mock_language_service
+    ):
+        # Setup
+        service.content_filter = ContentFilter(min_length=100)
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Curta", views=1
+        )
+
+        # Execute
+        result = await service.process_lyrics(
+            Artist(name="Band", slug="band", id=4),
+            Song(name="Song", slug="song", artist_id=4),
+        )
+
+        # Verify
+        assert result is None
+        mock_language_service.detect.assert_not_called()
+        mock_repository.add_song.assert_not_awaited()
+        rejection = mock_repository.add_rejection.await_args.args[0]
+        assert rejection.reason == "filtered"
+
+    @pytest.mark.asyncio
+    async def test_shared_song_fetched_once(
+        self, service, mock_repository, mock_scraper
+    ):
+        # Setup
+        first = Artist(name="A", slug="a", id=1)
+        second = Artist(name="B", slug="b", id=2)
+        mock_scraper.get_artist_page.side_effect = [
+            ArtistPage(
+                views=1,
+                songs=[Song(name="Duet", slug="duet", artist_id=None, path="/a/duet/")],
+            ),
+            ArtistPage(
+                views=1,
+                songs=[Song(name="Duet", slug="duet", artist_id=None, path="/a/duet/")],
+            ),
+        ]
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Letra", views=10, path="/a/duet/"
+        )
+        mock_repository.add_song.side_effect = lambda song: Song(
+            name=song.name, slug=song.slug, artist_id=1, path=song.path, id=5
+        )
+
+        # Execute
+        songs = await service.process_songs(first)
+        shared = await service.process_songs(second)
+        await service.process_lyrics(first, songs[0])
+
+        # Verify
+        assert len(songs) == 1
+        assert shared == []
+        mock_scraper.get_song_details.assert_awaited_once()
+        mock_repository.link_song_artists.assert_awaited_once_with([(5, 1), (5, 2)])
+
+    @pytest.mark.asyncio
+    async def test_shared_song_rejected_for_every_artist(
+        self, service, mock_repository, mock_scraper, mock_language_service
+    ):
+        # Setup
+        first = Artist(name="A", slug="a", id=1)
+        second = Artist(name="B", slug="b", id=2)
+        mock_scraper.get_artist_page.side_effect = [
+            ArtistPage(
+                views=1,
+                songs=[Song(name="Duet", slug="duet", artist_id=None, path="/a/duet/")],
+            ),
+            ArtistPage(
+                views=1,
+                songs=[
+                    Song(name="Duet", slug="a-duet", artist_id=None, path="/a/duet/")
+                ],
+            ),
+        ]
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Lyrics", views=10, path="/a/duet/"
+        )
+        mock_language_service.is_portuguese.return_value = False
+
+        # Execute
+        songs = await service.process_songs(first)
+        await service.process_songs(second)
+        await service.process_lyrics(first, songs[0])
+
+        # Verify
+        rejected = [
+            (call.args[0].artist_id, call.args[0].slug, call.args[0].reason)
+            for call in mock_repository.add_rejection.await_args_list
+        ]
+        assert rejected == [(1, "duet", "language"), (2, "a-duet", "language")]
+        assert service._claimed == {}
+        mock_repository.link_song_artists.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stored_song_linked(self, service, mock_repository, mock_scraper):
+        # Setup
+        artist = Artist(name="B", slug="b", id=2)
+        mock_scraper.get_artist_page.return_value = ArtistPage(
+            views=1,
+            songs=[Song(name="Duet", slug="duet", artist_id=None, path="/old/duet/")],
+        )
+        mock_repository.get_redirects.return_value = {"/old/duet/": "/a/duet/"}
+        mock_repository.get_songs_by_paths.return_value = [
+            Song(name="Duet", slug="duet", artist_id=1, path="/a/duet/", id=5)
+        ]
+
+        # Execute
+        songs = await service.process_songs(artist)
+
+        # Verify
+        assert songs == []
+        mock_repository.get_songs_by_paths.assert_awaited_once_with(["/a/duet/"])
+        mock_repository.link_song_artists.assert_awaited_once_with([(5, 2)])
+
+    @pytest.mark.asyncio
+    async def test_redirect_recorded(self, service, mock_repository, mock_scraper):
+        # Setup
+        artist = Artist(name="A", slug="a", id=1)
+        song = Song(name="Duet", slug="duet", artist_id=1, path="/a/duet/")
+        mock_scraper.get_song_details.return_value = ScrapeResult(
+            content="Letra", views=10, path="/b/duet/"
+        )
+        mock_repository.get_songs_by_paths.return_value = [
+            Song(name="Duet", slug="duet", artist_id=2, path="/b/duet/", id=9)
+        ]
+        service._redirects = {}
+
+        # Execute
+        result = await service.process_lyrics(artist, song)
+
+        # Verify
+        assert result is None
+        mock_repository.add_redirect.assert_awaited_once_with("/a/duet/", "/b/duet/")
+        mock_repository.link_song_artists.assert_awaited_once_with([(9, 1)])
+        mock_repository.add_song.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_error_handling(self, service, mock_scraper):
         # Setup
-        mock_scraper.get_artist_details.side_effect = Exception("Network error")
+        mock_scraper.get_artist_page.side_effect = Exception("Network error")
 
         # Execute & Verify
         with pytest.raises(Exception) as exc:
             await service.process_artist(Artist(name="Test", slug="test"))
         assert "Network error" in str(exc.value)
+
+
+class TestLanguageService:
+    @pytest.fixture(scope="class")
+    def language_service(self):
+        return LanguageService()
+
+    def test_are_portuguese(self, language_service):
+        texts = [
+            "Eu te louvarei, Senhor, de todo o meu coração",
+            "Amazing grace, how sweet the sound that saved a wretch like me",
+            "123 !!!",
+        ]
+
+        assert language_service.are_portuguese(texts) == [True, False, False]
+        assert language_service.are_portuguese([]) == []
+
+    def test_detector_built_lazily_and_shared(self):
+        with (
+            patch.object(language_module, "_detectors", {}),
+            patch.object(language_module, "LanguageDetectorBuilder") as builder,
+        ):
+            first = LanguageService(low_accuracy=True)
+            second = LanguageService(low_accuracy=True)
+            assert not builder.from_languages.called
+
+            assert first.detector is second.detector
+            assert builder.from_languages.call_count == 1
+            builder.from_languages().with_low_accuracy_mode.assert_called_once()
+
+    def test_preload_builds_immediately(self):
+        with (
+            patch.object(language_module, "_detectors", {}),
+            patch.object(language_module, "LanguageDetectorBuilder") as builder,
+        ):
+            LanguageService(preload=True)
+
+            builder.from_languages().with_preloaded_language_models.assert_called_once()
+
+    def test_prefilter_skips_detector(self):
+        service = LanguageService()
+        service._options = None  # Any detector use would fail
+        texts = [
+            "Eu te louvarei Senhor de todo o meu coração, cantarei as tuas "
+            "maravilhas, não há ninguém como tu, meu Deus, em toda a terra",
+            "Amazing grace how sweet the sound that saved a wretch like me, "
+            "I once was lost but now am found, was blind but now I see",
+        ]
+
+        assert service.are_portuguese(texts) == [True, False]
+        assert service.prefiltered == 2
+        assert service.detected == 0
+
+    def test_sources(self):
+        service = LanguageService()
+        prefiltered = (
+            "Eu te louvarei Senhor de todo o meu coração, cantarei as tuas "
+            "maravilhas, não há ninguém como tu, meu Deus, em toda a terra"
+        )
+
+        results = service.detect_with_sources([prefiltered, "Eu te amo, meu Senhor"])
+
+        assert [source for _, source in results] == ["prefilter", "lingua"]
+
+    def test_detect_confidence(self, language_service):
+        (language, confidence), empty = language_service.detect(
+            ["Eu te amo, meu Senhor", ""]
+        )
+
+        assert language == "pt"
+        assert 0 < confidence <= 1
+        assert empty == (None, 0.0)
+
+    def test_fingerprint_and_lru(self):
+        service = LanguageService(cache_size=2)
+        assert service.fingerprint("Eu te amo!") == service.fingerprint("Eu te  amo")
+
+        service.remember("a", ("pt", 0.9))
+        service.remember("b", ("en", 0.8))
+        service.cached("a")
+        service.remember("c", ("es", 0.7))
+
+        assert service.cached("a") == ("pt", 0.9)
+        assert service.cached("b") is None
+
+    def test_sample_extended_when_inconclusive(self):
+        def value(code, confidence):
+            language = SimpleNamespace(iso_code_639_1=SimpleNamespace(name=code))
+            return SimpleNamespace(language=language, value=confidence)
+
+        samples = []
+
+        def confidences(texts):
+            samples.append([len(text) for text in texts])
+            # Inconclusive until the sample covers 40 characters
+            return [
+                (
+                    [value("PT", 0.9), value("ES", 0.1)]
+                    if len(text) >= 40
+                    else [value("PT", 0.55), value("ES", 0.45)]
+                )
+                for text in texts
+            ]
+
+        detector = Mock()
+        detector.compute_language_confidence_values_in_parallel.side_effect = (
+            confidences
+        )
+        service = LanguageService(prefilter=False, sample_size=20)
+        texts = ["palavra " * 20, "curto texto"]
+        with patch.object(language_module, "get_detector", return_value=detector):
+            verdicts = service.detect(texts)
+
+        assert verdicts == [("pt", 0.9), ("pt", 0.55)]
+        assert samples == [[15, 11], [39], [79]]
+        assert service.extended == 1
+
+
+class TestPortuguesePrefilter:
+    def test_classify(self):
+        prefilter = PortuguesePrefilter()
+
+        assert prefilter.classify(
+            "Não vou desistir, não vou parar, eu sei que tu estás comigo em "
+            "cada passo, a tua graça me basta todos os dias"
+        )
+        assert (
+            prefilter.classify(
+                "Cuando llegue la noche y el miedo toque a la puerta, sé que tu "
+                "mano me guiará, tú eres mi refugio y mi paz"
+            )
+            is False
+        )
+
+    def test_short_text_undecided(self):
+        assert PortuguesePrefilter().classify("Aleluia, glória, hosana") is None
+
+
+class TestArtistLanguagePrior:
+    def test_needs_confident_share(self):
+        prior = ArtistLanguagePrior(min_songs=5, threshold=0.7)
+
+        assert not prior.mostly_other(LanguageStats(portuguese=0, other=4))
+        assert not prior.mostly_other(LanguageStats(portuguese=0, other=5))
+        assert prior.mostly_other(LanguageStats(portuguese=0, other=12))
+        assert not prior.mostly_other(LanguageStats(portuguese=6, other=20))
+
+    def test_samples_skipped_artists(self):
+        prior = ArtistLanguagePrior(sample_every=3)
+        stats = LanguageStats(other=50)
+
+        fetched = [prior.should_fetch(stats, "Highway") for _ in range(6)]
+
+        assert fetched == [False, False, True, False, False, True]
+        assert prior.should_fetch(stats, "Minha canção")
+
+    def test_title_hint(self):
+        assert title_suggests_portuguese("Não Pare")
+        assert title_suggests_portuguese("Deus é fiel")
+        assert not title_suggests_portuguese("Amazing Grace")
+
+
+class TestContentFilter:
+    def test_accent_and_case_insensitive(self):
+        matcher = KeywordMatcher(["Irmã", "Ave Maria", "Candomblé"])
+
+        assert matcher.find("IRMA Dulce") == "irma"
+        assert matcher.find("ave   maria cheia de graça") == "ave maria"
+        assert matcher.find("Canto de candomble") == "candomble"
+
+    def test_whole_words_only(self):
+        matcher = KeywordMatcher(["Frei", "Exu", "Santa Maria"])
+
+        assert matcher.find("Daniel Freitas") is None
+        assert matcher.find("Exuberante") is None
+        assert matcher.find("Frei Gilson") == "frei"
+        assert matcher.find("Santa Mariana") is None
+
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher(["santo", "pai de santo", "de"])
+
+        assert matcher.find("pai de santo") == "de"
+        assert KeywordMatcher(["pai de santo", "santo anjo"]).find(
+            "o pai de santo anjo"
+        ) in ("pai de santo", "santo anjo")
+        assert KeywordMatcher(["abcd", "bc"]).find("xabcy") is None
+        assert KeywordMatcher(["abcd", "bc"]).find("a bc d") == "bc"
+
+    def test_lyric_length(self):
+        content_filter = ContentFilter(min_length=10, max_length=20)
+
+        assert not content_filter.allows_lyrics("curta")
+        assert content_filter.allows_lyrics("tamanho certo")
+        assert not content_filter.allows_lyrics("longa " * 10)
+
+    def test_settings_file(self):
+        content_filter = ContentFilter.from_file(SETTINGS_DIR / "filters.yaml")
+
+        assert not content_filter.allows_artist("Padre Marcelo Rossi")
+        assert content_filter.allows_artist("Aline Barros")
+        assert not content_filter.allows_title("Nossa Senhora")
+        assert content_filter.allows_title("Ressuscita-me")
+        assert not content_filter.allows_lyrics("x" * 50)
+        assert not content_filter.allows_lyrics("ave maria " * 20)
+        assert content_filter.allows_lyrics("Deus é fiel " * 20)
@@ -0,0 +1,122 @@
+from unittest.mock import patch
+
+import pytest
+
+from letras.domain.entities.artist import Artist
+from letras.domain.entities.song import Song
+from letras.infrastructure.web.archive import ArchiveMiss, WarcArchive, WarcWriter
+from letras.infrastructure.web.scraper import WebScraper
+
+
+class TestWarc:
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "run.warc.gz"
+        writer = WarcWriter(str(path))
+        writer.write("https://test.com/a/", "<p>Canção</p>")
+        writer.write("https://test.com/b/", "x" * 200_000)
+        writer.write("https://test.com/a/", "<p>Nova</p>", truncated=True)
+        writer.close()
+
+        archive = WarcArchive([str(path)])
+        assert len(archive) == 2
+        assert archive.get("https://test.com/a/") == "<p>Nova</p>"
+        assert archive.get("https://test.com/b/") == "x" * 200_000
+        with pytest.raises(ArchiveMiss):
+            archive.get("https://test.com/c/")
+
+    def test_interrupted_record_is_skipped(self, tmp_path):
+        path = tmp_path / "run.warc.gz"
+        writer = WarcWriter(str(path))
+        writer.write("https://test.com/a/", "page")
+        writer.write("https://test.com/b/", "page")
+        writer.close()
+        path.write_bytes(path.read_bytes()[:-10])
+
+        archive = WarcArchive([str(path)])
+        assert archive.urls() == ["https://test.com/a/"]
+
+    def test_several_files(self, tmp_path):
+        for name in ("one", "two"):
+            writer = WarcWriter(str(tmp_path / f"{name}.warc.gz"))
+            writer.write(f"https://test.com/{name}/", name)
+            writer.close()
+
+        archive = WarcArchive(
+            [str(tmp_path / "one.warc.gz"), str(tmp_path / "two.warc.gz")]
+        )
+        assert archive.get("https://test.com/two/") == "two"
+        assert "https://test.com/one/" in archive
+
+    def test_redirected_page_indexed_twice(self, tmp_path):
+        path = tmp_path / "run.warc.gz"
+        writer = WarcWriter(str(path))
+        writer.write("https://test.com/new/", "page", requested="https://test.com/old/")
+        writer.close()
+
+        archive = WarcArchive([str(path)])
+        assert archive.get("https://test.com/new/") == "page"
+        assert archive.get("https://test.com/old/") == "page"
+        assert archive.redirects == {"https://test.com/old/": "https://test.com/new/"}
+
+
+class TestScraperArchive:
+    @pytest.mark.asyncio
+    async def test_record_and_replay(self, tmp_path, sample_html):
+        path = str(tmp_path / "run.warc.gz")
+        recorder = WebScraper(base_url="https://test.com", archive_path=path)
+        await recorder.initialize()
+        with patch.object(recorder, "_download") as download:
+            download.return_value = sample_html["artist_page"]
+            await recorder.get_artist_page(Artist(name="Test", slug="test"))
+        await recorder.close()
+
+        replayer = WebScraper(base_url="https://test.com", replay=[path])
+        await replayer.initialize()
+        try:
+            with patch.object(replayer._session, "get") as get:
+                page = await replayer.get_artist_page(Artist(name="Test", slug="test"))
+                missing = await replayer.get_artist_page(
+                    Artist(name="Other", slug="other")
+                )
+
+            get.assert_not_called()
+            assert page.views == 1234
+            assert [s.slug for s in page.songs] == ["song1"]
+            assert missing is None
+        finally:
+            await replayer.close()
+
+    @pytest.mark.asyncio
+    async def test_replay_redirected_song(self, tmp_path, sample_html):
+        path = str(tmp_path / "run.warc.gz")
+        artist = Artist(name="Test", slug="test")
+        recorder = WebScraper(base_url="https://test.com", archive_path=path)
+        await recorder.initialize()
+
+        async def download(url):
+            recorder.redirects[url] = "/other/song/"
+            return sample_html["song_page"]
+
+        with patch.object(recorder, "_download", side_effect=download):
+            song = Song(name="Song", slug="song", artist_id=1, path="/test/song/")
+            recorded = await recorder.get_song_details(artist, song)
+        await recorder.close()
+
+        # Reparse asks for the stored redirect target, or for the old path
+        # when the redirect is not known yet
+        replayer = WebScraper(base_url="https://test.com", replay=[path])
+        await replayer.initialize()
+        try:
+            target = await replayer.get_song_details(
+                artist, Song(name="Song", slug="song", artist_id=1, path="/other/song/")
+            )
+            old = await replayer.get_song_details(
+                artist, Song(name="Song", slug="song", artist_id=1, path="/test/song/")
+            )
+        finally:
+            await replayer.close()
+
+        assert recorded.path == "/other/song/"
+        assert target.content == recorded.content
+        assert target.path == "/other/song/"
+        assert old.path == "/other/song/"
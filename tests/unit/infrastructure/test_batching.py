@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from letras.infrastructure.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    @pytest.mark.asyncio
+    async def test_groups_concurrent_calls(self):
+        batches = []
+
+        async def double(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_size=4, max_delay=0.01)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert results == [i * 2 for i in range(10)]
+        assert [len(batch) for batch in batches] == [4, 4, 2]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        async def fail(items):
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(fail, max_size=2)
+        results = await asyncio.gather(
+            batcher.submit(1), batcher.submit(2), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_short_result_fails_every_caller(self):
+        async def short(items):
+            return items[:1]
+
+        batcher = MicroBatcher(short, max_size=2)
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.submit(1), batcher.submit(2), return_exceptions=True
+            ),
+            timeout=1,
+        )
+
+        assert results[0] == 1
+        assert isinstance(results[1], ValueError)
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from letras.infrastructure.web.egress import EgressPool
+from letras.infrastructure.web.scraper import WebScraper
+
+
+class StandInProxy:
+    """Local HTTP server answering proxied requests itself"""
+
+    def __init__(self, name: str, status: int = 200):
+        self.name = name
+        self.status = status
+        self.seen = []
+        self._runner = None
+        self.url = None
+
+    async def handle(self, request):
+        self.seen.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return web.Response(text=f"via {self.name}", status=self.status)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_route("GET", "/{tail:.*}", self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+class TestEgressPool:
+    def test_routes_share_the_budget(self):
+        pool = EgressPool(["http://proxy-a:3128", "10.0.0.2"], max_workers=10, rate=4)
+
+        assert [route.limiter.max_window for route in pool.routes] == [5, 5]
+        assert [route.limiter.rate for route in pool.routes] == [2, 2]
+        assert pool.routes[0].options == {"proxy": "http://proxy-a:3128"}
+        assert pool.routes[1].local_address == "10.0.0.2"
+        assert pool.routes[1].options == {}
+
+    @pytest.mark.asyncio
+    async def test_benched_route_leaves_rotation(self):
+        pool = EgressPool(["http://a:1", "http://b:1"], bench=60)
+        first, second = pool.routes
+
+        pool.penalize(first)
+        assert await pool.choose() is second
+        assert first.strikes == 1
+
+        pool.penalize(first)
+        assert first.benched_until - second.benched_until > 100
+
+
+class TestScraperEgress:
+    @pytest.mark.asyncio
+    async def test_requests_spread_over_proxies(self):
+        async with StandInProxy("a") as a, StandInProxy("b") as b:
+            scraper = WebScraper(
+                base_url="http://letras.test", max_workers=4, egress=[a.url, b.url]
+            )
+            await scraper.initialize()
+            try:
+                bodies = await asyncio.gather(
+                    *(scraper._get(f"/artist-{i}/") for i in range(8))
+                )
+            finally:
+                await scraper.close()
+
+        assert set(bodies) == {"via a", "via b"}
+        assert len(a.seen) + len(b.seen) == 8
+        assert a.seen[0].startswith("http://letras.test/artist-")
+
+    @pytest.mark.asyncio
+    async def test_throttled_proxy_is_benched(self):
+        async with StandInProxy("a", status=429) as a, StandInProxy("b") as b:
+            scraper = WebScraper(
+                base_url="http://letras.test",
+                max_workers=2,
+                egress=[a.url, b.url],
+                max_attempts=3,
+            )
+            scraper._retries.backoff = lambda attempt: 0
+            await scraper.initialize()
+            try:
+                bodies = [await scraper._get(f"/artist-{i}/") for i in range(4)]
+            finally:
+                await scraper.close()
+
+        assert bodies == ["via b"] * 4
+        assert len(a.seen) == 1
@@ -0,0 +1,85 @@
+import pytest
+
+from letras.infrastructure.web.extractors import EXTRACTORS, get_extractor, song_path
+
+PAGE = """<!DOCTYPE html>
+<html>
+    <head><meta charset="utf-8"></head>
+    <body>
+        <a href="/">Home</a>
+        <a href="/aline-barros/"> Aline Barros </a>
+        <a href="/aline-barros/1819226/">Ressuscita-me</a>
+        <div class="cnt-info head-info-exib"><b>1.234</b> exibições</div>
+        <ul>
+            <li class="songList-table-row --song">
+                <a class="songList-table-songName" href="/a/s1/" title=" Título ">S1</a>
+            </li>
+            <li class="songList-table-row">
+                <span><a class="songList-table-songName" href="/a/s2/">Canção 2</a></span>
+            </li>
+            <li class="songList-table-row"></li>
+        </ul>
+        <div class="lyric-original">
+            <p>Linha um<br/> linha <b>dois</b><!-- ad --></p>
+            <p>Refrão</p>
+        </div>
+    </body>
+</html>
+"""
+
+
+@pytest.fixture(params=sorted(EXTRACTORS))
+def extractor(request):
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    return get_extractor(request.param)
+
+
+class TestExtractors:
+    def test_artists(self, extractor):
+        assert extractor.artists(PAGE) == [("Aline Barros", "aline-barros")]
+
+    def test_artist_page(self, extractor):
+        assert extractor.artist_page(PAGE) == (
+            1234,
+            [("Título", "s1", "/a/s1/"), ("Canção 2", "s2", "/a/s2/")],
+        )
+
+    def test_song_page(self, extractor):
+        assert extractor.song_page(PAGE) == (1234, "Linha um\nlinha\ndois\n\nRefrão")
+
+    def test_song_page_without_lyrics(self, extractor):
+        assert extractor.song_page("<div class='head-info-exib'><b>5</b></div>") is None
+
+    def test_empty_document(self, extractor):
+        assert extractor.artists("") == []
+        assert extractor.artist_page("") == (None, [])
+        assert extractor.song_page("") is None
+
+    def test_sample_pages(self, extractor, sample_html):
+        assert extractor.artists(sample_html["artist_list"]) == [
+            ("Artist 1", "artist1"),
+            ("Artist 2", "artist2"),
+        ]
+        assert extractor.artist_page(sample_html["artist_page"]) == (
+            1234,
+            [("Song 1", "song1", "/song1/")],
+        )
+        assert extractor.song_page(sample_html["song_page"]) == (
+            500,
+            "Verse 1\n\nVerse 2",
+        )
+
+
+def test_song_path():
+    assert song_path("/aline-barros/1819226/") == "/aline-barros/1819226/"
+    assert song_path("aline-barros/1819226") == "/aline-barros/1819226/"
+    assert (
+        song_path("https://www.letras.mus.br/aline-barros/1819226/?ref=feat")
+        == "/aline-barros/1819226/"
+    )
+
+
+def test_unknown_parser():
+    with pytest.raises(ValueError):
+        get_extractor("regex")
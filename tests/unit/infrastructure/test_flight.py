@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from letras.infrastructure.web.flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_call(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "body"
+
+        flight = SingleFlight()
+        results = await asyncio.gather(*(flight.do("/a/", fetch) for _ in range(5)))
+
+        assert results == ["body"] * 5
+        assert len(calls) == 1
+        assert flight.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_memoized(self):
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ValueError("boom")
+            return "body"
+
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            await flight.do("/a/", flaky)
+        assert await flight.do("/a/", flaky) == "body"
+        assert await flight.do("/a/", flaky) == "body"
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_memo_is_bounded(self):
+        async def fetch():
+            return "body"
+
+        flight = SingleFlight(memo_size=2)
+        for key in ("/a/", "/b/", "/c/"):
+            await flight.do(key, fetch)
+        await flight.do("/a/", fetch)
+
+        assert flight.stats.calls == 4
+        assert flight.stats.memo_hits == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "body"
+
+        flight = SingleFlight()
+        first = asyncio.ensure_future(flight.do("/a/", fetch))
+        second = asyncio.ensure_future(flight.do("/a/", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "body"
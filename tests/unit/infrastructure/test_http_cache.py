@@ -0,0 +1,130 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from letras.infrastructure.web.cache import HttpCache
+from letras.infrastructure.web.scraper import WebScraper
+
+
+def make_response(text="", status=200, headers=None):
+    response = MagicMock()
+    response.status = status
+    response.headers = headers or {}
+    response.text = AsyncMock(return_value=text)
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock()
+    return response
+
+
+class TestHttpCache:
+    def test_store_and_hit(self, tmp_path):
+        cache = HttpCache(str(tmp_path))
+        cache.store("/a/", "<html>á</html>", etag='"v1"')
+
+        entry = cache.lookup("/a/")
+        assert entry.etag == '"v1"'
+        assert cache.hit(entry) == "<html>á</html>"
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.bytes_saved == len("<html>á</html>".encode())
+
+    def test_entries_persist_across_instances(self, tmp_path):
+        HttpCache(str(tmp_path)).store("/a/", "body", last_modified="yesterday")
+
+        cache = HttpCache(str(tmp_path))
+        entry = cache.lookup("/a/")
+        assert cache.hit(entry) == "body"
+        assert cache.conditional_headers(entry) == {"If-Modified-Since": "yesterday"}
+
+    def test_ttl(self, tmp_path):
+        cache = HttpCache(str(tmp_path), ttl=60)
+        cache.store("/a/", "body")
+        entry = cache.lookup("/a/")
+        assert cache.is_fresh(entry)
+
+        entry.stored_at = time.time() - 120
+        assert not cache.is_fresh(entry)
+
+        cache.hit(entry, revalidated=True)
+        assert cache.is_fresh(entry)
+        assert cache.stats.revalidated == 1
+
+    def test_lru_eviction(self, tmp_path):
+        body = "x" * 1000
+        cache = HttpCache(str(tmp_path))
+        cache.store("/probe/", body)
+        entry_size = cache.size
+
+        cache = HttpCache(str(tmp_path / "lru"), max_bytes=entry_size * 2)
+        cache.store("/a/", body)
+        cache.store("/b/", body)
+        cache.hit(cache.lookup("/a/"))
+        cache.store("/c/", body)
+
+        assert cache.lookup("/b/") is None
+        assert cache.lookup("/a/") is not None
+        assert cache.lookup("/c/") is not None
+        assert cache.stats.evicted == 1
+        assert len(list((tmp_path / "lru").glob("*.z"))) == 2
+
+
+class TestScraperCache:
+    @pytest.fixture
+    async def scraper(self, tmp_path):
+        scraper = WebScraper(
+            base_url="https://test.com",
+            cache_dir=str(tmp_path),
+            cache_ttl=0,
+            memo_size=0,
+        )
+        await scraper.initialize()
+        yield scraper
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_revalidation(self, scraper):
+        with patch.object(scraper._session, "get") as mock_get:
+            mock_get.side_effect = [
+                make_response("page", headers={"ETag": '"v1"'}),
+                make_response(status=304),
+            ]
+
+            assert await scraper._get("/a/") == "page"
+            assert await scraper._get("/a/") == "page"
+
+            _, kwargs = mock_get.call_args
+            assert kwargs["headers"] == {"If-None-Match": '"v1"'}
+            assert scraper.cache_stats.hits == 1
+            assert scraper.cache_stats.revalidated == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_skip_the_network(self, scraper):
+        scraper._cache._ttl = 60
+        with patch.object(scraper._session, "get") as mock_get:
+            mock_get.return_value = make_response("page")
+
+            assert await scraper._get("/a/") == "page"
+            assert await scraper._get("/a/") == "page"
+            assert mock_get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_unreadable_entry_is_fetched_again(self, scraper, tmp_path):
+        with patch.object(scraper._session, "get") as mock_get:
+            mock_get.side_effect = [
+                make_response("page", headers={"ETag": '"v1"'}),
+                make_response(status=304),
+                make_response("page v2", headers={"ETag": '"v2"'}),
+            ]
+
+            assert await scraper._get("/a/") == "page"
+            for body in tmp_path.glob("*.z"):
+                body.unlink()
+            assert await scraper._get("/a/") == "page v2"
+
+            _, kwargs = mock_get.call_args
+            assert kwargs["headers"] == {}
+            assert mock_get.call_count == 3
+            assert scraper._cache.conditional_headers(scraper._cache.lookup("/a/")) == {
+                "If-None-Match": '"v2"'
+            }
@@ -0,0 +1,121 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from letras.infrastructure.web.latency import LatencyTracker, hedged
+from letras.infrastructure.web.scraper import ARTISTS_INDEX, WebScraper
+
+
+class TestLatencyTracker:
+    def test_defaults_until_enough_samples(self):
+        tracker = LatencyTracker(min_samples=5, max_timeout=30)
+        for _ in range(4):
+            tracker.record(0.1)
+
+        assert tracker.percentile(95) is None
+        assert tracker.hedge_delay() is None
+        assert tracker.timeout() == 30
+
+    def test_timeout_follows_percentiles(self):
+        tracker = LatencyTracker(min_samples=10, timeout_factor=3, min_timeout=0.5)
+        for i in range(1, 101):
+            tracker.record(i / 100)
+
+        assert tracker.percentile(95) == 0.95
+        assert tracker.timeout() == pytest.approx(2.97)
+
+        fast = LatencyTracker(min_samples=1, min_timeout=2)
+        fast.record(0.01)
+        assert fast.timeout() == 2
+
+
+class TestHedged:
+    @pytest.mark.asyncio
+    async def test_fast_requests_are_not_hedged(self):
+        tracker = LatencyTracker()
+        calls = []
+
+        async def request():
+            calls.append(1)
+            return "page"
+
+        assert await hedged(request, 0.05, tracker) == "page"
+        assert len(calls) == 1
+        assert tracker.hedged == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_request_loses_to_hedge(self):
+        tracker = LatencyTracker()
+        delays = [1, 0]
+        cancelled = []
+
+        async def request():
+            delay = delays.pop(0)
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                cancelled.append(delay)
+                raise
+            return f"after {delay}"
+
+        assert await hedged(request, 0.01, tracker) == "after 0"
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+        assert tracker.hedged == 1
+        assert tracker.hedges_won == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_request_falls_back_to_hedge(self):
+        attempts = []
+
+        async def request():
+            attempts.append(1)
+            if len(attempts) == 1:
+                await asyncio.sleep(0.02)
+                raise ValueError("boom")
+            await asyncio.sleep(0.04)
+            return "page"
+
+        assert await hedged(request, 0.01) == "page"
+
+    @pytest.mark.asyncio
+    async def test_first_error_is_raised(self):
+        async def request():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await hedged(request, None)
+
+
+class TestScraperLatency:
+    def test_kind(self):
+        assert WebScraper._kind(ARTISTS_INDEX) == "index"
+        assert WebScraper._kind("/aline-barros/") == "artist"
+        assert WebScraper._kind("/aline-barros/ressuscita-me/") == "song"
+
+    @pytest.mark.asyncio
+    async def test_timeout_per_kind(self):
+        scraper = WebScraper(base_url="https://test.com", timeout=30)
+        await scraper.initialize()
+        try:
+            tracker = scraper._latency["song"]
+            for _ in range(20):
+                tracker.record(1.0)
+
+            response = MagicMock()
+            response.status = 200
+            response.headers = {}
+            response.text = AsyncMock(return_value="page")
+            response.__aenter__ = AsyncMock(return_value=response)
+            response.__aexit__ = AsyncMock()
+
+            with patch.object(scraper._session, "get", return_value=response) as get:
+                await scraper._get("/artist/song/")
+                await scraper._get("/artist/")
+
+            timeouts = [call.kwargs["timeout"].total for call in get.call_args_list]
+            assert timeouts == [3.0, 30]
+            assert len(tracker) == 21
+        finally:
+            await scraper.close()
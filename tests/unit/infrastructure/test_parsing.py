@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from letras.domain.entities.artist import Artist
+from letras.domain.entities.song import Song
+from letras.infrastructure.web.extractors import SoupExtractor
+from letras.infrastructure.web.parsing import ParseError, ParsePool
+from letras.infrastructure.web.scraper import WebScraper
+
+SONG = """
+    <div class="head-info-exib"><b>1.500</b></div>
+    <div class="lyric-original"><p>Verse</p></div>
+"""
+
+
+@pytest.fixture
+async def pool():
+    pool = ParsePool("soup", workers=2, batch_size=4)
+    await pool.start()
+    yield pool
+    await pool.close()
+
+
+class TestParsePool:
+    @pytest.mark.asyncio
+    async def test_matches_inline_parsing(self, pool):
+        results = await asyncio.gather(
+            *(pool.parse("song_page", SONG) for _ in range(10))
+        )
+        assert results == [SoupExtractor().song_page(SONG)] * 10
+
+    @pytest.mark.asyncio
+    async def test_errors_are_raised_per_page(self, pool):
+        bad = '<div class="head-info-exib"><b>n/a</b></div>'
+        good, failed = await asyncio.gather(
+            pool.parse("song_page", SONG),
+            pool.parse("artist_page", bad),
+            return_exceptions=True,
+        )
+
+        assert good == (1500, "Verse")
+        assert isinstance(failed, ParseError)
+        assert "ValueError" in str(failed)
+
+
+class TestScraperParsePool:
+    @pytest.mark.asyncio
+    async def test_song_details(self):
+        scraper = WebScraper(base_url="https://test.com", parse_workers=1)
+        await scraper.initialize()
+        try:
+            response = MagicMock()
+            response.raise_for_status = MagicMock()
+            response.headers = {}
+            response.text = AsyncMock(return_value=SONG)
+            response.__aenter__ = AsyncMock(return_value=response)
+            response.__aexit__ = AsyncMock()
+
+            with patch.object(scraper._session, "get", return_value=response):
+                result = await scraper.get_song_details(
+                    Artist(name="Test", slug="test"),
+                    Song(name="Test", slug="test", artist_id=1),
+                )
+
+            assert result.views == 1500
+            assert result.content == "Verse"
+        finally:
+            await scraper.close()
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from letras.infrastructure.web.rate import RateController
+
+
+def response_error(status: int) -> aiohttp.ClientResponseError:
+    return aiohttp.ClientResponseError(request_info=None, history=(), status=status)
+
+
+class TestRateController:
+    def test_additive_increase(self):
+        controller = RateController(max_window=8, rate=2.0)
+        window, rate = controller.window, controller.rate
+
+        for _ in range(10):
+            controller.increase(0.1)
+
+        assert window < controller.window <= 8
+        assert controller.rate > rate
+
+    def test_increase_holds_when_latency_grows(self):
+        controller = RateController(max_window=8)
+        controller.increase(0.1)
+        window = controller.window
+
+        for _ in range(10):
+            controller.increase(5.0)
+
+        assert controller.window == window
+
+    def test_multiplicative_decrease_with_cooldown(self):
+        controller = RateController(max_window=16, rate=4.0, cooldown=60)
+        window = controller.window
+
+        controller.decrease()
+        controller.decrease()
+
+        assert controller.window == window / 2
+        assert controller.rate == 2.0
+
+    def test_window_floor(self):
+        controller = RateController(max_window=4, cooldown=0)
+        for _ in range(10):
+            controller.decrease()
+        assert controller.window == 1
+
+    def test_overload_classification(self):
+        assert RateController.is_overload(asyncio.TimeoutError())
+        assert RateController.is_overload(response_error(429))
+        assert RateController.is_overload(response_error(503))
+        assert not RateController.is_overload(response_error(404))
+        assert not RateController.is_overload(aiohttp.ClientError())
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_window(self):
+        controller = RateController(max_window=3)
+        controller.window = 3
+        peak = 0
+
+        async def request():
+            nonlocal peak
+            async with controller.slot():
+                peak = max(peak, controller.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(request() for _ in range(12)))
+        assert peak == 3
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_throttle_shrinks_window(self):
+        controller = RateController(max_window=8)
+        window = controller.window
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            async with controller.slot():
+                raise response_error(429)
+
+        assert controller.window == window / 2
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_paces_requests(self):
+        controller = RateController(max_window=2, rate=50.0, max_rate=50.0)
+        controller._tokens = 0
+
+        started = time.monotonic()
+        for _ in range(5):
+            async with controller.slot():
+                pass
+
+        assert time.monotonic() - started >= 4 / 50
@@ -1,11 +1,12 @@
 from contextlib import asynccontextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.lyrics import Lyrics
+from letras.domain.entities.rejection import Rejection
 from letras.domain.entities.song import Song
 from letras.infrastructure.database.repositories.postgres_repository import (
     PostgresRepository,
@@ -141,3 +142,140 @@ class TestPostgresRepository:
         # Verify exception is raised
         with pytest.raises(Exception):
             await repository.add_artist(Artist(name="Test", slug="test"))
+
+    @pytest.mark.asyncio
+    async def test_clear(self, repository, mock_db_connection):
+        await repository.clear()
+
+        query = mock_db_connection.execute.await_args.args[0]
+        assert query.startswith("TRUNCATE lyrics, songs, artists")
+
+    @pytest.mark.asyncio
+    async def test_get_songs_by_paths(self, repository, mock_db_connection):
+        mock_db_connection.fetch.return_value = [
+            {
+                "id": 5,
+                "name": "Duet",
+                "slug": "duet",
+                "artist_id": 1,
+                "views": 10,
+                "path": "/a/duet/",
+                "added_date": datetime.now(),
+            }
+        ]
+
+        songs = await repository.get_songs_by_paths(["/a/duet/"])
+
+        assert songs[0].path == "/a/duet/"
+        assert mock_db_connection.fetch.await_args.args[1] == ["/a/duet/"]
+        assert await repository.get_songs_by_paths([]) == []
+        mock_db_connection.fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_link_song_artists(self, repository, mock_db_connection):
+        mock_db_connection.executemany = AsyncMock()
+
+        await repository.link_song_artists([(5, 1), (5, 2)])
+
+        query, links = mock_db_connection.executemany.await_args.args
+        assert "ON CONFLICT DO NOTHING" in query
+        assert links == [(5, 1), (5, 2)]
+
+    @pytest.mark.asyncio
+    async def test_add_artist_styles(self, repository, mock_db_connection):
+        mock_db_connection.executemany = AsyncMock()
+
+        await repository.add_artist_styles(3, ["gospel", "mpb"])
+        await repository.add_artist_styles(3, [])
+
+        query, rows = mock_db_connection.executemany.await_args.args
+        assert "artist_styles" in query
+        assert rows == [(3, "gospel"), (3, "mpb")]
+        mock_db_connection.executemany.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_language_verdicts(self, repository, mock_db_connection):
+        mock_db_connection.executemany = AsyncMock()
+        mock_db_connection.fetch.return_value = [
+            {"text_hash": "abc", "language": "pt", "confidence": 0.9}
+        ]
+
+        verdicts = await repository.get_language_verdicts(["abc", "def"])
+        await repository.add_language_verdicts([("def", "en", 0.8, "lingua")])
+
+        assert verdicts == {"abc": ("pt", 0.9)}
+        query, rows = mock_db_connection.executemany.await_args.args
+        assert "language_verdicts" in query
+        assert rows == [("def", "en", 0.8, "lingua")]
+
+    @pytest.mark.asyncio
+    async def test_artist_languages(self, repository, mock_db_connection):
+        mock_db_connection.fetch.return_value = [
+            {"artist_id": 4, "portuguese": 1, "other": 9}
+        ]
+
+        counts = await repository.get_artist_languages()
+        await repository.record_artist_language(4, False)
+
+        assert counts == {4: (1, 9)}
+        query, *args = mock_db_connection.execute.await_args.args
+        assert "artist_languages.other + EXCLUDED.other" in query
+        assert args == [4, 0, 1]
+
+    @pytest.mark.asyncio
+    async def test_rejections(self, repository, mock_db_connection):
+        now = datetime.now()
+        mock_db_connection.fetch.return_value = [
+            {
+                "artist_id": 4,
+                "slug": "gone",
+                "reason": "not_found",
+                "attempts": 1,
+                "rejected_at": now,
+                "retry_after": now + timedelta(days=7),
+            }
+        ]
+
+        rejections = await repository.get_rejections(4)
+        await repository.add_rejection(
+            Rejection(artist_id=4, slug="other", reason="language", rejected_at=now)
+        )
+
+        assert rejections[0].slug == "gone"
+        assert rejections[0].blocks(now)
+        query, *args = mock_db_connection.execute.await_args.args
+        assert "ON CONFLICT (artist_id, slug)" in query
+        assert args == [4, "other", "language", 1, now, None]
+
+    @pytest.mark.asyncio
+    async def test_add_artists_copies_and_keeps_order(
+        self, repository, mock_db_connection
+    ):
+        mock_db_connection.copy_records_to_table = AsyncMock()
+        # The merge returns rows in whatever order the database chose
+        mock_db_connection.fetch.return_value = [
+            {"id": 2, "name": "B", "slug": "b", "views": 20, "added_date": None},
+            {"id": 1, "name": "A", "slug": "a", "views": 30, "added_date": None},
+        ]
+
+        artists = await repository.add_artists(
+            [
+                Artist(name="A", slug="a", views=10),
+                Artist(name="B", slug="b", views=20),
+                Artist(name="A", slug="a", views=30),
+            ]
+        )
+
+        assert [a.id for a in artists] == [1, 2, 1]
+        table = mock_db_connection.copy_records_to_table.await_args
+        assert table.args == ("staging_artists",)
+        assert table.kwargs["records"][2] == (2, "A", "a", 30)
+        merge = mock_db_connection.fetch.await_args.args[0]
+        assert "INSERT INTO artists (name, slug, views)" in merge
+        assert "ON CONFLICT (slug)" in merge
+
+    @pytest.mark.asyncio
+    async def test_bulk_add_nothing(self, repository, mock_db_connection):
+        assert await repository.add_songs([]) == []
+        assert await repository.add_many_lyrics([]) == []
+        mock_db_connection.fetch.assert_not_awaited()
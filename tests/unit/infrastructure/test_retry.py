@@ -0,0 +1,132 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from letras.infrastructure.web.retry import (
+    CircuitBreaker,
+    RetryLater,
+    RetryScheduler,
+    deferred_retries,
+    is_retryable,
+    retry_after,
+)
+
+
+def response_error(status, headers=None):
+    return aiohttp.ClientResponseError(
+        MagicMock(), (), status=status, headers=headers or {}
+    )
+
+
+class TestRetryHelpers:
+    def test_is_retryable(self):
+        assert is_retryable(asyncio.TimeoutError())
+        assert is_retryable(aiohttp.ClientConnectionError())
+        assert is_retryable(response_error(503))
+        assert is_retryable(response_error(429))
+        assert not is_retryable(response_error(404))
+        assert not is_retryable(ValueError())
+
+    def test_retry_after(self):
+        assert retry_after(response_error(429, {"Retry-After": "7"})) == 7
+        assert retry_after(response_error(503, {"Retry-After": "nonsense"})) is None
+        assert retry_after(response_error(500, {"Retry-After": "7"})) is None
+        assert retry_after(response_error(503)) is None
+
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert retry_after(response_error(503, {"Retry-After": date})) == 0
+
+
+class TestCircuitBreaker:
+    def test_trips_on_error_rate(self):
+        breaker = CircuitBreaker(threshold=0.5, window=4, min_calls=4, pause=60)
+        for ok in (True, False, True):
+            breaker.record(ok)
+        assert not breaker.is_open
+
+        breaker.record(False)
+        assert breaker.is_open
+        assert breaker.trips == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_blocks_while_open(self):
+        breaker = CircuitBreaker()
+        breaker.trip(0.02)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await breaker.wait()
+        assert loop.time() - started >= 0.015
+        assert not breaker.is_open
+
+
+class TestRetryScheduler:
+    @pytest.mark.asyncio
+    async def test_attempt_raises_retry_later(self):
+        retries = RetryScheduler(max_attempts=2, base_delay=1)
+
+        async def fail():
+            raise aiohttp.ClientConnectionError()
+
+        with pytest.raises(RetryLater) as info:
+            await retries.attempt("/a/", fail)
+        assert 0.5 <= info.value.delay <= 1
+        assert info.value.attempt == 1
+
+        # Attempts are counted per key across calls
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await retries.attempt("/a/", fail)
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        retries = RetryScheduler()
+
+        async def missing():
+            raise response_error(404)
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            await retries.attempt("/a/", missing)
+        assert not retries.breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_everything(self):
+        retries = RetryScheduler()
+
+        async def throttled():
+            raise response_error(429, {"Retry-After": "120"})
+
+        with pytest.raises(RetryLater) as info:
+            await retries.attempt("/a/", throttled)
+        assert info.value.delay == 120
+        assert retries.breaker.is_open
+
+    @pytest.mark.asyncio
+    async def test_call_waits_in_place_without_a_queue(self):
+        retries = RetryScheduler(base_delay=0.01)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise aiohttp.ClientConnectionError()
+            return "ok"
+
+        result = await retries.call(lambda: retries.attempt("/a/", flaky))
+        assert result == "ok"
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_call_defers_inside_a_queue(self):
+        retries = RetryScheduler(base_delay=0.01)
+
+        async def fail():
+            raise aiohttp.ClientConnectionError()
+
+        async def queued():
+            deferred_retries.set(True)
+            return await retries.call(lambda: retries.attempt("/a/", fail))
+
+        with pytest.raises(RetryLater):
+            await asyncio.ensure_future(queued())
@@ -1,3 +1,4 @@
+import logging
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
@@ -6,7 +7,8 @@ from aiohttp import ClientError, ClientSession, ClientTimeout
 
 from letras.domain.entities.artist import Artist
 from letras.domain.entities.song import Song
-from letras.infrastructure.web.scraper import ScrapeResult, WebScraper
+from letras.infrastructure.web.retry import RetryLater
+from letras.infrastructure.web.scraper import ArtistPage, ScrapeResult, WebScraper
 
 
 class TestWebScraper:
@@ -28,6 +30,55 @@ class TestWebScraper:
             assert artists[0].name == "Artist 1"
             assert artists[0].slug == "artist1"
 
+    @pytest.mark.asyncio
+    async def test_styles_merged_by_slug(self, sample_html):
+        scraper = WebScraper(base_url="https://test.com", styles=["gospel", "mpb"])
+        with patch.object(scraper, "_get") as mock_get:
+            mock_get.return_value = sample_html["artist_list"]
+
+            artists = await scraper.get_all_artists()
+            assert [a.slug for a in artists] == ["artist1", "artist2"]
+            assert artists[0].styles == ["gospel", "mpb"]
+            assert sorted(call.args[0] for call in mock_get.await_args_list) == [
+                "/estilos/gospel/todosartistas.html",
+                "/estilos/mpb/todosartistas.html",
+            ]
+
+    @pytest.mark.asyncio
+    async def test_failing_style_left_out(self, sample_html):
+        scraper = WebScraper(base_url="https://test.com", styles=["gospel", "typo"])
+
+        async def get(url):
+            if "typo" in url:
+                raise aiohttp.ClientResponseError(MagicMock(), (), status=404)
+            return sample_html["artist_list"]
+
+        with patch.object(scraper, "_get", side_effect=get):
+            artists = await scraper.get_all_artists()
+
+        assert [a.slug for a in artists] == ["artist1", "artist2"]
+        assert artists[0].styles == ["gospel"]
+
+    @pytest.mark.asyncio
+    async def test_style_retry_later_propagates(self, sample_html):
+        scraper = WebScraper(base_url="https://test.com", styles=["gospel", "mpb"])
+
+        async def get(url):
+            if "mpb" in url:
+                raise RetryLater(url, 5, 1)
+            return sample_html["artist_list"]
+
+        with patch.object(scraper, "_get", side_effect=get):
+            with pytest.raises(RetryLater):
+                await scraper.get_all_artists()
+
+    @pytest.mark.asyncio
+    async def test_every_style_failing_raises(self):
+        scraper = WebScraper(base_url="https://test.com", styles=["a", "b"])
+        with patch.object(scraper, "_get", side_effect=ClientError("down")):
+            with pytest.raises(ClientError):
+                await scraper.get_all_artists()
+
     @pytest.mark.asyncio
     async def test_artist_details_parsing(self, scraper, sample_html):
         with patch.object(scraper, "_get") as mock_get:
@@ -50,6 +101,18 @@ class TestWebScraper:
             assert songs[0].name == "Song 1"
             assert songs[0].artist_id == artist.id
 
+    @pytest.mark.asyncio
+    async def test_artist_page_parsing(self, scraper, sample_html):
+        with patch.object(scraper, "_get") as mock_get:
+            mock_get.return_value = sample_html["artist_page"]
+            artist = Artist(name="Test", slug="test", id=1)
+
+            page = await scraper.get_artist_page(artist)
+            assert isinstance(page, ArtistPage)
+            assert page.views == 1234
+            assert [s.slug for s in page.songs] == ["song1"]
+            mock_get.assert_awaited_once_with("/test/")
+
     @pytest.mark.asyncio
     async def test_song_details_parsing(self, scraper, sample_html):
         with patch.object(scraper, "_get") as mock_get:
@@ -95,13 +158,32 @@ class TestWebScraper:
             # Make multiple concurrent requests
             import asyncio
 
-            tasks = [scraper._get("/test") for _ in range(5)]
+            tasks = [scraper._get(f"/test/{i}") for i in range(5)]
             results = await asyncio.gather(*tasks)
 
             assert len(results) == 5
             assert all(r == "success" for r in results)
             assert mock_get.call_count == 5
 
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_coalesced(self, scraper):
+        with patch.object(scraper._session, "get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.text = AsyncMock(return_value="success")
+            mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+            mock_response.__aexit__ = AsyncMock()
+            mock_get.return_value = mock_response
+
+            import asyncio
+
+            results = await asyncio.gather(*(scraper._get("/test") for _ in range(5)))
+            assert results == ["success"] * 5
+            assert await scraper._get("/test") == "success"
+
+            assert mock_get.call_count == 1
+            assert scraper.flight_stats.coalesced == 4
+            assert scraper.flight_stats.memo_hits == 1
+
     @pytest.mark.asyncio
     async def test_error_handling(self, scraper):
         with patch.object(scraper._session, "get") as mock_get:
@@ -110,3 +192,31 @@ class TestWebScraper:
             artist = Artist(name="Test", slug="test")
             result = await scraper.get_artist_details(artist)
             assert result is None
+
+    @pytest.mark.asyncio
+    async def test_song_failure_reason(self, scraper):
+        artist = Artist(name="Test", slug="test")
+        gone = Song(name="Gone", slug="gone", artist_id=1)
+        empty = Song(name="Empty", slug="empty", artist_id=1)
+        not_found = aiohttp.ClientResponseError(MagicMock(), (), status=404)
+
+        with patch.object(scraper, "_get") as mock_get:
+            mock_get.side_effect = [not_found, "<html></html>"]
+            assert await scraper.get_song_details(artist, gone) is None
+            assert await scraper.get_song_details(artist, empty) is None
+
+        assert scraper.failure_reason(artist, gone) == "not_found"
+        assert scraper.failure_reason(artist, empty) == "no_lyrics"
+        assert scraper.failure_reason(artist, empty) is None
+
+    @pytest.mark.asyncio
+    async def test_close_logs_statistics(self, caplog):
+        scraper = WebScraper(base_url="https://test.com")
+        await scraper.initialize()
+        scraper._tracer.summary = MagicMock(return_value=["HTTP: 2 requests"])
+
+        with caplog.at_level(logging.INFO, logger="letras"):
+            await scraper.close()
+
+        assert "Fetches: 0 made" in caplog.text
+        assert "HTTP: 2 requests" in caplog.text
@@ -0,0 +1,127 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from letras.domain.entities.artist import Artist
+from letras.domain.entities.song import Song
+from letras.infrastructure.web.extractors import SoupExtractor
+from letras.infrastructure.web.scraper import WebScraper
+from letras.infrastructure.web.streaming import ArtistLinkParser, ElementWatcher
+
+INDEX = """
+    <ul class="artist-list">
+        <li><a href="/aline-barros/">Aline &amp; <b>Barros</b></a></li>
+        <li><a href="/">Home</a></li>
+        <li><a href="/fernandinho/">Fernandinho</a></li>
+        <li><a href="/fernandinho/musica/">Música</a></li>
+    </ul>
+"""
+
+SONG = """
+    <div class="head-info-exib"><b>500</b></div>
+    <div class="lyric-original"><div class="inner"><p>Verse 1</p></div><p>Verse 2</p></div>
+    <div class="footer">""" + "x" * 10000 + "</div>"
+
+
+def chunks(text: str, size: int):
+    data = text.encode("utf-8")
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def streamed_response(parts):
+    consumed = []
+
+    async def iter_chunked(size):
+        for part in parts:
+            consumed.append(part)
+            yield part
+
+    response = MagicMock()
+    response.content.iter_chunked = iter_chunked
+    response.__aenter__ = AsyncMock(return_value=response)
+    response.__aexit__ = AsyncMock()
+    return response, consumed
+
+
+class TestArtistLinkParser:
+    def test_matches_extractor(self):
+        parser = ArtistLinkParser()
+        links = []
+        for part in chunks(INDEX, 7):
+            parser.feed(part.decode("utf-8", errors="ignore"))
+            links.extend(parser.pop())
+        parser.close()
+        links.extend(parser.pop())
+
+        assert links == SoupExtractor().artists(INDEX)
+        assert links[0] == ("Aline & Barros", "aline-barros")
+
+
+class TestElementWatcher:
+    def test_done_once_all_elements_closed(self):
+        watcher = ElementWatcher(["head-info-exib", "lyric-original"])
+        watcher.feed('<div class="head-info-exib"><b>1</b></div>')
+        assert not watcher.done
+
+        watcher.feed('<div class="lyric-original"><div><p>a</p></div>')
+        assert not watcher.done
+
+        watcher.feed("</div>")
+        assert watcher.done
+
+
+class TestStreamingScraper:
+    @pytest.fixture
+    async def scraper(self):
+        scraper = WebScraper(base_url="https://test.com", streaming=True)
+        await scraper.initialize()
+        yield scraper
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_all_artists(self, scraper):
+        response, _ = streamed_response(chunks(INDEX, 10))
+        with patch.object(scraper._session, "get", return_value=response):
+            artists = [artist async for artist in scraper.iter_all_artists()]
+
+        assert [a.slug for a in artists] == ["aline-barros", "fernandinho"]
+        assert all(isinstance(a, Artist) for a in artists)
+
+    @pytest.mark.asyncio
+    async def test_index_kept_only_when_archiving(self, scraper, tmp_path):
+        response, _ = streamed_response(chunks(INDEX, 10))
+        with patch.object(scraper._session, "get", return_value=response):
+            with patch.object(scraper, "_record") as record:
+                [artist async for artist in scraper.iter_all_artists()]
+        record.assert_not_called()
+
+        archiving = WebScraper(
+            base_url="https://test.com",
+            streaming=True,
+            archive_path=str(tmp_path / "run.warc.gz"),
+        )
+        await archiving.initialize()
+        try:
+            response, _ = streamed_response(chunks(INDEX, 10))
+            with patch.object(archiving._session, "get", return_value=response):
+                with patch.object(archiving, "_record") as record:
+                    [artist async for artist in archiving.iter_all_artists()]
+        finally:
+            await archiving.close()
+        record.assert_called_once_with(
+            "/estilos/gospelreligioso/todosartistas.html", INDEX
+        )
+
+    @pytest.mark.asyncio
+    async def test_song_page_stops_early(self, scraper):
+        parts = chunks(SONG, 64)
+        response, consumed = streamed_response(parts)
+        with patch.object(scraper._session, "get", return_value=response):
+            result = await scraper.get_song_details(
+                Artist(name="Test", slug="test"),
+                Song(name="Test", slug="test", artist_id=1),
+            )
+
+        assert result.views == 500
+        assert result.content == "Verse 1\n\nVerse 2"
+        assert len(consumed) < len(parts) / 10
@@ -0,0 +1,71 @@
+import pytest
+from aiohttp import web
+
+from letras.infrastructure.web.scraper import WebScraper
+from letras.infrastructure.web.tracing import Histogram, RequestTiming
+
+
+class TestHistogram:
+    def test_percentile_bucket(self):
+        histogram = Histogram()
+        for ms in (3, 3, 3, 40, 700):
+            histogram.add(ms / 1000)
+
+        assert histogram.count == 5
+        assert histogram.percentile(50) == 0.005
+        assert histogram.percentile(95) == 1.0
+        assert histogram.mean == pytest.approx(0.1498)
+
+
+class TestRequestTiming:
+    def test_phases(self):
+        timing = RequestTiming(
+            kind="song",
+            started=10.0,
+            dns=0.1,
+            connect=0.2,
+            sent=10.4,
+            headers=10.9,
+            finished=11.0,
+        )
+        phases = timing.phases()
+
+        assert phases["wait"] == pytest.approx(0.1)
+        assert phases["ttfb"] == pytest.approx(0.5)
+        assert phases["body"] == pytest.approx(0.1)
+        assert phases["total"] == pytest.approx(1.0)
+
+    def test_incomplete_request_has_no_phases(self):
+        assert RequestTiming(kind="song", started=1.0).phases() == {}
+
+
+class TestScraperTracing:
+    @pytest.mark.asyncio
+    async def test_requests_are_traced(self):
+        async def handler(request):
+            return web.Response(text="x" * 5000)
+
+        app = web.Application()
+        app.router.add_get("/{tail:.*}", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "localhost", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        scraper = WebScraper(base_url=f"http://localhost:{port}")
+        await scraper.initialize()
+        try:
+            await scraper._get("/artist/")
+            await scraper._get("/artist/song/")
+        finally:
+            await scraper.close()
+            await runner.cleanup()
+
+        tracer = scraper._tracer
+        assert tracer.requests == 2
+        assert tracer.reused == 1
+        assert tracer.bytes == 10000
+        assert tracer.histograms["artist"]["connect"].count == 1
+        assert tracer.histograms["song"]["total"].count == 1
+        assert tracer.summary()[0].startswith("HTTP: 2 requests, 50% on reused")
@@ -85,6 +85,23 @@ class TestBaseRunner:
         assert len(result) == 3
         assert mock_service.process_lyrics.await_count == 3
 
+    @pytest.mark.asyncio
+    async def test_process_songs_isolates_failures(self, runner, mock_service):
+        artists = [
+            Artist(name=f"Artist {i}", slug=f"artist-{i}", id=i) for i in range(3)
+        ]
+
+        async def process_songs(artist):
+            if artist.id == 1:
+                raise Exception("Network error")
+            return [Song(name="Song", slug="song", artist_id=artist.id)]
+
+        mock_service.process_songs.side_effect = process_songs
+
+        result = await runner.process_songs(artists)
+        assert [s.artist_id for s in result] == [0, 2]
+        assert mock_service.process_songs.await_count == 3
+
     @pytest.mark.asyncio
     async def test_create_release(self, runner, tmp_path, mock_repository, db_config):
         # Setup dos diretórios
@@ -155,6 +172,36 @@ class TestBaseRunner:
             zip_files = list(tmp_path.glob("*.zip"))
             assert len(zip_files) == 1, "Should create exactly one zip file"
 
+    @pytest.mark.asyncio
+    async def test_run_pipeline(self, runner, tmp_path, mock_scraper, mock_service):
+        artists = [Artist(name=f"Artist {i}", slug=f"artist-{i}") for i in range(2)]
+        mock_scraper.get_all_artists.return_value = artists
+        mock_service.process_artist.side_effect = lambda a: Artist(
+            name=a.name, slug=a.slug, id=int(a.slug[-1]) + 1, views=10
+        )
+        mock_service.process_songs.side_effect = lambda a: [
+            Song(name=f"Song {i}", slug=f"song-{i}", artist_id=a.id) for i in range(2)
+        ]
+        mock_service.process_lyrics.side_effect = lambda a, s: Lyrics(
+            song_id=1, content=f"{a.name} {s.name}"
+        )
+
+        mock_postgres_utils = MagicMock()
+        mock_postgres_utils.create_backup = AsyncMock()
+
+        with patch(
+            "letras.runners.base.PostgresUtils",
+            MagicMock(return_value=mock_postgres_utils),
+        ):
+            runner.pipeline = True
+            await runner.run(output_dir=str(tmp_path))
+
+        assert mock_service.process_lyrics.await_count == 4
+        notes_content = (tmp_path / "RELEASE_NOTES.md").read_text()
+        assert "4 new songs from 2 artists" in notes_content
+        assert len(list(tmp_path.glob("*.zip"))) == 1
+        assert not (tmp_path / "temp").exists()
+
     @pytest.mark.asyncio
     async def test_error_handling(self, runner, mock_scraper):
         mock_scraper.get_all_artists.side_effect = Exception("Test error")
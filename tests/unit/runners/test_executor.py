@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from letras.infrastructure.web.retry import RetryLater, deferred_retries
+from letras.runners.executor import StageExecutor
+
+
+class TestStageExecutor:
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self):
+        executor = StageExecutor(max_workers=4)
+
+        async def func(i):
+            await asyncio.sleep(0.001 * (10 - i))
+            return i * 2
+
+        results = await executor.map(range(10), func)
+
+        assert [r.item for r in results] == list(range(10))
+        assert [r.value for r in results] == [i * 2 for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        executor = StageExecutor(max_workers=3)
+        in_flight = 0
+        peak = 0
+
+        async def func(i):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return i
+
+        await executor.map(range(12), func)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_isolated(self):
+        executor = StageExecutor(max_workers=2)
+        done = []
+
+        async def func(i):
+            if i == 1:
+                raise ValueError("boom")
+            return i
+
+        results = await executor.map(range(4), func, on_done=done.append)
+
+        assert len(done) == 4
+        assert not results[1].ok
+        assert isinstance(results[1].error, ValueError)
+        assert [r.value for r in results if r.ok] == [0, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_empty_items(self):
+        executor = StageExecutor(max_workers=5)
+
+        async def func(i):
+            return i
+
+        assert await executor.map([], func) == []
+
+    @pytest.mark.asyncio
+    async def test_retries_are_requeued(self):
+        executor = StageExecutor(max_workers=1)
+        calls = []
+
+        async def func(i):
+            assert deferred_retries.get()
+            calls.append(i)
+            if i == 0 and calls.count(0) == 1:
+                raise RetryLater(i, delay=0.01, attempt=1)
+            return i
+
+        results = await executor.map(range(3), func)
+
+        # The failed item went behind the others instead of blocking them
+        assert calls == [0, 1, 2, 0]
+        assert [r.value for r in results] == [0, 1, 2]
+        assert all(r.ok for r in results)
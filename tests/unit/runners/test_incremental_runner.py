@@ -3,7 +3,8 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 import pytest
 
 from letras.domain.entities.artist import Artist
-from letras.infrastructure.web.scraper import ScrapeResult
+from letras.domain.services.lyrics_service import LyricsService
+from letras.infrastructure.web.scraper import ArtistPage
 from letras.runners.incremental import IncrementalRunner
 
 
@@ -13,6 +14,7 @@ class TestIncrementalRunner:
         repo = MagicMock()
         repo.get_all_artists = AsyncMock()
         repo.update_artist_views = AsyncMock()
+        repo.add_artist_styles = AsyncMock()
         return repo
 
     @pytest.fixture
@@ -21,13 +23,14 @@ class TestIncrementalRunner:
         service.process_artist = AsyncMock()
         service.process_songs = AsyncMock(return_value=[])
         service.process_lyrics = AsyncMock(return_value=None)
+        service.update_artist = AsyncMock(return_value=False)
         return service
 
     @pytest.fixture
     async def mock_scraper(self):
         scraper = MagicMock()
         scraper.get_all_artists = AsyncMock()
-        scraper.get_artist_details = AsyncMock()
+        scraper.get_artist_page = AsyncMock()
         return scraper
 
     @pytest.fixture
@@ -58,9 +61,6 @@ class TestIncrementalRunner:
         mock_repository.get_all_artists.return_value = existing
         mock_scraper.get_all_artists.return_value = existing + new
         mock_service.process_artist.return_value = processed
-        mock_scraper.get_artist_details.return_value = ScrapeResult(
-            content="", views=1000
-        )
 
         # Execute
         result = await runner.process_artists()
@@ -77,8 +77,9 @@ class TestIncrementalRunner:
 
         mock_repository.get_all_artists.return_value = [existing]
         mock_scraper.get_all_artists.return_value = [existing]
-        mock_scraper.get_artist_details.return_value = ScrapeResult(
-            content="", views=2000
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=2000, songs=[])
+        runner.service = LyricsService(
+            repository=mock_repository, language_service=Mock(), scraper=mock_scraper
         )
 
         # Execute
@@ -96,8 +97,9 @@ class TestIncrementalRunner:
 
         mock_repository.get_all_artists.return_value = [existing]
         mock_scraper.get_all_artists.return_value = [existing]
-        mock_scraper.get_artist_details.return_value = ScrapeResult(
-            content="", views=1000
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=1000, songs=[])
+        runner.service = LyricsService(
+            repository=mock_repository, language_service=Mock(), scraper=mock_scraper
         )
 
         # Execute
@@ -108,6 +110,25 @@ class TestIncrementalRunner:
         assert result[0].views == 1000
         assert not mock_repository.update_artist_views.called
 
+    @pytest.mark.asyncio
+    async def test_existing_artist_styles(self, runner, mock_repository, mock_scraper):
+        # Setup
+        existing = Artist(name="Test", slug="test", id=1, views=1000)
+        listed = Artist(name="Test", slug="test", styles=["gospel", "mpb"])
+
+        mock_repository.get_all_artists.return_value = [existing]
+        mock_scraper.get_all_artists.return_value = [listed]
+        mock_scraper.get_artist_page.return_value = ArtistPage(views=1000, songs=[])
+        runner.service = LyricsService(
+            repository=mock_repository, language_service=Mock(), scraper=mock_scraper
+        )
+
+        # Execute
+        await runner.process_artists()
+
+        # Verify
+        mock_repository.add_artist_styles.assert_awaited_once_with(1, ["gospel", "mpb"])
+
     @pytest.mark.asyncio
     async def test_error_handling(self, runner, mock_repository):
         # Setup
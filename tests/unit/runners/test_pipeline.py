@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from letras.infrastructure.web.retry import RetryLater, deferred_retries
+from letras.runners.pipeline import Pipeline, Stage
+
+
+class TestPipeline:
+    @pytest.mark.asyncio
+    async def test_items_flow_through_all_stages(self):
+        async def expand(i):
+            return [i * 10 + j for j in range(2)]
+
+        async def keep_even(i):
+            return [i] if i % 2 == 0 else []
+
+        received = []
+        pipeline = Pipeline([Stage(expand, workers=3), Stage(keep_even, workers=2)])
+        await pipeline.run(range(5), received.append)
+
+        assert sorted(received) == [0, 10, 20, 30, 40]
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_and_dropped(self):
+        failed = []
+
+        async def func(i):
+            if i == 2:
+                raise ValueError("boom")
+            return [i]
+
+        def on_done(result):
+            if not result.ok:
+                failed.append(result.item)
+
+        received = []
+        pipeline = Pipeline([Stage(func, workers=2, on_done=on_done)])
+        await pipeline.run(range(4), received.append)
+
+        assert failed == [2]
+        assert sorted(received) == [0, 1, 3]
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self):
+        started_second = asyncio.Event()
+
+        async def first(i):
+            if i == 1:
+                # The second item waits until the first one reached stage two
+                await asyncio.wait_for(started_second.wait(), timeout=1)
+            return [i]
+
+        async def second(i):
+            started_second.set()
+            return [i]
+
+        received = []
+        pipeline = Pipeline([Stage(first, workers=1), Stage(second, workers=1)])
+        await pipeline.run(range(2), received.append)
+
+        assert received == [0, 1]
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_in_flight_items(self):
+        produced = 0
+        release = asyncio.Event()
+
+        async def produce(i):
+            nonlocal produced
+            produced += 1
+            return [i]
+
+        async def slow(i):
+            await release.wait()
+            return [i]
+
+        pipeline = Pipeline(
+            [Stage(produce, workers=1), Stage(slow, workers=1)], queue_size=2
+        )
+        task = asyncio.create_task(pipeline.run(range(100), lambda item: None))
+        await asyncio.sleep(0.05)
+
+        # One item in the slow stage, a full queue and one blocked producer
+        assert produced <= 5
+        release.set()
+        await task
+        assert produced == 100
+
+    @pytest.mark.asyncio
+    async def test_sink_errors_abort_the_run(self):
+        async def func(i):
+            return [i]
+
+        def sink(item):
+            raise RuntimeError("disk full")
+
+        pipeline = Pipeline([Stage(func, workers=2)], queue_size=1)
+        with pytest.raises(RuntimeError):
+            await pipeline.run(range(50), sink)
+
+    @pytest.mark.asyncio
+    async def test_retry_later_requeues_without_parking(self):
+        attempts = {}
+        order = []
+
+        async def func(i):
+            attempts[i] = attempts.get(i, 0) + 1
+            if i == 0 and attempts[i] == 1:
+                raise RetryLater(i, 0.05, 1)
+            order.append(i)
+            return [i]
+
+        done = []
+        received = []
+        pipeline = Pipeline([Stage(func, workers=1, on_done=done.append)])
+        await asyncio.wait_for(pipeline.run(range(3), received.append), timeout=1)
+
+        # The single worker went on with the other items during the delay
+        assert order == [1, 2, 0]
+        assert sorted(received) == [0, 1, 2]
+        assert attempts[0] == 2
+        assert all(result.ok for result in done) and len(done) == 3
+
+    @pytest.mark.asyncio
+    async def test_retry_later_after_input_ends(self):
+        calls = []
+
+        async def first(i):
+            return [i]
+
+        async def second(i):
+            calls.append(i)
+            if len(calls) == 1:
+                raise RetryLater(i, 0.02, 1)
+            return [i]
+
+        received = []
+        pipeline = Pipeline([Stage(first, workers=2), Stage(second, workers=3)])
+        await asyncio.wait_for(pipeline.run([7], received.append), timeout=1)
+
+        assert received == [7]
+        assert calls == [7, 7]
+
+    @pytest.mark.asyncio
+    async def test_stage_workers_defer_retries(self):
+        seen = []
+
+        async def func(i):
+            seen.append(deferred_retries.get())
+            return []
+
+        await Pipeline([Stage(func)]).run(range(1), lambda item: None)
+
+        assert seen == [True]
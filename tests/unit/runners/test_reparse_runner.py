@@ -0,0 +1,45 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from letras.domain.entities.artist import Artist
+from letras.runners.reparse import ReparseRunner
+
+
+class TestReparseRunner:
+    def test_scraper_replays_archives(self):
+        runner = ReparseRunner(
+            db_config={},
+            base_url="http://test.com",
+            archives=["run.warc.gz"],
+            parse_workers=3,
+            scraper_config={"delay": 0.5, "archive_path": "new.warc.gz"},
+        )
+
+        assert runner.scraper_config == {
+            "delay": 0.5,
+            "replay": ["run.warc.gz"],
+            "parse_workers": 3,
+            "archive_path": None,
+            "cache_dir": None,
+        }
+
+    @pytest.mark.asyncio
+    async def test_run_rebuilds_tables(self):
+        runner = ReparseRunner(
+            db_config={},
+            base_url="http://test.com",
+            archives=["run.warc.gz"],
+            verbose=False,
+        )
+        artist = Artist(name="Test", slug="test", id=1)
+        runner.repository = MagicMock()
+        runner.repository.clear = AsyncMock()
+        runner.process_artists = AsyncMock(return_value=[artist])
+        runner.process_songs = AsyncMock(return_value=[])
+        runner.process_lyrics = AsyncMock(return_value=[])
+
+        await runner.run()
+
+        runner.repository.clear.assert_awaited_once()
+        runner.process_songs.assert_awaited_once_with([artist])